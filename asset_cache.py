@@ -0,0 +1,260 @@
+"""Persistent cache of scaled images.
+
+Decoding the PNG files in assets/ and scaling them up to the game's size
+happens every time the game starts. This module keeps the scaled pixels
+in one file in the cache directory so that later starts can skip both.
+
+The cache file is laid out as:
+    header: magic, format version, index offset, index length
+    pixel data for each cached image, one after another
+    index: JSON mapping each key to the image's offset and size
+
+Each image is keyed by a hash of the source file's contents, the region
+of the source file it was cut from and the size it was scaled to, so a
+changed asset is never served from a stale entry.
+
+On a warm start the file is memory-mapped and each image is turned into
+a Surface with pygame.image.frombuffer() without copying its pixels.
+The pixels are stored as RGBX, so the surfaces still need to be
+converted to the display's pixel format before blitting, which is a
+quick copy compared to decoding and scaling.
+
+New entries are written out when save() is called or when the program
+exits.
+
+Use the module level functions, which share one cache for the whole
+program, rather than making an AssetCache directly. They can be called
+from several threads at once.
+"""
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import pygame
+import decoded_images
+import pylink_config
+
+#: The file the scaled images are saved to
+ASSET_CACHE_FILENAME = os.path.join(
+    pylink_config.CACHE_DIRECTORY, 'assets.bin')
+
+#: Bump this whenever the layout of the cache file changes so that old
+#: files are thrown away instead of misread.
+ASSET_CACHE_FORMAT_VERSION = 1
+
+_MAGIC = b'PYLINKAC'
+_HEADER = struct.Struct('<8sIQQ')
+_PIXEL_FORMAT = 'RGBX'
+_BYTES_PER_PIXEL = 4
+
+
+def file_hash(filename):
+    """Return a hash of the contents of filename as a hex string."""
+    with open(filename, 'rb') as source_file:
+        return hashlib.sha1(source_file.read()).hexdigest()
+
+
+class AssetCache(object):
+    """
+    A cache file of scaled images. See the module documentation for
+    details.
+    """
+
+    def __init__(self, filename=None):
+        """
+        Open the cache file, ASSET_CACHE_FILENAME unless filename is
+        given, and read its index. A missing, damaged or out of date
+        file is treated as an empty cache.
+        """
+        self.filename = filename or ASSET_CACHE_FILENAME
+        self.hits = 0
+        self.misses = 0
+        self.__mapped = None
+        self.__index = {}
+        self.__image_sizes = {}
+        self.__pending = {}
+        self.__file_hashes = {}
+        # Guards everything above. Images are decoded and scaled
+        # without holding it, so that several can be at once.
+        self.__lock = threading.RLock()
+        self.__open()
+
+    def __open(self):
+        """Memory-map the cache file and read its index."""
+        try:
+            with open(self.filename, 'rb') as cache_file:
+                if os.fstat(cache_file.fileno()).st_size < _HEADER.size:
+                    return
+                # ACCESS_COPY so that anything drawn on to a cached
+                # surface goes to a private copy of the page instead of
+                # failing or changing the file.
+                mapped = mmap.mmap(
+                    cache_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except OSError:
+            return
+        magic, version, index_offset, index_length = _HEADER.unpack_from(
+            mapped)
+        if (magic != _MAGIC or version != ASSET_CACHE_FORMAT_VERSION
+                or index_offset + index_length > len(mapped)):
+            mapped.close()
+            return
+        try:
+            index = json.loads(
+                mapped[index_offset:index_offset + index_length])
+        except ValueError:
+            mapped.close()
+            return
+        self.__mapped = mapped
+        self.__index = index['images']
+        self.__image_sizes = index['image_sizes']
+
+    def __source_hash(self, filename):
+        """
+        Return the hash of filename, only reading the file again if it
+        has been modified since it was last hashed.
+        """
+        modified = os.path.getmtime(filename)
+        with self.__lock:
+            hashed = self.__file_hashes.get(filename)
+        if hashed is None or hashed[0] != modified:
+            hashed = (modified, file_hash(filename))
+            with self.__lock:
+                self.__file_hashes[filename] = hashed
+        return hashed[1]
+
+    def image_size(self, filename):
+        """
+        Return the (width, height) of the image in filename, without
+        decoding it if its size is already in the cache.
+        """
+        source_hash = self.__source_hash(filename)
+        with self.__lock:
+            size = self.__image_sizes.get(source_hash)
+        if size is None:
+            size = list(decoded_images.load(filename).get_size())
+            with self.__lock:
+                self.__image_sizes[source_hash] = size
+        return tuple(size)
+
+    def load_scaled(self, filename, region, size):
+        """
+        Return the region of the image in filename scaled to size.
+
+        Args:
+            filename: The image file to load.
+            region: The (x, y, width, height) of the part of the image
+                to load, or None for the whole image.
+            size: The (width, height) to scale the region to.
+
+        Returns:
+            A pygame Surface of the scaled region. If it came from the
+            cache file, it shares its pixels with the file.
+        """
+        size = (int(size[0]), int(size[1]))
+        if region is not None:
+            region = tuple(int(value) for value in region)
+        key = json.dumps([self.__source_hash(filename), region, size])
+        with self.__lock:
+            if key in self.__pending:
+                self.hits += 1
+                return self.__pending[key]
+            if key in self.__index:
+                self.hits += 1
+                offset = self.__index[key]
+                length = size[0] * size[1] * _BYTES_PER_PIXEL
+                return pygame.image.frombuffer(
+                    memoryview(self.__mapped)[offset:offset + length],
+                    size,
+                    _PIXEL_FORMAT)
+            self.misses += 1
+        image = decoded_images.load(filename)
+        if region is not None:
+            image = image.subsurface(region)
+        surface = pygame.transform.scale(image, size)
+        with self.__lock:
+            if not self.__pending:
+                atexit.register(self.save)
+            # If another thread scaled the same image in the meantime,
+            # keep the first one so that everyone shares it.
+            return self.__pending.setdefault(key, surface)
+
+    def save(self):
+        """
+        Write any images scaled since the cache was opened or last saved
+        to the cache file.
+        """
+        with self.__lock:
+            if not self.__pending:
+                return
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+            temporary_filename = self.filename + '.tmp'
+            index = {}
+            with open(temporary_filename, 'wb') as cache_file:
+                cache_file.write(b'\0' * _HEADER.size)
+                for key, offset in self.__index.items():
+                    width, height = json.loads(key)[2]
+                    length = width * height * _BYTES_PER_PIXEL
+                    index[key] = cache_file.tell()
+                    cache_file.write(self.__mapped[offset:offset + length])
+                for key, surface in self.__pending.items():
+                    index[key] = cache_file.tell()
+                    cache_file.write(
+                        pygame.image.tobytes(surface, _PIXEL_FORMAT))
+                index_offset = cache_file.tell()
+                index_bytes = json.dumps({
+                    'images': index,
+                    'image_sizes': self.__image_sizes
+                }).encode()
+                cache_file.write(index_bytes)
+                cache_file.seek(0)
+                cache_file.write(_HEADER.pack(
+                    _MAGIC,
+                    ASSET_CACHE_FORMAT_VERSION,
+                    index_offset,
+                    len(index_bytes)))
+            os.replace(temporary_filename, self.filename)
+            atexit.unregister(self.save)
+            # The pending surfaces stay valid for anyone still using them.
+            # Surfaces already handed out from the old file keep the old
+            # mapping alive, so it is only dropped here, not closed.
+            self.__pending = {}
+            self.__mapped = None
+            self.__index = {}
+            self.__open()
+
+
+#pylint: disable-msg=invalid-name
+_cache = None
+_cache_lock = threading.Lock()
+#pylint: enable-msg=invalid-name
+
+
+def get_cache():
+    """Return the cache shared by the whole program, opening it first if
+    needed."""
+    #pylint: disable-msg=invalid-name,global-statement
+    global _cache
+    #pylint: enable-msg=invalid-name,global-statement
+    with _cache_lock:
+        if _cache is None:
+            _cache = AssetCache()
+        return _cache
+
+
+def image_size(filename):
+    """See AssetCache.image_size()"""
+    return get_cache().image_size(filename)
+
+
+def load_scaled(filename, region, size):
+    """See AssetCache.load_scaled()"""
+    return get_cache().load_scaled(filename, region, size)
+
+
+def save():
+    """See AssetCache.save()"""
+    get_cache().save()
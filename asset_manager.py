@@ -0,0 +1,87 @@
+"""
+Hands out images that are ready to blit quickly.
+
+A Surface that is not in the display's pixel format is converted on
+every blit, and a colorkeyed Surface without RLEACCEL has its colorkey
+checked pixel by pixel on every blit. Everything that loads images for
+the game should get them through this module, which always returns
+Surfaces converted to the display's pixel format, with the colorkey set
+with RLEACCEL when the image has transparent parts.
+
+Anything that blits can call check_blit() on the source Surface, which
+warns with an UnconvertedSurfaceWarning if it is not in the display's
+pixel format. Call it under "if __debug__:" so that it costs nothing
+when Python is run with -O.
+"""
+import warnings
+import pygame
+import asset_cache
+
+
+class UnconvertedSurfaceWarning(RuntimeWarning):
+    """
+    Warns that a Surface is being blitted to the display without
+    having been converted to the display's pixel format first.
+    """
+
+
+def display_format(surface, colorkey_location=None):
+    """
+    Return a copy of surface in the display's pixel format.
+
+    Args:
+        surface: The Surface to convert.
+        colorkey_location: If given, the (x, y) location within the
+            image to sample for the colorkey, which is set with
+            RLEACCEL.
+
+    Returns:
+        A new Surface in the display's pixel format.
+    """
+    converted = surface.convert()
+    if colorkey_location is not None:
+        set_colorkey(converted, colorkey_location)
+    return converted
+
+
+def set_colorkey(surface, colorkey_location):
+    """
+    Set the colorkey of surface, which should already be in the
+    display's pixel format, to the color at colorkey_location, with
+    RLEACCEL.
+    """
+    surface.set_colorkey(surface.get_at(colorkey_location), pygame.RLEACCEL)
+
+
+def load_scaled(filename, region, size, colorkey_location=None):
+    """
+    Return the region of the image in filename scaled to size, in the
+    display's pixel format. See asset_cache.load_scaled() for the
+    arguments and display_format() for colorkey_location.
+    """
+    return display_format(
+        asset_cache.load_scaled(filename, region, size), colorkey_location)
+
+
+def is_display_format(surface):
+    """
+    Return True if surface has the same pixel format as the display,
+    so that it can be blitted to it without being converted.
+    """
+    display = pygame.display.get_surface()
+    return (surface.get_bitsize() == display.get_bitsize()
+            and surface.get_masks() == display.get_masks())
+
+
+def check_blit(surface):
+    """
+    Warn with an UnconvertedSurfaceWarning if surface is not in the
+    display's pixel format. Only warns once for each place it is called
+    from, like any other warning.
+    """
+    if not is_display_format(surface):
+        warnings.warn(
+            f'blitting a {surface.get_bitsize()} bit surface that is not '
+            + 'in the display format, load it through asset_manager',
+            UnconvertedSurfaceWarning,
+            stacklevel=2)
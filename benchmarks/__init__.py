@@ -0,0 +1,6 @@
+"""Benchmarks for the game.
+
+Each module in this package can be run on its own from the top of the
+repository, e.g. 'python -m benchmarks.collision', and prints its
+timings. They use SDL's dummy video driver, so no window is opened.
+"""
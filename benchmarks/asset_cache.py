@@ -0,0 +1,67 @@
+"""Benchmark of loading the game's assets with the asset cache.
+
+Loads every scaled asset twice, each time in a fresh process: once
+with no cache file (a cold start) and once with the cache file the
+first run left behind (a warm start).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import asset_cache
+import pylink_config
+import tile_loader
+#pylint: enable-msg=wrong-import-position
+
+
+def load_assets():
+    """Load all of the scaled assets and print how long it took."""
+    #pylint: disable-msg=import-outside-toplevel
+    import images
+    import title_intro_text
+    import title_waterfall
+    from link import Link
+    #pylint: enable-msg=import-outside-toplevel
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    start_secs = time.perf_counter()
+    Link.get_instance()
+    images.file_select_background()
+    images.pink_heart()
+    images.red_heart()
+    images.pink_cursor()
+    title_waterfall.background()
+    title_waterfall.waves()
+    title_waterfall.spray()
+    title_intro_text.intro_text()
+    load_secs = time.perf_counter() - start_secs
+    stats = tile_loader.cache_stats()
+    print(f'{1000 * load_secs:8.1f} msecs'
+          f" ({stats['scaled_hits']} hits, {stats['scaled_misses']} misses,"
+          f" {stats['decoded_misses']} sheets decoded)")
+    asset_cache.save()
+
+
+def main():
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as cache_directory:
+        cache_filename = os.path.join(cache_directory, 'assets.bin')
+        for name in ('cold start', 'warm start'):
+            print(f'{name:>10}: ', end='', flush=True)
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.asset_cache', cache_filename],
+                check=True)
+        print(f'cache file: {os.path.getsize(cache_filename) / 2**20:.1f} MB')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        asset_cache.ASSET_CACHE_FILENAME = sys.argv[1]
+        load_assets()
+    else:
+        main()
@@ -0,0 +1,67 @@
+"""Benchmark of blitting images as loaded against through asset_manager.
+
+Blits Link and a whole submap to the display, first as they come out
+of the asset cache (RGBX pixels, with a plain colorkey for Link) and
+then as asset_manager hands them out (in the display's pixel format,
+with an RLEACCEL colorkey for Link). The images are made here rather
+than loaded through the asset cache, so that running the benchmark
+does not add them to the cache file.
+"""
+import os
+import timeit
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import asset_manager
+import pylink_config
+#pylint: enable-msg=wrong-import-position
+
+NUMBER = 2000
+
+LINK_FILENAME = os.path.join('assets', 'NES-TheLegendofZelda-Link.png')
+LINK_REGION = (1, 11, 15, 16)
+SUBMAP_FILENAME = os.path.join('assets', 'NES-TheLegendofZelda-Overworld.png')
+SUBMAP_REGION = (1 + (7 * 257), 1 + (7 * 177), 256, 176)
+
+
+def time_blits(name, surface, destination):
+    """Print how long it takes to blit surface to the display."""
+    display = pygame.display.get_surface()
+    secs = timeit.timeit(
+        lambda: display.blit(surface, destination), number=NUMBER)
+    print(f'{name:>28}: {1e6 * secs / NUMBER:8.2f} usecs per blit')
+
+
+def load_as_cached(filename, region, size):
+    """
+    Return the region of the image in filename scaled to size, in the
+    RGBX format the asset cache hands out.
+    """
+    image = pygame.transform.scale(
+        pygame.image.load(filename).subsurface(region), size)
+    return pygame.image.frombuffer(
+        pygame.image.tobytes(image, 'RGBX'), size, 'RGBX')
+
+
+def main():
+    """Run the benchmark and print the results."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    link_size = pylink_config.scale_nes_tuple_to_pylink(LINK_REGION[2:])
+    submap_size = pylink_config.PYLINK_MAP.size
+
+    link = load_as_cached(LINK_FILENAME, LINK_REGION, link_size)
+    link.set_colorkey(link.get_at((0, 0)))
+    time_blits('Link, as loaded', link, pylink_config.PYLINK_MAP.center)
+    link = asset_manager.display_format(link, (0, 0))
+    time_blits('Link, asset_manager', link, pylink_config.PYLINK_MAP.center)
+
+    submap = load_as_cached(SUBMAP_FILENAME, SUBMAP_REGION, submap_size)
+    time_blits('submap, as loaded', submap, pylink_config.PYLINK_MAP)
+    submap = asset_manager.display_format(submap)
+    time_blits('submap, asset_manager', submap, pylink_config.PYLINK_MAP)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of Link's collision detection.
+
+Compares looking up the walkability grid with the old method of
+sampling pixels from the display surface, which is kept here only so
+the two can be compared. Also times a check next to a wall, where the
+grid is not enough and Link's mask is checked against the submap's.
+"""
+import os
+import timeit
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import numpy
+import pygame
+import pylink_config
+from link import Link
+from overworld import Overworld
+#pylint: enable-msg=wrong-import-position
+
+NUMBER = 10000
+
+
+def pixel_sampling_can_move_to(current_rect, to_rect):
+    """
+    The old collision check for a move down. It compares the colors of
+    the pixels under the bottom corners of Link at his current and next
+    locations on the display.
+    """
+    game_window = pygame.display.get_surface()
+    try:
+        current_locations_colors = (
+            game_window.get_at(tuple(numpy.add(current_rect.bottomleft, (0, -1)))),
+            game_window.get_at(tuple(numpy.add(current_rect.midbottom, (0, -1)))),
+            game_window.get_at(tuple(numpy.add(current_rect.bottomright, (-1, -1))))
+        )
+        next_locations_colors = (
+            game_window.get_at(tuple(numpy.add(to_rect.bottomleft, (0, -1)))),
+            game_window.get_at(tuple(numpy.add(to_rect.midbottom, (0, -1)))),
+            game_window.get_at(tuple(numpy.add(to_rect.bottomright, (-1, -1))))
+        )
+    except IndexError:
+        return False
+    return current_locations_colors == next_locations_colors
+
+
+def main():
+    """Run the benchmark and print the results."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    overworld = Overworld.get_instance()
+    link = Link.get_instance()
+    overworld.draw()
+    link.draw()
+    current_rect = link._Link__rect  # pylint: disable=protected-access
+    # Link walks 1 or 2 NES pixels a tick
+    one_step = (0, 2 * pylink_config.NES_TO_PYLINK_SCALE_FACTOR)
+    to_rect = current_rect.move(one_step)
+    # Just above the bottom of the starting submap's open area, so that
+    # the move down ends up over the blocked cells below it
+    wall_rect = pygame.Rect((384, 576), current_rect.size).move(one_step)
+    overworld.blocking_mask()
+    for name, check in (
+            ('pixel sampling', lambda: pixel_sampling_can_move_to(current_rect, to_rect)),
+            ('walkability grid', lambda: link.can_move_to(to_rect)),
+            ('mask overlap', lambda: link.can_move_to(wall_rect))):
+        secs = min(timeit.repeat(check, number=NUMBER, repeat=5))
+        print(f'{name:>16}: {1e6 * secs / NUMBER:8.2f} usecs per check')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark of the entity store.
+
+Simulates 1k, 10k and 100k entities walking around the map section in
+an EntityStore. Each tick steps their animations, moves them, turns
+around any that walk off the map and finds the ones touching a
+Link-sized rectangle in the middle, all as passes over the arrays.
+
+For comparison, the same tick is also run with an object for each
+entity and a Python loop over them, which is how Link was written
+before he was moved into the store.
+"""
+import os
+import time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import numpy
+import pygame
+import pylink_config
+from entities import EntityStore
+#pylint: enable-msg=wrong-import-position
+
+COUNTS = (1000, 10000, 100000)
+TICKS = 60
+DT_SECS = 1.0 / pylink_config.SIMULATION_TICKS_PER_SEC
+SPEED = pylink_config.LINK_WALK_SPEED
+HITBOX = (0, 8, 16, 8)
+LINK_RECT = pygame.Rect(pylink_config.NES_MAP.center, (16, 16))
+
+
+def starting_positions(count):
+    """Return count random (position, velocity) pairs, the same every run."""
+    rng = numpy.random.default_rng(0)
+    positions = rng.integers(
+        (pylink_config.NES_MAP.left, pylink_config.NES_MAP.top),
+        (pylink_config.NES_MAP.right - 16, pylink_config.NES_MAP.bottom - 16),
+        size=(count, 2))
+    velocities = numpy.zeros((count, 2))
+    axes = rng.integers(0, 2, size=count)
+    velocities[numpy.arange(count), axes] = rng.choice((-SPEED, SPEED), size=count)
+    return positions.tolist(), velocities.tolist()
+
+
+class Walker(object):
+    """One entity as an object, for the comparison."""
+
+    def __init__(self, position, velocity):
+        self.rect = pygame.Rect(position, (16, 16))
+        self.velocity = velocity
+        self.subpixels = [0, 0]
+        self.frame = 0
+        self.secs_until_frame = pylink_config.LINK_STEP_INTERVAL_SECS
+
+    def update(self, dt_secs):
+        """Step the animation and move, like EntityStore.update()."""
+        self.secs_until_frame -= dt_secs
+        if self.secs_until_frame <= 1e-9:
+            self.secs_until_frame += pylink_config.LINK_STEP_INTERVAL_SECS
+            self.frame = 1 - self.frame
+        for axis in (0, 1):
+            subpixels = self.subpixels[axis] + round(
+                self.velocity[axis] * pylink_config.NES_SUBPIXELS_PER_PIXEL * dt_secs)
+            self.subpixels[axis] = subpixels % pylink_config.NES_SUBPIXELS_PER_PIXEL
+            self.rect[axis] += subpixels // pylink_config.NES_SUBPIXELS_PER_PIXEL
+        if not pylink_config.NES_MAP.contains(self.rect):
+            self.velocity = [-self.velocity[0], -self.velocity[1]]
+
+
+def store_ticks(count):
+    """Return the seconds per tick of count entities in an EntityStore."""
+    store = EntityStore(count)
+    for position, velocity in zip(*starting_positions(count)):
+        store.add(position, HITBOX, velocity, num_frames=2,
+                  frame_secs=pylink_config.LINK_STEP_INTERVAL_SECS)
+    start_secs = time.perf_counter()
+    for _ in range(TICKS):
+        store.update(DT_SECS)
+        out = store.out_of_bounds(pylink_config.NES_MAP)
+        store.velocity[:store.size][out] *= -1
+        store.overlapping(LINK_RECT)
+    return (time.perf_counter() - start_secs) / TICKS
+
+
+def object_ticks(count):
+    """Return the seconds per tick of count entities as objects."""
+    walkers = [
+        Walker(position, velocity)
+        for position, velocity in zip(*starting_positions(count))]
+    ticks = max(1, TICKS * 1000 // count)
+    start_secs = time.perf_counter()
+    for _ in range(ticks):
+        for walker in walkers:
+            walker.update(DT_SECS)
+        [walker for walker in walkers if walker.rect.colliderect(LINK_RECT)]  # pylint: disable=expression-not-assigned
+    return (time.perf_counter() - start_secs) / ticks
+
+
+def main():
+    """Run the benchmark and print the results."""
+    for count in COUNTS:
+        store_secs = store_ticks(count)
+        object_secs = object_ticks(count)
+        print(f'{count:>7} entities: store {1000 * store_secs:8.3f} msecs/tick,'
+              + f' objects {1000 * object_secs:8.3f} msecs/tick')
+
+
+if __name__ == '__main__':
+    main()
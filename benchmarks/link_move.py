@@ -0,0 +1,66 @@
+"""Benchmark of moving Link.
+
+Times one tick of Link walking on open ground, turning around every
+tick so that he stays on the starting submap, and one tick of him
+walking into a wall, which falls back to sliding along it. Each tick
+is the entity store's update() followed by Link.update().
+"""
+import os
+import timeit
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import entities
+import pylink_config
+from link import Link, TICK_SECS
+from overworld import Overworld
+#pylint: enable-msg=wrong-import-position
+
+NUMBER = 10000
+
+#: Where Link stands with the bottom of the starting submap's open area
+#: right below his feet, so that walking down is blocked. He can get a
+#: pixel closer on one of his steps, so he walks into it for a second
+#: before the timing starts.
+BLOCKED_TOPLEFT = (384, 576)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    Overworld.get_instance()
+    link = Link.get_instance()
+    rect = link._Link__rect  # pylint: disable=protected-access
+    store = entities.get()
+
+    def tick():
+        """Run one tick of Link's movement."""
+        store.update(TICK_SECS)
+        link.update()
+
+    def walk():
+        """Take a step right and then a step back left."""
+        link.right_keydown()
+        tick()
+        link.left_keydown()
+        tick()
+
+    rect.topleft = pylink_config.PYLINK_MAP.center
+    secs = min(timeit.repeat(walk, number=NUMBER, repeat=5))
+    assert rect.topleft == pylink_config.PYLINK_MAP.center
+    print(f'{"walking":>8}: {1e6 * secs / (2 * NUMBER):8.2f} usecs per tick')
+
+    rect.topleft = BLOCKED_TOPLEFT
+    link.down_keydown()
+    for _ in range(pylink_config.SIMULATION_TICKS_PER_SEC):
+        tick()
+    blocked_topleft = rect.topleft
+    secs = min(timeit.repeat(tick, number=NUMBER, repeat=5))
+    assert rect.topleft == blocked_topleft
+    print(f'{"blocked":>8}: {1e6 * secs / NUMBER:8.2f} usecs per tick')
+
+
+if __name__ == '__main__':
+    main()
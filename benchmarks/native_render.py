@@ -0,0 +1,117 @@
+"""Benchmark of drawing at the NES resolution against drawing at 3x.
+
+Runs the same walk around the overworld in a fresh process for each
+way of drawing: straight to the window at 3x, at the NES's resolution
+to a back buffer that is scaled up once per frame, and at the NES's
+resolution straight to a display opened with the SCALED flag so that
+SDL does the scaling. Every
+frame is drawn in full, so that the cost of drawing is measured rather
+than how little changed.
+
+The memory reported is the size of the images each one keeps (the
+tile atlas, the drawn submaps, Link's sprite sheet and the back buffer)
+and the peak resident size of the whole process.
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+import warnings
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import headless
+import pylink_config
+import render_target
+#pylint: enable-msg=wrong-import-position
+
+FRAMES = 600
+
+#: The arrow key handler to call for each stretch of the walk, and how
+#: many frames to hold it for. This walks off the starting submap to the
+#: one above it and back.
+WALK = (
+    ('up_keydown', 150),
+    ('left_keydown', 60),
+    ('right_keydown', 60),
+    ('down_keydown', 150),
+    ('up_keydown', 180),
+)
+
+
+def surface_bytes(surface):
+    """Return the size of a Surface's pixels in bytes."""
+    return surface.get_height() * surface.get_pitch()
+
+
+def draw_frames(mode):
+    """Walk Link around, drawing every frame in full, and print the
+    frame time and memory used. mode is one of '3x', 'native' or
+    'scaled'."""
+    #pylint: disable-msg=import-outside-toplevel,protected-access
+    import entities
+    from link import Link, TICK_SECS
+    from overworld import Overworld
+    from renderer import Renderer
+    #pylint: enable-msg=import-outside-toplevel
+    if mode == 'scaled':
+        # Without a GPU, SDL warns that it is scaling in software
+        warnings.filterwarnings('ignore', 'no fast renderer')
+        try:
+            headless.init(pylink_config.NES_WINDOW.size, pygame.SCALED)
+        except pygame.error as error:
+            print(f'not available: {error}')
+            return
+    else:
+        headless.init()
+    if mode != '3x':
+        render_target.use_native()
+    overworld = Overworld.get_instance()
+    link = Link.get_instance()
+    renderer = Renderer(overworld, link)
+
+    frame_secs = []
+    start_secs = time.perf_counter()
+    for handler, frames in WALK:
+        getattr(link, handler)()
+        for _ in range(frames):
+            frame_start_secs = time.perf_counter()
+            overworld.update()
+            if not overworld.is_transitioning():
+                entities.get().update(TICK_SECS)
+            link.update()
+            renderer.mark_full_update()
+            renderer.draw_map()
+            renderer.present()
+            frame_secs.append(time.perf_counter() - frame_start_secs)
+    stats = headless.frame_stats(frame_secs, time.perf_counter() - start_secs)
+
+    submaps = overworld._Overworld__scaled_submaps
+    images = [overworld._Overworld__tile_atlas, link._Link__atlas.surface] + [
+        submaps.get(key) for key in list(submaps._LruCache__entries)]
+    if mode != '3x':
+        images.append(render_target.get().surface())
+    image_bytes = sum(surface_bytes(image) for image in images)
+    peak_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(f"mean {stats['mean_msecs']:6.3f} msecs/frame,"
+          f" p95 {stats['p95_msecs']:6.3f} msecs,"
+          f" images {image_bytes / 2**20:5.1f} MB,"
+          f" peak RSS {peak_bytes / 2**20:5.1f} MB")
+
+
+def main():
+    """Run the benchmark and print the results."""
+    for mode in ('3x', 'native', 'scaled'):
+        print(f'{mode:>6}: ', end='', flush=True)
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.native_render', mode],
+            check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        draw_frames(sys.argv[1])
+    else:
+        main()
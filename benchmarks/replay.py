@@ -0,0 +1,67 @@
+"""Benchmark of replaying a recorded walk.
+
+Records a walk from the starting submap across the two submaps to
+either side of it as an input log, then replays it through the game
+with pylink3 --headless --replay, twice, in fresh processes. Both
+replays must leave Link in exactly the same place.
+
+To benchmark a session of your own instead, record it with
+pylink3 --record FILENAME and pass FILENAME to this module.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import controller
+import input_log
+#pylint: enable-msg=wrong-import-position
+
+REPEAT = 2
+
+#: The buttons to hold for each stretch of the walk, and for how many
+#: ticks. Link steps up into the gap in the rocks, walks left on to the
+#: submap to the left, and then right across the starting submap on to
+#: the one to its right.
+WALK = (
+    (controller.UP, 7),
+    (controller.LEFT, 300),
+    (controller.RIGHT, 700),
+)
+
+
+def record_walk(filename):
+    """Write the WALK as an input log to filename."""
+    recording = input_log.InputLog()
+    for held, ticks in WALK:
+        for _ in range(ticks):
+            recording.record(held)
+    recording.save(filename)
+
+
+def replay(filename):
+    """Replay filename in a fresh process and return what it printed."""
+    return subprocess.run(
+        [sys.executable, 'pylink3.py', '--headless', '--replay', filename],
+        check=True, capture_output=True, text=True).stdout
+
+
+def main():
+    """Run the benchmark and print the results."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+            directory, 'walk.inputs')
+        if len(sys.argv) <= 1:
+            record_walk(filename)
+        endings = set()
+        for _ in range(REPEAT):
+            output = replay(filename).strip().splitlines()
+            print('\n'.join(output[-3:]))
+            endings.add(output[-1])
+        assert len(endings) == 1, 'the replays ended differently'
+
+
+if __name__ == '__main__':
+    main()
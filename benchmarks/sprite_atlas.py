@@ -0,0 +1,40 @@
+"""Benchmark of building each sprite atlas in the manifest.
+
+Builds every atlas twice, once with an empty asset cache and once with
+the scaled sprites already in it, and prints how long each took and how
+big the packed atlas is compared to the sprites in it.
+"""
+import os
+import tempfile
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import asset_cache
+import pylink_config
+import sprite_atlas
+#pylint: enable-msg=wrong-import-position
+
+
+def main():
+    """Run the benchmark and print the results."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    with tempfile.TemporaryDirectory() as cache_directory:
+        asset_cache._cache = asset_cache.AssetCache(  # pylint: disable-msg=protected-access
+            os.path.join(cache_directory, 'assets.bin'))
+        for name in sprite_atlas.load_manifest():
+            for start in ('cold', 'warm'):
+                sprite_atlas.clear()
+                atlas = sprite_atlas.get(name)
+                width, height = atlas.surface.get_size()
+                used = sum(
+                    atlas.sprite(sprite).get_width() * atlas.sprite(sprite).get_height()
+                    for sprite in atlas.names())
+                print(f'{name:>12} {start}: {1000 * atlas.load_secs:7.1f} msecs,'
+                      f' {len(atlas.names()):2} sprites in {width}x{height},'
+                      f' {100 * used / (width * height):5.1f}% used')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark of loading the game's assets at startup on a thread pool.
+
+Loads the overworld, every sprite atlas and the title music with a
+StartupLoader, each time in a fresh process with an empty asset cache
+so that every image is decoded and scaled: once on a single thread and
+once on the default number of threads.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import asset_cache
+import overworld
+import pylink_config
+import sprite_atlas
+import title_screen
+from startup_loader import StartupLoader
+#pylint: enable-msg=wrong-import-position
+
+
+def load_assets(max_workers):
+    """Load all of the assets on up to max_workers threads and print how
+    long each took."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    loader = StartupLoader(max_workers)
+    loader.add('overworld', overworld.load_tiles)
+    for name in sprite_atlas.manifest():
+        loader.add(
+            name,
+            lambda name=name: sprite_atlas.decode(name),
+            lambda packed, name=name: sprite_atlas.build(name, packed=packed))
+    loader.add('intro_music', title_screen.load_intro_music)
+    loader.run()
+    print(loader.format_timings())
+
+
+def main():
+    """Run the benchmark and print the results."""
+    for max_workers in (1, 0):
+        print('single thread:' if max_workers else 'thread pool:')
+        with tempfile.TemporaryDirectory() as cache_directory:
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.startup', str(max_workers),
+                 os.path.join(cache_directory, 'assets.bin')],
+                check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        asset_cache.ASSET_CACHE_FILENAME = sys.argv[2]
+        load_assets(int(sys.argv[1]) or None)
+    else:
+        main()
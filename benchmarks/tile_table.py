@@ -0,0 +1,80 @@
+"""Benchmark of loading a whole tile sheet one tile at a time and at once.
+
+Loads every tile of the overworld tile sheet with load_tile_table(),
+both with an empty asset cache and with one that already has every
+tile, and with load_whole_tile_table(), which scales the whole sheet
+in one go with numpy. The sheet is decoded before timing, so only the
+cutting and scaling is measured.
+"""
+import os
+import tempfile
+import time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+#pylint: disable-msg=wrong-import-position
+import pygame
+import asset_cache
+import decoded_images
+import pylink_config
+import tile_loader
+#pylint: enable-msg=wrong-import-position
+
+REPEAT = 5
+
+SHEET = {
+    'filename': os.path.join('assets', 'NES-TheLegendofZelda-OverworldTiles.png'),
+    'original_tile_size': pylink_config.NES_TILE_SIZE,
+    'border': (1, 1),
+    'final_tile_size': pylink_config.TILE_SIZE,
+}
+
+
+def best_msecs(load, before=None):
+    """
+    Return the quickest of REPEAT runs of load, in milliseconds, calling
+    before, if given, ahead of each one without timing it.
+    """
+    times = []
+    for _ in range(REPEAT):
+        if before is not None:
+            before()
+        start_secs = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - start_secs)
+    return 1000 * min(times)
+
+
+def load_every_tile(table):
+    """Index every tile of a lazy TileTable, so that they are all loaded."""
+    return [list(line) for line in table]
+
+
+def main():
+    """Run the benchmark and print the results."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    decoded_images.load(SHEET['filename'])
+    with tempfile.TemporaryDirectory() as cache_directory:
+        cache_filename = os.path.join(cache_directory, 'assets.bin')
+
+        def empty_cache():
+            #pylint: disable-msg=protected-access
+            if os.path.exists(cache_filename):
+                os.remove(cache_filename)
+            asset_cache._cache = asset_cache.AssetCache(cache_filename)
+
+        cold = best_msecs(lambda: load_every_tile(tile_loader.load_tile_table(**SHEET)), empty_cache)
+        asset_cache.save()
+        warm = best_msecs(lambda: load_every_tile(tile_loader.load_tile_table(**SHEET)))
+    whole = best_msecs(lambda: tile_loader.load_whole_tile_table(**SHEET))
+    print(f'load_tile_table, empty asset cache: {cold:7.2f} msecs')
+    print(f' load_tile_table, full asset cache: {warm:7.2f} msecs')
+    print(f'             load_whole_tile_table: {whole:7.2f} msecs')
+    table = tile_loader.load_whole_tile_table(**SHEET)
+    stats = tile_loader.shared_tile_stats()
+    print(f"{sum(len(line) for line in table)} tiles on the sheet, {stats['unique']} unique,"
+          f" {stats['bytes_saved'] / 2**20:.1f} MB saved by sharing over all of the runs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Reads the player's controller.
+
+Rather than reacting to each key press and release as it arrives, the
+keyboard is sampled once per tick of the game loop with
+pygame.key.get_pressed(), and the keys that are held are packed into
+one int, a bit for each button, laid out like the byte the NES reads
+from its controller. However many key events arrive between ticks, the
+game only ever reads the buttons once a tick.
+
+Only one direction is walked in at a time, like on the NES. The
+direction is worked out from the buttons each tick by direction():
+
+  1. A direction pressed in the last INPUT_BUFFER_TICKS ticks that is
+     still held wins, the most recently pressed first.
+  2. Otherwise the direction already being walked in carries on while
+     it is held, so releasing one of two held arrows keeps walking in
+     the other one.
+  3. Otherwise the held direction lowest in the controller byte wins:
+     right, then left, then down, then up. This also breaks ties
+     between directions pressed on the same tick.
+"""
+import collections
+import pygame
+import pylink_config
+
+#: The bit for each button, in the order of the NES controller byte
+RIGHT = 0x01
+LEFT = 0x02
+DOWN = 0x04
+UP = 0x08
+START = 0x10
+SELECT = 0x20
+B = 0x40
+A = 0x80
+
+#: All of the direction buttons
+DIRECTIONS = RIGHT | LEFT | DOWN | UP
+
+#: The keys on the keyboard for each button
+KEY_BINDINGS = (
+    (pygame.K_RIGHT, RIGHT),
+    (pygame.K_LEFT, LEFT),
+    (pygame.K_DOWN, DOWN),
+    (pygame.K_UP, UP),
+    (pygame.K_RETURN, START),
+    (pygame.K_RSHIFT, SELECT),
+    (pygame.K_z, B),
+    (pygame.K_x, A),
+)
+
+#: The facing direction for each direction button, as used by Link
+DIRECTION_NAMES = {
+    RIGHT: "right",
+    LEFT: "left",
+    DOWN: "down",
+    UP: "up",
+}
+
+
+def buttons_held(pressed):
+    """
+    Return the buttons held in pressed, what pygame.key.get_pressed()
+    returned, as a bitmask of the button bits.
+    """
+    held = 0
+    for key, button in KEY_BINDINGS:
+        if pressed[key]:
+            held |= button
+    return held
+
+
+def lowest_button(buttons):
+    """Return the bit of the lowest button in buttons, or 0 if none."""
+    return buttons & -buttons
+
+
+class Controller(object):
+    """
+    The state of the controller, sampled once a tick by poll().
+    """
+
+    def __init__(self, buffer_ticks=pylink_config.INPUT_BUFFER_TICKS):
+        """
+        Args:
+            buffer_ticks: How many ticks to remember the buttons pressed
+                on, for direction() and was_pressed().
+        """
+        #: The buttons held on the latest tick
+        self.held = 0
+        #: The buttons that went down on the latest tick
+        self.pressed = 0
+        #: The buttons that went up on the latest tick
+        self.released = 0
+        self.__pressed_on_ticks = collections.deque(maxlen=buffer_ticks)
+        self.__direction = 0
+
+    def poll(self, pressed=None):
+        """
+        Sample the controller for this tick. Call this once a tick,
+        before anything reads the buttons.
+
+        Args:
+            pressed: What pygame.key.get_pressed() returned, which is
+                called if not given.
+
+        Returns:
+            The buttons held, as a bitmask.
+        """
+        return self.update(buttons_held(
+            pygame.key.get_pressed() if pressed is None else pressed))
+
+    def update(self, held):
+        """
+        Set the buttons held this tick to held, a bitmask, and work out
+        which went down and up since the last tick.
+
+        Returns:
+            held.
+        """
+        self.pressed = held & ~self.held
+        self.released = self.held & ~held
+        self.held = held
+        self.__pressed_on_ticks.append(self.pressed)
+        self.__direction = self.__resolve_direction()
+        return held
+
+    def was_pressed(self, buttons):
+        """
+        Return True if any of buttons went down in the last
+        INPUT_BUFFER_TICKS ticks.
+        """
+        return any(pressed & buttons for pressed in self.__pressed_on_ticks)
+
+    def __resolve_direction(self):
+        """Return the direction button to walk in, see the module
+        documentation, or 0 for none."""
+        held_directions = self.held & DIRECTIONS
+        for pressed in reversed(self.__pressed_on_ticks):
+            if pressed & held_directions:
+                return lowest_button(pressed & held_directions)
+        if self.__direction & held_directions:
+            return self.__direction
+        return lowest_button(held_directions)
+
+    def direction(self):
+        """
+        Return the facing direction to walk in this tick, "right",
+        "left", "down" or "up", or None to stand still.
+        """
+        return DIRECTION_NAMES.get(self.__direction)
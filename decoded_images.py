@@ -0,0 +1,99 @@
+"""
+A cache of decoded image files shared by the whole program.
+
+Several loaders cut their images out of the same sprite sheet, so each
+sheet is decoded once and kept here for the next loader that needs it.
+Images are keyed by the file's path and modification time, so a file
+that changes on disk is decoded again.
+
+The cache is bounded by DECODED_IMAGE_CACHE_MAX_BYTES of pixels. Call
+release() once a sheet is no longer needed, or clear() once all of the
+images have been loaded, to free the memory straight away.
+
+Images can be loaded from several threads at once. Different files are
+decoded at the same time, and a thread that asks for a file that is
+already being decoded waits for it rather than decoding it again.
+"""
+import os
+import threading
+import pygame
+import lru_cache
+import pylink_config
+
+#: The most decoded images to keep, however small they are
+MAX_IMAGES = 32
+
+
+def surface_bytes(surface):
+    """Return the size of a Surface's pixels in bytes."""
+    return surface.get_height() * surface.get_pitch()
+
+
+#pylint: disable-msg=invalid-name
+_cache = lru_cache.LruCache(
+    MAX_IMAGES,
+    max_size=pylink_config.DECODED_IMAGE_CACHE_MAX_BYTES,
+    size_of=surface_bytes)
+# _lock guards _cache and _file_locks. Each file has its own lock in
+# _file_locks, held while it is being decoded.
+_lock = threading.Lock()
+_file_locks = {}
+#pylint: enable-msg=invalid-name
+
+
+def load(filename):
+    """
+    Return the decoded image in filename, only decoding it if it is not
+    already in the cache or has been modified since it was decoded.
+    The Surface is shared, so do not draw on it.
+    """
+    path = os.path.abspath(filename)
+    key = (path, os.path.getmtime(filename))
+    with _lock:
+        file_lock = _file_locks.setdefault(path, threading.Lock())
+    with file_lock:
+        with _lock:
+            image = _cache.get(key)
+            if image is not None:
+                return image
+            _release(path)
+        # Decoding happens outside of _lock so that other files can be
+        # decoded at the same time. pygame lets other threads run
+        # while it decodes.
+        image = pygame.image.load(filename)
+        with _lock:
+            _cache.put(key, image)
+        return image
+
+
+def release(filename):
+    """Drop the decoded image in filename from the cache, if it is there."""
+    with _lock:
+        _release(os.path.abspath(filename))
+
+
+def _release(path):
+    """Drop the decoded image of path from the cache. Hold _lock."""
+    for key in _cache.keys():
+        if key[0] == path:
+            _cache.remove(key)
+
+
+def clear():
+    """Drop every decoded image from the cache."""
+    with _lock:
+        _cache.clear()
+
+
+def stats():
+    """
+    Return a dict of the number of cache hits and misses, and the
+    number of images and bytes of pixels in the cache now.
+    """
+    with _lock:
+        return {
+            'hits': _cache.hits,
+            'misses': _cache.misses,
+            'images': len(_cache),
+            'bytes': _cache.size,
+        }
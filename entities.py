@@ -0,0 +1,244 @@
+"""
+Every moving thing in the game, kept as a struct of arrays.
+
+Rather than an object for each Octorok, Moblin, Leever or projectile,
+an EntityStore keeps each property of every entity in its own NumPy
+array, with one row per entity:
+
+    position     int32 (x, y), in NES pixels
+    subpixels    int32 (x, y), how far past position, in NES sub-pixels
+    velocity     float64 (x, y), in NES pixels per second
+    delta        int32 (x, y), the whole NES pixels moved by the last
+                 update()
+    facing       uint8, an index into FACINGS
+    frame        uint8, the animation frame being shown
+    num_frames   uint8, how many animation frames there are
+    frame_secs   float64, how long each animation frame is shown for
+    secs_until_frame
+                 float64, how long until the next animation frame
+    hitbox       int16 (x, y, width, height), relative to position
+    alive        bool, False for rows that are free to reuse
+    self_moved   bool, True if the entity applies delta to its position
+                 itself, for example after checking it against the
+                 terrain
+
+update() steps the animations and moves every live entity at once, as a
+handful of array operations, however many there are. Rows are reused as
+entities are removed and added, and the arrays double in size when they
+run out of rows, so an entity's id, its row, never changes.
+
+Link is the first entity, see link.py.
+"""
+import numpy
+import pylink_config
+
+#: The facing directions, indexed by the facing array
+FACINGS = ("down", "right", "left", "up")
+
+# Times are added up as floats, so a whole frame's worth of time can come
+# out a hair short of frame_secs. Anything within this of it counts as a
+# whole frame.
+_ROUNDING_SECS = 1e-9
+
+
+def _grown(array):
+    """Return a copy of array with twice as many rows, the new ones 0."""
+    grown = numpy.zeros((2 * len(array),) + array.shape[1:], array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class EntityStore(object):
+    """
+    The properties of a set of entities, one NumPy array for each.
+    See the module documentation.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Args:
+            capacity: How many entities to make room for to start with.
+        """
+        self.position = numpy.zeros((capacity, 2), numpy.int32)
+        self.subpixels = numpy.zeros((capacity, 2), numpy.int32)
+        self.velocity = numpy.zeros((capacity, 2), numpy.float64)
+        self.delta = numpy.zeros((capacity, 2), numpy.int32)
+        self.facing = numpy.zeros(capacity, numpy.uint8)
+        self.frame = numpy.zeros(capacity, numpy.uint8)
+        self.num_frames = numpy.zeros(capacity, numpy.uint8)
+        self.frame_secs = numpy.zeros(capacity, numpy.float64)
+        self.secs_until_frame = numpy.zeros(capacity, numpy.float64)
+        self.hitbox = numpy.zeros((capacity, 4), numpy.int16)
+        self.alive = numpy.zeros(capacity, bool)
+        self.self_moved = numpy.zeros(capacity, bool)
+        #: One more than the highest row that has ever been used. Only
+        #: the rows below it are looked at.
+        self.size = 0
+        self.__free_rows = []
+
+    def __len__(self):
+        """Return the number of live entities."""
+        return self.size - len(self.__free_rows)
+
+    def __grow(self):
+        """Double the number of rows in every array."""
+        self.position = _grown(self.position)
+        self.subpixels = _grown(self.subpixels)
+        self.velocity = _grown(self.velocity)
+        self.delta = _grown(self.delta)
+        self.facing = _grown(self.facing)
+        self.frame = _grown(self.frame)
+        self.num_frames = _grown(self.num_frames)
+        self.frame_secs = _grown(self.frame_secs)
+        self.secs_until_frame = _grown(self.secs_until_frame)
+        self.hitbox = _grown(self.hitbox)
+        self.alive = _grown(self.alive)
+        self.self_moved = _grown(self.self_moved)
+
+    #pylint: disable-msg=too-many-arguments
+    def add(self, position, hitbox, velocity=(0, 0), facing=0,
+            num_frames=1, frame_secs=1.0, self_moved=False):
+        """
+        Add an entity.
+
+        Args:
+            position: Its (x, y) in NES pixels.
+            hitbox: The (x, y, width, height) of the part of it that
+                collides, relative to position.
+            velocity: Its (x, y) velocity in NES pixels per second.
+            facing: The index in FACINGS of the direction it faces.
+            num_frames: How many animation frames it has.
+            frame_secs: How long each animation frame is shown for
+                while it is moving.
+            self_moved: True if update() should leave it to apply delta
+                to its position itself.
+
+        Returns:
+            The entity's id, its row in the arrays.
+        """
+        if self.__free_rows:
+            row = self.__free_rows.pop()
+        else:
+            if self.size == len(self.alive):
+                self.__grow()
+            row = self.size
+            self.size += 1
+        self.position[row] = position
+        self.subpixels[row] = 0
+        self.velocity[row] = velocity
+        self.delta[row] = 0
+        self.facing[row] = facing
+        self.frame[row] = 0
+        self.num_frames[row] = num_frames
+        self.frame_secs[row] = frame_secs
+        self.secs_until_frame[row] = frame_secs
+        self.hitbox[row] = hitbox
+        self.alive[row] = True
+        self.self_moved[row] = self_moved
+        return row
+    #pylint: enable-msg=too-many-arguments
+
+    def remove(self, entity):
+        """Remove the entity with the id entity, freeing its row."""
+        self.alive[entity] = False
+        self.velocity[entity] = 0
+        self.delta[entity] = 0
+        self.__free_rows.append(entity)
+
+    def live(self):
+        """Return the ids of the live entities, as an array."""
+        return numpy.flatnonzero(self.alive[:self.size])
+
+    def animate(self, dt_secs):
+        """
+        Move every live entity that is moving on to its next animation
+        frame when it has shown its current one for long enough.
+        """
+        size = self.size
+        velocity = self.velocity[:size]
+        moving = (velocity[:, 0] != 0) | (velocity[:, 1] != 0)
+        secs_until_frame = self.secs_until_frame[:size]
+        secs_until_frame -= moving * dt_secs
+        due = moving & (secs_until_frame <= _ROUNDING_SECS)
+        secs_until_frame += due * self.frame_secs[:size]
+        frame = self.frame[:size]
+        frame += due
+        frame %= self.num_frames[:size]
+
+    def integrate(self, dt_secs):
+        """
+        Work out how far every live entity moves in dt_secs at its
+        velocity, in fixed point. The whole NES pixels each one moves
+        are put in delta, and what is left over is kept in subpixels.
+        """
+        size = self.size
+        subpixels = self.subpixels[:size] + numpy.rint(
+            self.velocity[:size] * (pylink_config.NES_SUBPIXELS_PER_PIXEL * dt_secs)
+        ).astype(numpy.int32)
+        numpy.floor_divide(
+            subpixels, pylink_config.NES_SUBPIXELS_PER_PIXEL, out=self.delta[:size])
+        numpy.remainder(
+            subpixels, pylink_config.NES_SUBPIXELS_PER_PIXEL, out=self.subpixels[:size])
+
+    def move(self):
+        """
+        Add delta to the position of every live entity that is not
+        self_moved.
+        """
+        size = self.size
+        moved = self.alive[:size] & ~self.self_moved[:size]
+        self.position[:size] += self.delta[:size] * moved[:, numpy.newaxis]
+
+    def update(self, dt_secs):
+        """Advance every live entity by dt_secs: animate, integrate and
+        move them."""
+        self.animate(dt_secs)
+        self.integrate(dt_secs)
+        self.move()
+
+    def hitboxes(self):
+        """
+        Return the hitbox of every row below size, as an array of
+        (left, top, right, bottom) in NES pixels. Rows that are not
+        alive are included, so index it with live().
+        """
+        size = self.size
+        hitbox = self.hitbox[:size]
+        topleft = self.position[:size] + hitbox[:, :2]
+        return numpy.concatenate((topleft, topleft + hitbox[:, 2:]), axis=1)
+
+    def out_of_bounds(self, bounds):
+        """
+        Return a boolean array, for every row below size, that is True
+        for the live entities whose hitbox is not entirely inside
+        bounds, a pygame.Rect in NES pixels.
+        """
+        boxes = self.hitboxes()
+        return self.alive[:self.size] & (
+            (boxes[:, 0] < bounds.left) | (boxes[:, 1] < bounds.top)
+            | (boxes[:, 2] > bounds.right) | (boxes[:, 3] > bounds.bottom))
+
+    def overlapping(self, rect):
+        """
+        Return the ids of the live entities whose hitboxes overlap rect,
+        a pygame.Rect in NES pixels, as an array.
+        """
+        boxes = self.hitboxes()
+        return numpy.flatnonzero(self.alive[:self.size] & (
+            (boxes[:, 0] < rect.right) & (boxes[:, 2] > rect.left)
+            & (boxes[:, 1] < rect.bottom) & (boxes[:, 3] > rect.top)))
+
+
+#pylint: disable-msg=invalid-name
+_store = None
+#pylint: enable-msg=invalid-name
+
+
+def get():
+    """Return the EntityStore that the game's entities are kept in."""
+    #pylint: disable-msg=invalid-name,global-statement
+    global _store
+    #pylint: enable-msg=invalid-name,global-statement
+    if _store is None:
+        _store = EntityStore()
+    return _store
@@ -1,78 +1,117 @@
 """
 Detects and dispatches events
+
+Handlers are subscribed to the types of event they handle on an
+EventBus. The bus tells SDL, with pygame.event.set_allowed() and
+pygame.event.set_blocked(), to only queue the types that have a
+subscriber, so mouse motion, window and audio events that nothing
+handles are never queued in the first place. process() then drains the
+whole queue in one call once a frame and hands each event to the
+handlers of its type.
+
+For example:
+
+    bus = EventBus()
+    bus.subscribe(pygame.QUIT, lambda event: sys.exit())
+    bus.subscribe_key(pygame.K_F3, profiler_overlay.toggle)
+    bus.process()
+
+The arrow keys are not handled here. The controller module reads the
+keys that are held once per tick instead. Blocking the key events does
+not stop pygame.key.get_pressed() from seeing the keys.
 """
-import sys
+import collections
 import pygame
-import pylink_config
-from link import Link
 
 
-# TODO: This does not really need to be a class and should be changed to just a module.
-class Events(object):
+class EventBus(object):
     """
-    The event handler.
-    This detects events and distributes them to other objects.
-    This is a singleton object and must only be accessed with
-    Events.getInstance(). That function will take care of creating the
-    instance the first time it is called.
+    Hands each event to the handlers subscribed to its type.
     """
-    __instance = None
 
-    @staticmethod
-    def get_instance():
+    def __init__(self):
+        self.__handlers = {}
+        self.__key_handlers = {}
+        #: How many events of each type have been handed to handlers
+        self.dispatch_counts = collections.Counter()
+        self.__update_queue_filter()
+
+    def subscribe(self, event_type, handler):
         """
-        Get an instance of the Events object.
-        Use this instead of 'new Events()' to get the player object.
+        Call handler with each event of event_type from now on, after
+        any handlers already subscribed to it.
+
+        Args:
+            event_type: The pygame event type, such as pygame.QUIT.
+            handler: A function taking the pygame.event.Event.
         """
-        if Events.__instance is None:
-            Events.__instance = Events()
-        return Events.__instance
+        self.__handlers.setdefault(event_type, []).append(handler)
+        self.__update_queue_filter()
 
-    def __init__(self):
+    def unsubscribe(self, event_type, handler):
         """
-        Virtually private constructor.
-        DO NOT USE 'new Events()', use 'Events.get_instance()' instead.
+        Stop calling handler with events of event_type.
+
+        Raises:
+            ValueError: If handler is not subscribed to event_type.
         """
-        if Events.__instance is not None:
-            raise Exception("This class is a singleton. Use 'Events.get_instance()' instead of 'new Events()'")
-        else:
-            self.link = Link.get_instance()
-            Events.__instance = self
-
-    # In order to mimic a switch statement, the functions called for
-    # each keydown event are listed here and then called from the
-    # __event_switcher whenever a keydown event occurs
-    __keydown_switcher = {
-        pygame.K_LEFT: lambda self: self.link.left_keydown(),
-        pygame.K_UP: lambda self: self.link.up_keydown(),
-        pygame.K_RIGHT: lambda self: self.link.right_keydown(),
-        pygame.K_DOWN: lambda self: self.link.down_keydown()
-    }
-
-    # In order to mimic a switch statement, the functions called for
-    # each keyup event are listed here and then called from the
-    # __event_switcher whenever a keyup event occurs
-    __keyup_switcher = {
-        pygame.K_LEFT: lambda self: self.link.arrow_keyup(),
-        pygame.K_UP: lambda self: self.link.arrow_keyup(),
-        pygame.K_RIGHT: lambda self: self.link.arrow_keyup(),
-        pygame.K_DOWN: lambda self: self.link.arrow_keyup()
-    }
-
-    # In order to mimic a switch statement, the functions called for
-    # each of the events received are listed here and then called within the
-    # event loop when a particular event occurs
-    __event_switcher = {
-        pygame.QUIT: lambda self, event: sys.exit(),
-        pygame.KEYDOWN: lambda self, event: self.__keydown_switcher.get(event.key, lambda self: None)(self),  # pylint: disable=protected-access
-        pygame.KEYUP: lambda self, event: self.__keyup_switcher.get(event.key, lambda self: None)(self),  # pylint: disable=protected-access
-        pylink_config.MOVE_LINK: lambda self, event: self.link.move()
-    }
+        handlers = self.__handlers.get(event_type, [])
+        handlers.remove(handler)
+        if not handlers:
+            del self.__handlers[event_type]
+        self.__update_queue_filter()
+
+    def subscribe_key(self, key, handler):
+        """
+        Call handler, a function taking no arguments, whenever key is
+        pressed. This is for keys that are not part of playing the game,
+        such as debugging tools.
+        """
+        if not self.__key_handlers:
+            self.subscribe(pygame.KEYDOWN, self.__keydown)
+        self.__key_handlers[key] = handler
+
+    def __keydown(self, event):
+        """Pass a key press on to whatever handles that key."""
+        handler = self.__key_handlers.get(event.key)
+        if handler is not None:
+            handler()
+
+    def event_types(self):
+        """Return the event types that have subscribers."""
+        return list(self.__handlers)
+
+    def __update_queue_filter(self):
+        """Only let SDL queue the event types that have subscribers."""
+        pygame.event.set_blocked(None)
+        if self.__handlers:
+            pygame.event.set_allowed(list(self.__handlers))
 
     def process(self):
         """
         Process any events in the queue.
         This is expected to be called once each frame from the main loop.
+
+        Returns:
+            How many events were handed to handlers.
         """
+        dispatched = 0
         for event in pygame.event.get():
-            self.__event_switcher.get(event.type, lambda self, event: None)(self, event)
+            handlers = self.__handlers.get(event.type)
+            if handlers is None:
+                # Queued before its type was blocked
+                continue
+            for handler in handlers:
+                handler(event)
+            self.dispatch_counts[event.type] += 1
+            dispatched += 1
+        return dispatched
+
+    def close(self):
+        """
+        Let SDL queue every type of event again, as it did before the
+        bus was created.
+        """
+        self.__handlers.clear()
+        self.__key_handlers.clear()
+        pygame.event.set_allowed(None)
@@ -0,0 +1,105 @@
+"""
+The fixed timestep game loop.
+
+The game is simulated in fixed ticks, SIMULATION_TICKS_PER_SEC of them
+each second to match the NES, no matter how fast frames are drawn.
+Each frame, the loop runs however many ticks are due since the last
+frame and then draws the frame once.
+
+If the machine falls behind, at most MAX_TICKS_PER_FRAME ticks are run
+before drawing, and any time still owed after that is dropped. The game
+slows down instead of spending longer and longer catching up.
+
+Frames can be capped with max_fps, which sleeps between frames rather
+than drawing the same frame over and over.
+"""
+import time
+import pygame
+import pylink_config
+
+# Times are added up as floats, so a whole tick's worth of time can come
+# out a hair short of tick_secs. Anything within this of a whole tick
+# counts as one.
+_ROUNDING_SECS = 1e-9
+
+
+class GameLoop(object):
+    """
+    Runs the update function in fixed ticks and the render function
+    once per frame.
+    """
+
+    #pylint: disable-msg=too-many-arguments
+    def __init__(
+            self,
+            update,
+            render,
+            ticks_per_sec=pylink_config.SIMULATION_TICKS_PER_SEC,
+            max_fps=pylink_config.MAX_FRAMES_PER_SEC,
+            max_ticks_per_frame=pylink_config.MAX_TICKS_PER_FRAME,
+            now=time.perf_counter):
+        """
+        Args:
+            update: A function taking no arguments that advances the
+                game by one tick.
+            render: A function taking no arguments that draws a frame.
+            ticks_per_sec: How many ticks to run each second.
+            max_fps: The most frames to draw each second, or 0 to draw
+                them as fast as possible.
+            max_ticks_per_frame: The most ticks to run before drawing
+                a frame when catching up.
+            now: A function returning the current time in seconds.
+        """
+        self.__update = update
+        self.__render = render
+        self.__tick_secs = 1.0 / ticks_per_sec
+        self.__max_fps = max_fps
+        self.__max_ticks_per_frame = max_ticks_per_frame
+        self.__now = now
+        self.__clock = pygame.time.Clock()
+        self.__last_frame_secs = None
+        self.__owed_secs = 0.0
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_ticks = 0
+    #pylint: enable-msg=too-many-arguments
+
+    def run_frame(self):
+        """
+        Run the ticks that are due, draw one frame, and then wait if
+        needed to stay under max_fps.
+
+        Returns:
+            The number of ticks that were run.
+        """
+        now_secs = self.__now()
+        if self.__last_frame_secs is None:
+            # Always start with one tick so the first frame has
+            # something to show.
+            self.__owed_secs = self.__tick_secs
+        else:
+            self.__owed_secs += now_secs - self.__last_frame_secs
+        self.__last_frame_secs = now_secs
+
+        ticks_run = 0
+        while (self.__owed_secs >= self.__tick_secs - _ROUNDING_SECS
+               and ticks_run < self.__max_ticks_per_frame):
+            self.__update()
+            self.__owed_secs -= self.__tick_secs
+            ticks_run += 1
+        if self.__owed_secs >= self.__tick_secs - _ROUNDING_SECS:
+            # Too far behind to catch up. Drop the whole ticks still
+            # owed and keep the fraction of one.
+            dropped = int((self.__owed_secs + _ROUNDING_SECS) // self.__tick_secs)
+            self.dropped_ticks += dropped
+            self.__owed_secs -= dropped * self.__tick_secs
+        self.ticks += ticks_run
+
+        self.__render()
+        self.frames += 1
+        self.__clock.tick(self.__max_fps)
+        return ticks_run
+
+    def fps(self):
+        """Return the average number of frames drawn per second."""
+        return self.__clock.get_fps()
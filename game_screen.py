@@ -9,15 +9,24 @@ is expected to be done externally.
 """
 import pygame
 import pygame.locals
+import asset_manager
+import headless
 import pylink_config
 import screen
 
 
-def init():
+def init(headless_mode=False):
     """Initialize the game context and the screen.
 
     Initializes the screen, clears it to all black and sets the title.
+
+    Args:
+        headless_mode: If True, use SDL's dummy video driver so that the
+            screen is drawn off-screen and no window or display is
+            needed.
     """
+    if headless_mode:
+        headless.use_dummy_video_driver()
     pygame.init()
     pygame.display.set_caption('The Legend of Zelda')
     screen.surface = pygame.display.set_mode(pylink_config.WINDOW_SIZE)
@@ -43,13 +52,16 @@ def blit(source, dest):
     """
     Draws a source Surface onto the game Surface.
 
-    Wraps pygame.Surface.blit
+    Wraps pygame.Surface.blit, and warns if source has not been
+    converted to the display's pixel format.
 
     Args:
         source: The source image.
         dest: Dest is a pair of coordinates representing where to place
             the upper left corner of the source onto the game surface.
     """
+    if __debug__:
+        asset_manager.check_blit(source)
     screen.surface.blit(source, dest)
 
 
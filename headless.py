@@ -0,0 +1,128 @@
+"""
+Running the game without a window.
+
+The game needs a display even when nothing is shown, because images are
+converted to the display's pixel format and everything is drawn to the
+display surface. In headless mode SDL's dummy video driver is used, so
+the display surface is just an off-screen surface in memory and nothing
+needs a real screen. This lets the game, its tests and its benchmarks
+run on machines with no display at all.
+
+run() drives a game loop flat out for a number of frames and collects
+how long each one took, for measuring throughput.
+"""
+import os
+import time
+import pygame
+import pylink_config
+
+
+def use_dummy_video_driver():
+    """
+    Make SDL use its dummy video driver. This has to be called before
+    pygame's display is initialized to have any effect.
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+
+def init(size=pylink_config.PYLINK_WINDOW.size, flags=0):
+    """
+    Initialize pygame with the dummy video driver and open an off-screen
+    display of the given size, with the given pygame.display.set_mode()
+    flags.
+
+    Returns:
+        The display Surface, which is only ever drawn to memory.
+    """
+    use_dummy_video_driver()
+    pygame.init()
+    return pygame.display.set_mode(size, flags)
+
+
+class TickClock(object):
+    """
+    A stand in for time.perf_counter() that moves forward exactly one
+    tick each time it is called. Giving this to a GameLoop as its now
+    function makes it run exactly one tick per frame, however long each
+    frame really takes, so a headless run always simulates the same
+    thing.
+    """
+
+    def __init__(self, ticks_per_sec=pylink_config.SIMULATION_TICKS_PER_SEC):
+        self.__tick_secs = 1.0 / ticks_per_sec
+        self.__ticks = 0
+
+    def __call__(self):
+        self.__ticks += 1
+        return self.__ticks * self.__tick_secs
+
+
+def run(game_loop, num_frames, before_frame=None, now=time.perf_counter):
+    """
+    Run game_loop for num_frames frames as fast as it will go.
+
+    Args:
+        game_loop: The GameLoop to run. It should be made with max_fps
+            of 0 so that it does not wait between frames.
+        num_frames: How many frames to run.
+        before_frame: An optional function taking no arguments to call
+            before each frame, such as an event handler.
+        now: A function returning the current time in seconds.
+
+    Returns:
+        A dict of timing stats, see frame_stats().
+    """
+    frame_secs = []
+    start_secs = now()
+    for _ in range(num_frames):
+        frame_start_secs = now()
+        if before_frame is not None:
+            before_frame()
+        game_loop.run_frame()
+        frame_secs.append(now() - frame_start_secs)
+    stats = frame_stats(frame_secs, now() - start_secs)
+    stats['ticks'] = game_loop.ticks
+    return stats
+
+
+def frame_stats(frame_secs, total_secs):
+    """
+    Summarize how long frames took.
+
+    Args:
+        frame_secs: The time each frame took, in seconds.
+        total_secs: The time taken for all of them, in seconds.
+
+    Returns:
+        A dict with the number of frames, the total time, the frames
+        per second and the mean, median, 95th percentile, minimum and
+        maximum frame time in milliseconds.
+    """
+    ordered = sorted(frame_secs)
+    num_frames = len(ordered)
+    if num_frames == 0:
+        ordered = [0.0]
+
+    def percentile(fraction):
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * 1000
+
+    return {
+        'frames': num_frames,
+        'total_secs': total_secs,
+        'fps': num_frames / total_secs if total_secs > 0 else 0.0,
+        'mean_msecs': sum(ordered) / len(ordered) * 1000,
+        'median_msecs': percentile(0.5),
+        'p95_msecs': percentile(0.95),
+        'min_msecs': ordered[0] * 1000,
+        'max_msecs': ordered[-1] * 1000,
+    }
+
+
+def format_stats(stats):
+    """Return the stats from run() as a short report for printing."""
+    return '\n'.join([
+        f"{stats['frames']} frames ({stats['ticks']} ticks) in {stats['total_secs']:.3f}s, "
+        + f"{stats['fps']:.1f} frames/s",
+        f"frame time: mean {stats['mean_msecs']:.3f}ms, median {stats['median_msecs']:.3f}ms, "
+        + f"p95 {stats['p95_msecs']:.3f}ms, min {stats['min_msecs']:.3f}ms, max {stats['max_msecs']:.3f}ms",
+    ])
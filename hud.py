@@ -0,0 +1,173 @@
+"""
+The scoreboard, or heads up display, at the top of the gameplay screen.
+
+The scoreboard is composed once on its own surface. After that, only
+the fields whose values change are redrawn, and draw() reports the
+regions of the screen that changed so that only those need updating.
+
+Numbers are drawn from a cache of pre-rendered glyphs, so showing a new
+value never renders text.
+
+The scoreboard is drawn at the render target's scale, but everything
+outside this module talks about it in PYLINK coordinates.
+"""
+import pygame
+import pylink_config
+import render_target
+import sprite_atlas
+
+#: The color of the scoreboard is "nearly black". The exact color Black
+#: is reserved for the cave and dungeon entrances.
+BACKGROUND_COLOR = (1, 1, 1)
+
+#: The color of the text on the scoreboard
+TEXT_COLOR = (255, 255, 255)
+
+#: The characters that are pre-rendered for the number fields
+GLYPHS = '0123456789X'
+
+#: Where each number field goes on the scoreboard, in NES coordinates,
+#: and the most characters it can show.
+NUMBER_FIELDS = {
+    'fps': ((0, 0), 4),
+    'rupees': ((88, 16), 4),
+    'keys': ((88, 32), 3),
+}
+
+#: Where the first heart goes on the scoreboard, in NES coordinates
+HEARTS_LOCATION = (176, 32)
+
+#: The number of hearts in each row of hearts
+HEARTS_PER_ROW = 8
+
+#: The most hearts Link can have
+MAX_HEARTS = 16
+
+
+class Hud(object):
+    """
+    The scoreboard. Use the set_* methods to change what it shows and
+    draw() once per frame to put the changes on the screen.
+    """
+
+    def __init__(self, font=None):
+        """
+        Args:
+            font: The pygame Font to draw numbers with. Defaults to
+                pygame's default font, sized for the render target.
+        """
+        self.__target = render_target.get()
+        self.__font = font or pygame.font.Font(None, 10 * self.__target.scale)
+        self.__glyphs = {
+            character: self.__font.render(character, True, TEXT_COLOR)
+            for character in GLYPHS
+        }
+        self.__glyph_width = max(
+            glyph.get_width() for glyph in self.__glyphs.values())
+        self.__surface = pygame.Surface(
+            self.__target.size(pylink_config.NES_SCOREBOARD.size)).convert()
+        self.__surface.fill(BACKGROUND_COLOR)
+        self.__values = {}
+        self.__heart_images = None
+        # Everything needs drawing the first time
+        self.__dirty_rects = [self.__surface.get_rect()]
+
+    def glyph(self, character):
+        """
+        Return the pre-rendered Surface for character, rendering and
+        caching it first if it is not one of GLYPHS.
+        """
+        if character not in self.__glyphs:
+            self.__glyphs[character] = self.__font.render(
+                character, True, TEXT_COLOR)
+        return self.__glyphs[character]
+
+    def __field_rect(self, name):
+        """Return the Rect on the scoreboard of the named number field."""
+        location, num_characters = NUMBER_FIELDS[name]
+        return pygame.Rect(
+            self.__target.size(location),
+            (num_characters * self.__glyph_width,
+             self.__font.get_height()))
+
+    def __set_number(self, name, value):
+        """
+        Show value in the named number field, if it is not already
+        showing.
+        """
+        if self.__values.get(name) == value:
+            return
+        self.__values[name] = value
+        rect = self.__field_rect(name)
+        self.__surface.fill(BACKGROUND_COLOR, rect)
+        text = str(value)[:NUMBER_FIELDS[name][1]]
+        self.__surface.blits(
+            [
+                (self.glyph(character),
+                 (rect.left + (index * self.__glyph_width), rect.top))
+                for index, character in enumerate(text)
+            ],
+            doreturn=False)
+        self.__dirty_rects.append(rect)
+
+    def set_fps(self, fps):
+        """Show the frame rate."""
+        self.__set_number('fps', fps)
+
+    def set_rupees(self, rupees):
+        """Show the number of rupees Link has."""
+        self.__set_number('rupees', 'X' + str(rupees))
+
+    def set_keys(self, keys):
+        """Show the number of keys Link has."""
+        self.__set_number('keys', 'X' + str(keys))
+
+    def set_hearts(self, hearts, max_hearts):
+        """
+        Show Link's hearts. Full hearts are red and empty ones pink.
+
+        Args:
+            hearts: The number of full hearts.
+            max_hearts: The number of heart containers.
+        """
+        value = (min(hearts, max_hearts), min(max_hearts, MAX_HEARTS))
+        if self.__values.get('hearts') == value:
+            return
+        self.__values['hearts'] = value
+        if self.__heart_images is None:
+            self.__heart_images = tuple(
+                sprite_atlas.sprite('icons', name, self.__target.scale)
+                for name in ('pink_heart', 'red_heart'))
+        heart_width, heart_height = self.__heart_images[0].get_size()
+        left, top = self.__target.size(HEARTS_LOCATION)
+        rect = pygame.Rect(
+            left, top,
+            HEARTS_PER_ROW * heart_width,
+            (MAX_HEARTS // HEARTS_PER_ROW) * heart_height)
+        self.__surface.fill(BACKGROUND_COLOR, rect)
+        for index in range(value[1]):
+            row, column = divmod(index, HEARTS_PER_ROW)
+            self.__surface.blit(
+                self.__heart_images[index < value[0]],
+                (left + (column * heart_width),
+                 top + (row * heart_height)))
+        self.__dirty_rects.append(rect)
+
+    def draw(self):
+        """
+        Copy the parts of the scoreboard that changed since the last
+        call onto the render target.
+
+        Returns:
+            A list of the Rects of the screen that changed, in PYLINK
+            coordinates.
+        """
+        game_window = self.__target.surface()
+        scoreboard = self.__target.rect(pylink_config.PYLINK_SCOREBOARD)
+        changed = []
+        for rect in self.__dirty_rects:
+            target_rect = rect.move(scoreboard.topleft)
+            game_window.blit(self.__surface, target_rect, rect)
+            changed.append(self.__target.pylink_rect(target_rect))
+        self.__dirty_rects = []
+        return changed
@@ -1,63 +1,23 @@
 """Loads images and icons for the game"""
 import pygame
-import pylink_config
-import tile_loader
+import sprite_atlas
 import game_screen
 
 def file_select_background():
     """Return the background image for the file select menu."""
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=pylink_config.NES_WINDOW_SIZE,
-        border=(0, 0),
-        offset=(3, 504),
-        final_tile_size=pylink_config.WINDOW_SIZE)
-    return table[0][0]
-
-# def intro_text():
-#     """
-#     Load the intro text and treasure list.
-#     """
-#     table = tile_loader.load_tile_table(
-#         filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-#         original_tile_size=(252, 24),
-#         border=(0, 0),
-#         offset=(260, 609),
-#         tile_scaling=pylink_config.TILE_SCALING,
-#         colorkey_location=(0, 0))
-#     return table[0][0]
+    return sprite_atlas.sprite('file_select', 'background')
 
 def pink_heart():
     """Return the pink heart image."""
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(8, 8),
-        border=(0, 0),
-        offset=(278, 734),
-        tile_scaling=pylink_config.TILE_SCALING,
-        colorkey_location=(0, 0))
-    return table[0][0]
+    return sprite_atlas.sprite('icons', 'pink_heart')
 
 def red_heart():
     """Return the red heart image."""
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(8, 8),
-        border=(0, 0),
-        offset=(270, 734),
-        tile_scaling=pylink_config.TILE_SCALING,
-        colorkey_location=(0, 0))
-    return table[0][0]
+    return sprite_atlas.sprite('icons', 'red_heart')
 
 def pink_cursor():
-    """Return the red heart image."""
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(8, 8),
-        border=(0, 0),
-        offset=(262, 734),
-        tile_scaling=pylink_config.TILE_SCALING)
-    return table[0][0]
+    """Return the pink cursor image."""
+    return sprite_atlas.sprite('icons', 'pink_cursor')
 
 if __name__ == '__main__':
     # Draw the loaded and scaled tiles on the screen
@@ -0,0 +1,97 @@
+"""
+Recording and replaying what the player pressed.
+
+The controller (see the controller module) is read once a tick, and
+everything the player does comes from the buttons held on each tick.
+Recording those, one byte a tick, is enough to play a session back
+exactly, tick for tick, however fast or slow it is replayed. This makes
+any session a repeatable scenario for tests and benchmarks.
+
+An input log file is a header followed by the buttons held on each
+tick, in order, as one byte each:
+
+    magic     8 bytes   MAGIC
+    version   1 byte    VERSION
+    seed      8 bytes   unsigned little endian, the random seed the
+                        session was played with
+    buttons   1 byte a tick, to the end of the file
+
+The game does not use random numbers yet, so the seed is always 0 for
+now. It is there so that logs will not have to change format once it
+does.
+
+For example:
+
+    recording = InputLog()
+    recording.record(controller.held)  # every tick
+    recording.save('walk.inputs')
+
+    for held in input_log.load('walk.inputs'):
+        controller.update(held)
+"""
+import struct
+
+#: The first bytes of every input log file
+MAGIC = b'PYLINKIN'
+
+#: The version of the file format written by save()
+VERSION = 1
+
+_HEADER = struct.Struct('<8sBQ')
+
+
+class InputLog(object):
+    """
+    The buttons held on each tick of a session, and its random seed.
+    Iterating over it gives the buttons held on each tick, in order.
+    """
+
+    def __init__(self, seed=0, ticks=b''):
+        """
+        Args:
+            seed: The random seed the session was played with.
+            ticks: The buttons held on each tick so far, one byte each.
+        """
+        self.seed = seed
+        self.__ticks = bytearray(ticks)
+
+    def record(self, held):
+        """Add the buttons held on the next tick, as a bitmask."""
+        self.__ticks.append(held)
+
+    def __len__(self):
+        return len(self.__ticks)
+
+    def __iter__(self):
+        return iter(self.__ticks)
+
+    def save(self, filename):
+        """Write the log to filename, see the module documentation."""
+        with open(filename, 'wb') as log_file:
+            log_file.write(_HEADER.pack(MAGIC, VERSION, self.seed))
+            log_file.write(self.__ticks)
+
+
+def load(filename):
+    """
+    Read the input log in filename.
+
+    Returns:
+        The InputLog.
+
+    Raises:
+        ValueError: If filename is not an input log this version can
+            read.
+    """
+    with open(filename, 'rb') as log_file:
+        data = log_file.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f'{filename} is too short to be an input log')
+    magic, version, seed = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f'{filename} is not an input log')
+    if version != VERSION:
+        raise ValueError(
+            f'{filename} is version {version} of the input log format,'
+            + f' only version {VERSION} can be read')
+    return InputLog(seed, data[_HEADER.size:])
@@ -1,11 +1,31 @@
 """
 Handles the Link playable character
+
+Link is the first entity in the entity store (see entities). His
+facing direction, velocity, sub-pixels, step and hitbox are kept in its
+arrays, and the store's update() steps his animation and works out how
+far he walks each tick along with every other entity. He then makes
+that move himself, so that he can check it against the terrain first.
 """
-import os
 import pygame
-import numpy
+import asset_manager
+import entities
 import overworld
 import pylink_config
+import render_target
+import sprite_atlas
+import walkability
+
+#: How long one tick of the game loop is, in seconds
+TICK_SECS = 1.0 / pylink_config.SIMULATION_TICKS_PER_SEC
+
+#: Link's velocity walking towards each facing direction
+_VELOCITIES = {
+    "left": pylink_config.LINK_MOVE_LEFT_VELOCITY,
+    "up": pylink_config.LINK_MOVE_UP_VELOCITY,
+    "right": pylink_config.LINK_MOVE_RIGHT_VELOCITY,
+    "down": pylink_config.LINK_MOVE_DOWN_VELOCITY,
+}
 
 
 def should_switch_maps(next_rect):
@@ -17,6 +37,41 @@ def should_switch_maps(next_rect):
     return not pylink_config.PYLINK_MAP.contains(next_rect)
 
 
+def collision_rect(rect):
+    """
+    Return the part of Link's bounding rectangle, rect, that bumps into
+    things on the map, relative to the map's top left corner.
+    Like on the NES, this is only the bottom half of Link, so his head
+    can overlap the trees and rocks above him.
+    """
+    half_height = rect.height // 2
+    return pygame.Rect(
+        rect.left - pylink_config.PYLINK_MAP.left,
+        rect.top + half_height - pylink_config.PYLINK_MAP.top,
+        rect.width,
+        rect.height - half_height)
+
+
+def collision_mask(image, size):
+    """
+    Return a pygame.mask.Mask of the part of one of Link's images that
+    bumps into things, the same part as collision_rect() but only where
+    the image is not transparent.
+
+    Args:
+        image: The image, with its colorkey set.
+        size: The (width, height) of the image in PYLINK coordinates,
+            which the mask is scaled to if the image is another size.
+    """
+    mask = pygame.mask.from_surface(image)
+    if mask.get_size() != tuple(size):
+        mask = mask.scale(size)
+    half_height = size[1] // 2
+    collision = pygame.mask.Mask((size[0], size[1] - half_height))
+    collision.draw(mask, (0, -half_height))
+    return collision
+
+
 class Link(object):
     """
     The Link player object.
@@ -45,269 +100,210 @@ class Link(object):
         if Link.__instance is not None:
             raise Exception("This class is a singleton. Use 'Link.get_instance()' instead of 'Link()'")
         else:
-            # Load the sprite sheet with all of Link's images, and scale it
-            # to the game's scale.
-            self.__sprite_sheet = pygame.image.load(os.path.join(
-                'assets', 'NES-TheLegendofZelda-Link.png'))
-            self.__sprite_sheet = pygame.transform.scale(self.__sprite_sheet, tuple(
-                pylink_config.NES_TO_PYLINK_SCALE_FACTOR * numpy.array(self.__sprite_sheet.get_size())))
-            self.__sprite_sheet.convert()
-
-            # Start the periodic event for changing steps. When this fires,
-            # this class' move() method will be called and, if Link
-            # is moving, the self.__step setting will toggle so that the
-            # code knows which of the two sprites to show.
-            # Once started, the move() method will get called
-            # periodically.
-            pygame.time.set_timer(pylink_config.MOVE_LINK, pylink_config.LINK_MOVE_INTERVAL_MSECS)
+            # All of Link's images are in the "link" sprite atlas, scaled
+            # to the render target's scale.
+            self.__target = render_target.get()
+            self.__atlas = sprite_atlas.get('link', self.__target.scale)
 
             # Setup Link's initial position.
             # Link's top left corner ends up in the center instead of him being dead
             # center at the start, but the tiles around are clear and this works
             # just fine.
-            self.facing_direction = "down"
+            self.__frames = self.__build_frames()
+            self.__rect = pygame.Rect(pylink_config.PYLINK_MAP.center, (0, 0))
+
+            # While Link is walking, the entity store toggles his step
+            # every LINK_STEP_INTERVAL_SECS so that the code knows which
+            # of the two sprites to show. His rectangle is where he is
+            # to the nearest NES pixel, scaled up to PYLINK coordinates,
+            # and the store keeps how far he is past that in NES
+            # sub-pixels, so that he can walk a fraction of a pixel each
+            # tick like on the NES.
+            self.__store = entities.get()
+            self.__entity = self.__store.add(
+                self.__nes_position(), (0, 0, 0, 0),
+                facing=entities.FACINGS.index("down"),
+                num_frames=2,
+                frame_secs=pylink_config.LINK_STEP_INTERVAL_SECS,
+                self_moved=True)
             self.__moving = False
-            self.__step = 0
-            self.__facing_left_subsurface = [None, None]
-            self.__facing_up_subsurface = [None, None]
-            self.__facing_right_subsurface = [None, None]
-            self.__facing_down_subsurface = [None, None]
-            self.__current_subsurface = self.__get_facing_down_subsurface(
-                self.__step)
-            self.__rect = pygame.Rect(pylink_config.PYLINK_MAP.center, self.__current_subsurface.get_size())
-            self.velocity = pylink_config.LINK_STOPPED_VELOCITY
+            self.__show_frame()
+            # Where move() works out Link's next location, reused so that
+            # taking a step does not create a new Rect.
+            self.__next_rect = self.__rect.copy()
+            self.__drawn_subsurface = None
+            self.__drawn_rect = self.__rect.copy()
             Link.__instance = self
 
-    def __get_facing_left_subsurface(self, step):
-        """
-        Return the subsurface that contains Link facing_direction left.
-        This gets called only when Link switches to facing_direction in this direction,
-        or when he takes a step.
-        """
-        if self.__facing_left_subsurface[0] is None:
-            self.__facing_left_subsurface[0] = self.__sprite_sheet.subsurface(
-                pygame.Rect(pylink_config.scale_nes_tuple_to_pylink((35, 11)), pylink_config.scale_nes_tuple_to_pylink((16, 16))))
-            self.__facing_left_subsurface[0].set_colorkey(
-                self.__facing_left_subsurface[0].get_at((0, 0)))
-            # The image in the sprite sheet is actually facing_direction right, flip
-            # it to face left
-            self.__facing_left_subsurface[0] = pygame.transform.flip(
-                self.__facing_left_subsurface[0], True, False)
-            # Turn off alpha so that colorkey works for transparency
-            self.__facing_left_subsurface[0].set_alpha(None)
-
-        if self.__facing_left_subsurface[1] is None:
-            self.__facing_left_subsurface[1] = self.__sprite_sheet.subsurface(
-                pygame.Rect(pylink_config.scale_nes_tuple_to_pylink((52, 12)), pylink_config.scale_nes_tuple_to_pylink((15, 15))))
-            self.__facing_left_subsurface[1].set_colorkey(
-                self.__facing_left_subsurface[1].get_at((0, 0)))
-            # The image in the sprite sheet is actually facing_direction right, flip
-            # it to face left
-            self.__facing_left_subsurface[1] = pygame.transform.flip(
-                self.__facing_left_subsurface[1], True, False)
-            # Turn off alpha so that colorkey works for transparency
-            self.__facing_left_subsurface[1].set_alpha(None)
-        return self.__facing_left_subsurface[step]
-
-    def __get_facing_up_subsurface(self, step):
-        """
-        Return the subsurface that contains Link facing_direction up.
-        This gets called only when Link switches to facing_direction in this direction,
-        or when he takes a step.
-        """
-        for index, offset in enumerate([(69, 11), (86, 11)]):
-            if self.__facing_up_subsurface[index] is None:
-                self.__facing_up_subsurface[index] = self.__sprite_sheet.subsurface(pygame.Rect(
-                    pylink_config.scale_nes_tuple_to_pylink(offset), pylink_config.scale_nes_tuple_to_pylink((14, 16))))
-                self.__facing_up_subsurface[index].set_colorkey(
-                    self.__facing_up_subsurface[index].get_at((0, 0)))
-                # Turn off alpha so that colorkey works for transparency
-                self.__facing_up_subsurface[index].set_alpha(None)
-        return self.__facing_up_subsurface[step]
-
-    def __get_facing_right_subsurface(self, step):
-        """
-        Return the subsurface that contains Link facing_direction right.
-        This gets called only when Link switches to facing_direction in this direction,
-        or when he takes a step.
-        """
-        if self.__facing_right_subsurface[0] is None:
-            self.__facing_right_subsurface[0] = self.__sprite_sheet.subsurface(
-                pygame.Rect(pylink_config.scale_nes_tuple_to_pylink((35, 11)), pylink_config.scale_nes_tuple_to_pylink((16, 16))))
-            self.__facing_right_subsurface[0].set_colorkey(
-                self.__facing_right_subsurface[0].get_at((0, 0)))
-            # Turn off alpha so that colorkey works for transparency
-            self.__facing_right_subsurface[0].set_alpha(None)
-        if self.__facing_right_subsurface[1] is None:
-            self.__facing_right_subsurface[1] = self.__sprite_sheet.subsurface(
-                pygame.Rect(pylink_config.scale_nes_tuple_to_pylink((52, 12)), pylink_config.scale_nes_tuple_to_pylink((15, 15))))
-            self.__facing_right_subsurface[1].set_colorkey(
-                self.__facing_right_subsurface[1].get_at((0, 0)))
-            # Turn off alpha so that colorkey works for transparency
-            self.__facing_right_subsurface[1].set_alpha(None)
-        return self.__facing_right_subsurface[step]
-
-    def __get_facing_down_subsurface(self, step):
-        """
-        Return the subsurface that contains Link facing_direction down.
-        This gets called only when Link switches to facing_direction in this direction,
-        or when he takes a step.
-        """
-        for index, offset in enumerate([(1, 11), (18, 11)]):
-            if self.__facing_down_subsurface[index] is None:
-                self.__facing_down_subsurface[index] = self.__sprite_sheet.subsurface(pygame.Rect(
-                    pylink_config.scale_nes_tuple_to_pylink(offset), pylink_config.scale_nes_tuple_to_pylink((15, 16))))
-                self.__facing_down_subsurface[index].set_colorkey(
-                    self.__facing_down_subsurface[index].get_at((0, 0)))
-                # Turn off alpha so that colorkey works for transparency
-                self.__facing_down_subsurface[index].set_alpha(None)
-        return self.__facing_down_subsurface[step]
+    @property
+    def facing_direction(self):
+        """The direction Link is facing, "down", "right", "left" or "up"."""
+        return entities.FACINGS[self.__store.facing[self.__entity]]
 
-    def left_keydown(self):
+    @facing_direction.setter
+    def facing_direction(self, facing_direction):
+        self.__store.facing[self.__entity] = entities.FACINGS.index(facing_direction)
+
+    @property
+    def velocity(self):
+        """Link's (x, y) velocity, in NES pixels per second."""
+        return tuple(self.__store.velocity[self.__entity])
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self.__store.velocity[self.__entity] = velocity
+
+    def entity(self):
+        """Return Link's id in the entity store."""
+        return self.__entity
+
+    def __nes_position(self):
+        """Return the top left of Link's rectangle in NES pixels."""
+        return (
+            self.__rect.left // pylink_config.NES_TO_PYLINK_SCALE_FACTOR,
+            self.__rect.top // pylink_config.NES_TO_PYLINK_SCALE_FACTOR)
+
+    def __build_frames(self):
+        """
+        Return the table of every image of Link, indexed by the facing
+        direction's index in entities.FACINGS and then by step. Each
+        entry is the subsurface to draw, its (width, height) in PYLINK
+        coordinates, its collision_mask() and its hitbox in the entity
+        store, the same part as collision_rect() in NES pixels.
+
+        All of the frames are looked up here, once, so that turning
+        and stepping only index into the table. Every frame is drawn
+        from Link's top left corner.
+        """
+        scale = pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+        frames = []
+        for direction in entities.FACINGS:
+            steps = []
+            for step in (0, 1):
+                image = self.__atlas.sprite(f'{direction}_{step}')
+                size = self.__size_of(image)
+                half_height = size[1] // 2
+                hitbox = (
+                    0, half_height // scale,
+                    size[0] // scale, (size[1] - half_height) // scale)
+                steps.append((image, size, collision_mask(image, size), hitbox))
+            frames.append(tuple(steps))
+        return tuple(frames)
+
+    def __size_of(self, subsurface):
+        """
+        Return the size of one of Link's images in PYLINK coordinates,
+        whatever the scale it was loaded at.
+        """
+        return self.__target.pylink_rect(subsurface.get_rect()).size
+
+    def __show_frame(self):
+        """
+        Switch to the image for Link's facing direction and step.
+        Not every image of Link is the same size, so this resizes his
+        bounding rectangle, in place, and his hitbox to match.
+        """
+        store, entity = self.__store, self.__entity
+        self.__step = store.frame[entity]
+        (self.__current_subsurface, self.__rect.size, self.__collision_mask,
+         store.hitbox[entity]) = self.__frames[store.facing[entity]][self.__step]
+
+    def __face(self, facing_direction, velocity):
         """
-        This method is called when the left arrow key is pressed.
+        Start Link walking towards facing_direction at velocity.
         """
-        self.facing_direction = "left"
+        self.facing_direction = facing_direction
         self.__moving = True
-        self.velocity = pylink_config.LINK_MOVE_LEFT_VELOCITY
-        self.__current_subsurface = self.__get_facing_left_subsurface(
-            self.__step)
-        # Not every image of Link is the same size, so recalculate
-        # his bounding rectangle after possibly switching facing_direction direction.
-        self.__rect = pygame.Rect(
-            self.__rect.topleft, self.__current_subsurface.get_size())
+        self.velocity = velocity
+        self.__show_frame()
+
+    def walk(self, facing_direction):
+        """
+        Walk towards facing_direction, "left", "up", "right" or "down",
+        or stand still if it is None. This is called every tick with the
+        direction from the controller, and does nothing if Link is
+        already doing that.
+        """
+        if facing_direction is None:
+            if self.__moving:
+                self.arrow_keyup()
+        elif not self.__moving or facing_direction != self.facing_direction:
+            self.__face(facing_direction, _VELOCITIES[facing_direction])
+
+    def left_keydown(self):
+        """
+        This method is called when Link starts walking left.
+        """
+        self.__face("left", pylink_config.LINK_MOVE_LEFT_VELOCITY)
 
     def up_keydown(self):
         """
-        This method is called when the up arrow key is pressed.
+        This method is called when Link starts walking up.
         """
-        self.facing_direction = "up"
-        self.__moving = True
-        self.velocity = pylink_config.LINK_MOVE_UP_VELOCITY
-        self.__current_subsurface = self.__get_facing_up_subsurface(
-            self.__step)
-        # Not every image of Link is the same size, so recalculate
-        # his bounding rectangle after possibly switching facing_direction direction.
-        self.__rect = pygame.Rect(
-            self.__rect.topleft, self.__current_subsurface.get_size())
+        self.__face("up", pylink_config.LINK_MOVE_UP_VELOCITY)
 
     def right_keydown(self):
         """
-        This method is called when the right arrow key is pressed.
+        This method is called when Link starts walking right.
         """
-        self.facing_direction = "right"
-        self.__moving = True
-        self.velocity = pylink_config.LINK_MOVE_RIGHT_VELOCITY
-        self.__current_subsurface = self.__get_facing_right_subsurface(
-            self.__step)
-        # Not every image of Link is the same size, so recalculate
-        # his bounding rectangle after possibly switching facing_direction direction.
-        self.__rect = pygame.Rect(
-            self.__rect.topleft, self.__current_subsurface.get_size())
+        self.__face("right", pylink_config.LINK_MOVE_RIGHT_VELOCITY)
 
     def down_keydown(self):
         """
-        This method is called when the down arrow key is pressed.
+        This method is called when Link starts walking down.
         """
-        self.facing_direction = "down"
-        self.__moving = True
-        self.velocity = pylink_config.LINK_MOVE_DOWN_VELOCITY
-        self.__current_subsurface = self.__get_facing_down_subsurface(
-            self.__step)
-        # Not every image of Link is the same size, so recalculate
-        # his bounding rectangle after possibly switching facing_direction direction.
-        self.__rect = pygame.Rect(
-            self.__rect.topleft, self.__current_subsurface.get_size())
+        self.__face("down", pylink_config.LINK_MOVE_DOWN_VELOCITY)
 
     def arrow_keyup(self):
         """
-        This method is called when any arrow key is released.
+        This method is called when Link stops walking.
         """
         self.__moving = False
         self.velocity = pylink_config.LINK_STOPPED_VELOCITY
 
-    # Used to simulate a switch statement for move.
-    # This is indexed by self.facing_direction
-    __toggle_steps_switcher = {
-        "left": lambda self, step: self.__get_facing_left_subsurface(step),  # pylint: disable=protected-access
-        "up": lambda self, step: self.__get_facing_up_subsurface(step),  # pylint: disable=protected-access
-        "down": lambda self, step: self.__get_facing_down_subsurface(step),  # pylint: disable=protected-access
-        "right": lambda self, step: self.__get_facing_right_subsurface(step)  # pylint: disable=protected-access
-    }
-
     def can_move_to(self, to_rect):
         """
         Determine if it is valid to move the Link rectangle
         to the to_rect location on the current map.
         Return True if it is OK, and False if not.
-        If an IndexError occurs at any point in the calculations,
-        assume it is not safe to move and return False
-
-        Right now this is cheating a bit. It turns out that the portion of
-        the overworld map that Link can move on is almost always sand and
-        is the same color, For now, the code is using the color of the
-        pixels at corners of Link's current bounding rectangle in the
-        direction of movement and comparing them with the ones at the
-        proposed new location. If they are the same, it is assumed that it
-        must be OK to move there, because it is, apparently, just as OK to
-        stay in this position. This does assume that the pixel at that
-        location on the surface is the color of the pixel in the background
-        which means that the pixel has to be transparent on Link's image.
-        Because of this, only some directions check the midpoint while
-        others do not.
-
-        Note that the "right" and "bottom" attributes of Rect are actually
-        outside the actual Rect (they are more a size than a pixel
-        coordinate). This means that these values need to be adjusted when
-        used in the get_at() call to get a pixel.
-        """
-        # Get the color of the pixel at Link's current location and at the
-        # proposed next location on the corners facing_direction the move
-        game_window = pygame.display.get_surface()
-        try:
-            if self.facing_direction == "left":
-                current_locations_colors = (
-                    game_window.get_at(self.__rect.midleft),
-                    game_window.get_at(tuple(numpy.add(self.__rect.bottomleft, (0, -1))))
-                )
-                next_locations_colors = (
-                    game_window.get_at(to_rect.midleft),
-                    game_window.get_at(tuple(numpy.add(to_rect.bottomleft, (0, -1))))
-                )
-            elif self.facing_direction == "up":
-                current_locations_colors = (
-                    game_window.get_at(self.__rect.topleft),
-                    game_window.get_at(tuple(numpy.add(self.__rect.topright, (-1, 0))))
-                )
-                next_locations_colors = (
-                    game_window.get_at(to_rect.topleft),
-                    game_window.get_at(tuple(numpy.add(to_rect.topright, (-1, 0))))
-                )
-            elif self.facing_direction == "right":
-                current_locations_colors = (
-                    game_window.get_at(tuple(numpy.add(self.__rect.bottomright, (-1, -1))))
-                )
-                next_locations_colors = (
-                    game_window.get_at(tuple(numpy.add(to_rect.bottomright, (-1, -1))))
-                )
-            elif self.facing_direction == "down":
-                current_locations_colors = (
-                    game_window.get_at(tuple(numpy.add(self.__rect.bottomleft, (0, -1)))),
-                    game_window.get_at(tuple(numpy.add(self.__rect.midbottom, (0, -1)))),
-                    game_window.get_at(tuple(numpy.add(self.__rect.bottomright, (-1, -1))))
-                )
-                next_locations_colors = (
-                    game_window.get_at(tuple(numpy.add(to_rect.bottomleft, (0, -1)))),
-                    game_window.get_at(tuple(numpy.add(to_rect.midbottom, (0, -1)))),
-                    game_window.get_at(tuple(numpy.add(to_rect.bottomright, (-1, -1))))
-                )
-            else:
-                raise Exception(f"Unknown facing_direction direction: '{self.facing_direction}'")
-        except IndexError:
-            return False
 
-        # Return whether they are the same or not
-        return current_locations_colors == next_locations_colors
+        This first looks up the cells under Link's collision rectangle
+        (see collision_rect()) in the current submap's walkability grid,
+        which is enough when they are all walkable. Otherwise the
+        visible pixels of Link's collision_mask() are checked against
+        the submap's blocking mask, so he can get right up against
+        things. Neither depends on what has been drawn to the screen.
+        Anything off the edge of the map is not OK to move to.
+        """
+        if should_switch_maps(to_rect):
+            return False
+        the_overworld = overworld.Overworld.get_instance()
+        collision = collision_rect(to_rect)
+        if walkability.is_clear(
+                the_overworld.walkability_grid(),
+                collision,
+                pylink_config.PYLINK_WALKABILITY_CELL_SIZE):
+            return True
+        return the_overworld.blocking_mask().overlap(
+            self.__collision_mask, collision.topleft) is None
+
+    def __slide(self, distance):
+        """
+        Move Link as far as he can go towards distance, in PYLINK
+        coordinates, when the full move is blocked. He either walks up
+        to the obstacle, or, if he is just clipping its corner, gets
+        nudged sideways so that he slides around it.
+        """
+        current = collision_rect(self.__rect)
+        moved = walkability.slide(
+            overworld.Overworld.get_instance().walkability_grid(),
+            current,
+            distance,
+            pylink_config.PYLINK_WALKABILITY_CELL_SIZE,
+            pylink_config.NES_TO_PYLINK_SCALE_FACTOR,
+            pylink_config.PYLINK_WALKABILITY_CELL_SIZE[0] // 2)
+        self.__rect.move_ip(
+            moved.left - current.left, moved.top - current.top)
 
     def switch_maps(self, facing_direction):
         """
@@ -316,8 +312,8 @@ class Link(object):
         current one. What this means for Link is that he needs to move to the
         opposite end of the game screen.
 
-        This method only moves where Link will be drawn next (i.e. it updates
-        self.__rect). It does NOT handle getting the tile for the next step
+        This method only moves where Link will be drawn next (i.e. it moves
+        self.__rect in place). It does NOT handle getting the tile for the next step
         because that is expected to have been taken care of in the move method
         before this one is called.
 
@@ -327,57 +323,105 @@ class Link(object):
         """
         game_window = pylink_config.PYLINK_MAP
         if facing_direction == "right":
-            self.__rect = self.__rect.move(game_window.left - self.__rect.left, 0)
+            self.__rect.left = game_window.left
         elif facing_direction == "left":
-            self.__rect = self.__rect.move(game_window.right - self.__rect.right, 0)
+            self.__rect.right = game_window.right
         elif facing_direction == "up":
-            self.__rect = self.__rect.move(0, game_window.bottom - self.__rect.bottom)
+            self.__rect.bottom = game_window.bottom
         elif facing_direction == "down":
-            self.__rect = self.__rect.move(0, game_window.top - self.__rect.top)
+            self.__rect.top = game_window.top
         else:
             raise Exception(f"Unknown facing_direction direction: '{facing_direction}'")
 
-    def move(self):
+    def update(self):
         """
-        If Link is moving, toggle the __step setting, set the
-        __current_surface to the correct one with the new step,
-        and shift the location
+        Act on what the entity store's update() worked out for Link
+        this tick: show the image for his step, which changes every
+        LINK_STEP_INTERVAL_SECS while he is walking, and make his move.
         """
-        if self.__moving:
+        if self.__store.frame[self.__entity] != self.__step:
             # Change the step image.
-            if self.__step == 0:
-                self.__step = 1
-            else:
-                self.__step = 0
-            self.__current_subsurface = self.__toggle_steps_switcher.get(self.facing_direction, lambda self, step: print("Unknown facing_direction direction: ", self.facing_direction))(self, self.__step)
+            self.__show_frame()
+        self.move()
 
-            # Not every image of Link is the same size, so recalculate
-            # his bounding rectangle after taking the step
-            self.__rect = pygame.Rect(
-                self.__rect.topleft, self.__current_subsurface.get_size())
+    def move(self):
+        """
+        If Link is moving, shift the location by the whole NES pixels
+        the entity store worked out he moves this tick. Link's
+        rectangle is updated in place, to the nearest NES pixel, and so
+        is his position in the store.
+        Link does not move while the map is scrolling to a new submap.
+        """
+        delta = self.__store.delta[self.__entity]
+        if self.__moving and not overworld.Overworld.get_instance().is_transitioning():
+            # Work out how many whole NES pixels Link moves this time,
+            # in PYLINK coordinates
+            scale = pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+            distance_x = int(delta[0]) * scale
+            distance_y = int(delta[1]) * scale
+            if distance_x == 0 and distance_y == 0:
+                return
+            delta[:] = 0
 
             # Calculate the bounding rectangle of the planned next location
-            next_rect = self.__rect.move(self.velocity)
+            next_rect = self.__next_rect
+            next_rect.update(self.__rect)
+            next_rect.move_ip(distance_x, distance_y)
 
             #
             # See if it is clear to move to the next location and
             # move if it is clear to do so.
             # If the move goe off an edge of the map, switch maps and move to
             # the other side of the new map.
-            # If it is not clear to move, try reducing the velocity for the
-            # next time around. Essentially, if Link can't move into a spot,
-            # can he squeeze into it?
+            # If it is not clear to move, slide as far as he can go, and
+            # forget the fraction of a pixel he was part way through.
             #
             if self.can_move_to(next_rect):
-                self.__rect = next_rect
+                self.__rect.topleft = next_rect.topleft
             elif should_switch_maps(next_rect):
                 overworld.Overworld.get_instance().switch_maps(self.facing_direction)
                 self.switch_maps(self.facing_direction)
             else:
-                self.velocity = tuple(map(round, numpy.multiply(self.velocity, 0.5)))
+                self.__store.subpixels[self.__entity] = 0
+                self.__slide((distance_x, distance_y))
+            self.__store.position[self.__entity] = self.__nes_position()
+        else:
+            delta[:] = 0
+
+    def needs_redraw(self):
+        """
+        Return True if Link has moved or changed images since he was
+        last drawn.
+        """
+        return (
+            self.__drawn_subsurface is not self.__current_subsurface
+            or self.__drawn_rect.topleft != self.__rect.topleft)
+
+    def drawn_rect(self):
+        """
+        Return the rectangle of the screen that Link was last drawn to.
+        """
+        return self.__drawn_rect
 
     def draw(self):
         """
         Draws Link to his current location on the screen.
+        While the map is scrolling to a new submap, Link is already
+        placed on the new submap, so he is shifted along with it.
+
+        Returns:
+            The rectangle of the screen that Link was drawn to.
         """
-        pygame.display.get_surface().blit(self.__current_subsurface, self.__rect.topleft)
+        game_window = self.__target.surface()
+        offset = overworld.Overworld.get_instance().scroll_offset()
+        self.__drawn_subsurface = self.__current_subsurface
+        self.__drawn_rect = self.__rect.move(offset)
+        if __debug__:
+            asset_manager.check_blit(self.__current_subsurface)
+        if offset == (0, 0):
+            game_window.blit(self.__current_subsurface, self.__target.point(self.__rect.topleft))
+            return self.__drawn_rect
+        game_window.set_clip(self.__target.rect(pylink_config.PYLINK_MAP))
+        game_window.blit(self.__current_subsurface, self.__target.point(self.__drawn_rect.topleft))
+        game_window.set_clip(None)
+        return self.__drawn_rect
@@ -0,0 +1,112 @@
+"""A small least-recently-used cache.
+
+Used to keep a bounded number of expensive-to-build objects, such as
+scaled map surfaces, in memory at once. The cache can also be bounded
+by the total size of what it holds, such as the bytes of pixels in a
+set of images.
+"""
+import collections
+
+
+class LruCache(object):
+    """
+    A dictionary-like cache that holds at most max_entries items.
+    When adding an item would go over that limit, the least recently
+    used item is dropped to make room for it.
+
+    If max_size is given, the least recently used items are also
+    dropped while the total size of the items is over max_size. The
+    most recently added item is always kept, even if it is bigger than
+    max_size on its own.
+    """
+
+    def __init__(self, max_entries, max_size=None, size_of=None):
+        """
+        Args:
+            max_entries: The maximum number of items to keep.
+            max_size: The maximum total size of the items to keep, or
+                None for no limit.
+            size_of: A function taking an item and returning its size.
+                Required if max_size is given.
+
+        Raises:
+            ValueError: Raises ValueError if max_entries is less than 1,
+                or if max_size is given without size_of.
+        """
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        if max_size is not None and size_of is None:
+            raise ValueError('size_of is needed to limit the size')
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__size_of = size_of or (lambda value: 0)
+        self.__entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def keys(self):
+        """Return a list of the keys, from least to most recently used."""
+        return list(self.__entries)
+
+    def get(self, key, default=None):
+        """
+        Return the item stored under key, marking it as the most
+        recently used, or default if there is no such item.
+        """
+        if key not in self.__entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    def put(self, key, value):
+        """
+        Store value under key as the most recently used item, dropping
+        the least recently used items if the cache is full.
+        """
+        self.remove(key)
+        self.__entries[key] = value
+        self.size += self.__size_of(value)
+        while len(self.__entries) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+                and len(self.__entries) > 1):
+            _, dropped = self.__entries.popitem(last=False)
+            self.size -= self.__size_of(dropped)
+
+    def remove(self, key):
+        """Drop the item stored under key, if there is one."""
+        if key in self.__entries:
+            self.size -= self.__size_of(self.__entries.pop(key))
+
+    def get_or_create(self, key, create):
+        """
+        Return the item stored under key. If there is no such item,
+        call create() to build it and store it first.
+
+        Args:
+            key: The key to look up.
+            create: A function taking no arguments that returns the
+                value to store when the key is not in the cache.
+
+        Returns:
+            The cached or newly created value.
+        """
+        if key in self.__entries:
+            return self.get(key)
+        self.misses += 1
+        value = create()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every item in the cache."""
+        self.__entries.clear()
+        self.size = 0
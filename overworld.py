@@ -2,15 +2,27 @@
 The overworld map.
 
 This module loads and manages the overworld map for the game.
-The entire map is loaded and scaled once when the init() function is
-called.
+The map is kept as a tile map (see overworld_tile_map) and one atlas
+of the tiles it uses, scaled up to the render target's size. Each
+submap is only drawn from the atlas the first time it is needed, and
+the drawn submaps are kept in a bounded LRU cache.
+
+The submaps next to the current one are drawn ahead of time on a
+worker thread, so that switching maps never has to draw a submap on
+the frame it happens. Switching maps scrolls the old submap out and
+the new one in, like the NES does.
 
 Only use this module to display the map and to transition to adjacent maps.
 """
-import os
+import concurrent.futures
 import numpy
 import pygame
+import asset_manager
+import lru_cache
+import overworld_tile_map
 import pylink_config
+import render_target
+import walkability
 
 #
 # The offsets below are used by switch_map to shift to the next map
@@ -25,6 +37,28 @@ switch_map_offsets = {
 }
 
 
+def load_tiles(target=None):
+    """
+    Load the overworld's tile map and its tiles, and scale the tile
+    atlas up to the render target's size. This does not touch the
+    display, so it is safe to call on any thread.
+
+    Args:
+        target: The RenderTarget to scale for, render_target.get() if
+            not given.
+
+    Returns:
+        The tile map, the tiles, and the scaled tile atlas, which is
+        not yet in the display's pixel format. Pass them to
+        Overworld.get_instance().
+    """
+    target = target or render_target.get()
+    tile_map, tiles = overworld_tile_map.load()
+    tile_atlas = overworld_tile_map.atlas_surface(tiles)
+    return tile_map, tiles, pygame.transform.scale(
+        tile_atlas, target.size(tile_atlas.get_size()))
+
+
 class Overworld(object):
     """
     The Overworld map.
@@ -37,16 +71,21 @@ class Overworld(object):
     __instance = None
 
     @staticmethod
-    def get_instance():
+    def get_instance(loaded_tiles=None):
         """
         Get an instance of the Overworld object.
         Use this instead of 'new Overworld()' to get the overworld object.
+
+        Args:
+            loaded_tiles: What load_tiles() returned, if it has already
+                been called, for example on another thread. This is
+                only used when the instance is first created.
         """
         if Overworld.__instance is None:
-            Overworld.__instance = Overworld()
+            Overworld.__instance = Overworld(loaded_tiles)
         return Overworld.__instance
 
-    def __init__(self):
+    def __init__(self, loaded_tiles=None):
         """
         Virtually private constructor.
         DO NOT USE 'new Overworld()', use 'Overworld.get_instance()' instead.
@@ -55,39 +94,116 @@ class Overworld(object):
             raise Exception(
                 "This class is a singleton. Use 'Link.get_instance()' instead of 'new Link()'")
         else:
-            self.__entire_overworld_map = pygame.image.load(os.path.join(
-                'assets', 'NES-TheLegendofZelda-Overworld.png'))
-            self.__entire_overworld_map = pygame.transform.scale(
-                self.__entire_overworld_map, pylink_config.scale_nes_tuple_to_pylink(self.__entire_overworld_map.get_size()))
-            self.__entire_overworld_map.convert()
+            # Only the tile map and one scaled copy of each distinct
+            # tile are kept. Scaling the whole map up front would take
+            # seconds and hundreds of MB.
+            self.__target = render_target.get()
+            self.__tile_map, tiles, tile_atlas = (
+                loaded_tiles or load_tiles(self.__target))
+            self.__map_rect = self.__target.rect(pylink_config.PYLINK_MAP)
+            self.__tile_size = self.__target.size(pylink_config.NES_TILE_SIZE)
+            self.__tile_atlas = asset_manager.display_format(tile_atlas)
+            self.__atlas_rects = [
+                overworld_tile_map.atlas_tile_rect(index, self.__tile_size)
+                for index in range(len(tiles))
+            ]
+            self.__walkable_tile_cells = walkability.tile_cells(tiles)
+            self.__walkability_grids = {}
+            self.__walkable_tile_pixels = walkability.tile_pixels(tiles)
+            self.__blocking_masks = {}
+            self.__scaled_submaps = lru_cache.LruCache(
+                pylink_config.OVERWORLD_SUBMAP_CACHE_SIZE)
+            self.__prefetcher = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='submap-prefetch')
+            self.__prefetching = {}
             # set self.__current_submap to the starting map
             self.__current_submap = (7, 7)
+            self.__previous_submap = None
+            self.__transition_direction = None
+            self.__transition_ticks = 0
             Overworld.__instance = self
+            self.prefetch_neighbours()
 
 
     def __submap(self, current_submap):
         """
-        Return the region of the overworld map referenced by (column, row).
+        Return the region of the overworld map referenced by (column, row)
+        at the size of the map section of the render target.
         This is returned as a pygame Surface object.
-        TODO: It would be better to have these as constants and not
-        recalculated every time.
+        The submap is drawn the first time it is asked for and then
+        served from the cache until it is pushed out by other submaps.
+        If it is being drawn by the prefetcher, wait for that instead.
+        """
+        future = self.__prefetching.pop(current_submap, None)
+        if future is not None and not future.cancelled():
+            self.__scaled_submaps.put(current_submap, future.result())
+        return self.__scaled_submaps.get_or_create(
+            current_submap, lambda: self.__draw_submap(current_submap))
+
+    def __draw_submap(self, submap):
         """
-        column, row = current_submap
-        # First get a copy of the map rect object, this gets us a window of the
-        # correct size.
-        map_window = pylink_config.PYLINK_MAP.copy()
+        Draw the submap at (column, row) from the tile atlas and return
+        it as a new pygame Surface.
+        This is safe to call from the prefetch thread. The new surface
+        has the atlas' pixel format so that it does not need converting.
+        """
+        column, row = submap
+        tile_width, tile_height = self.__tile_size
+        surface = pygame.Surface(
+            self.__map_rect.size, 0, self.__tile_atlas)
+        surface.blits(
+            [
+                (
+                    self.__tile_atlas,
+                    (tile_column * tile_width, tile_row * tile_height),
+                    self.__atlas_rects[tile_index]
+                )
+                for (tile_row, tile_column), tile_index
+                in numpy.ndenumerate(self.__tile_map[row, column])
+            ],
+            doreturn=False)
+        return surface
 
-        # Next, reset the window's base to (0, 0)
-        map_window.topleft = (0, 0)
+    def prefetch_neighbours(self):
+        """
+        Start drawing the submaps on each side of the current one on
+        the prefetch thread, if they are not already cached or being
+        drawn.
 
-        # Now, translate the window where it needs to be over the correct
-        # subregion of the map. (Note that there is a frame around each region)
-        map_window = map_window.move(
-            ((column * pylink_config.PYLINK_MAP.width) + ((column + 1) * pylink_config.NES_TO_PYLINK_SCALE_FACTOR * 1)),
-            ((row * pylink_config.PYLINK_MAP.height) + ((row + 1) * pylink_config.NES_TO_PYLINK_SCALE_FACTOR * 1)))
+        Returns:
+            A list of the futures for the submaps that are being drawn.
+        """
+        if self.__prefetcher is None:
+            return []
+        # Hold on to anything that has been drawn, and stop drawing
+        # anything that is no longer a neighbour and has not started.
+        for submap, future in list(self.__prefetching.items()):
+            if future.done():
+                del self.__prefetching[submap]
+                self.__scaled_submaps.put(submap, future.result())
+            elif future.cancel():
+                del self.__prefetching[submap]
 
-        # Next, create a subsurface where the window is now pointing and return it
-        return self.__entire_overworld_map.subsurface(map_window)
+        columns, rows = pylink_config.OVERWORLD_SIZE_IN_SUBMAPS
+        for offset in switch_map_offsets.values():
+            column, row = numpy.add(self.__current_submap, offset)
+            neighbour = (int(column), int(row))
+            if (0 <= neighbour[0] < columns and 0 <= neighbour[1] < rows
+                    and neighbour not in self.__scaled_submaps
+                    and neighbour not in self.__prefetching):
+                self.__prefetching[neighbour] = self.__prefetcher.submit(
+                    self.__draw_submap, neighbour)
+        return list(self.__prefetching.values())
+
+    def close(self):
+        """
+        Shut down the prefetch thread, dropping any submaps that it has
+        not started drawing yet. The submaps are drawn on this thread
+        from then on. Call this once the game is over.
+        """
+        if self.__prefetcher is not None:
+            self.__prefetcher.shutdown(wait=False, cancel_futures=True)
+            self.__prefetcher = None
 
     def switch_maps(self, direction):
         """
@@ -95,14 +211,144 @@ class Overworld(object):
         parameter. This is called from within the move method of the Link
         character when he is walking off the edge of the current map.
 
+        The map then scrolls over to the new submap. Use
+        is_transitioning() to see if that is still going on.
+
         It is assumed that there is another map in the direction requested.
         It is the responsibility of the map itself to have a border of
         blocking tiles on any edge that is the edge of the map.
         """
+        self.__previous_submap = self.__current_submap
         self.__current_submap = tuple(numpy.add(self.__current_submap, switch_map_offsets[direction]))
+        self.__transition_direction = direction
+        self.__transition_ticks = 0
+        self.prefetch_neighbours()
+
+    def __transition_distance(self):
+        """
+        Return how far, in pixels, the map scrolls during the current
+        transition.
+        """
+        if self.__transition_direction in ("left", "right"):
+            return pylink_config.PYLINK_MAP.width
+        return pylink_config.PYLINK_MAP.height
 
-    def draw(self):
+    def __transition_remaining(self):
         """
-        Draws the entire current submap to the main window.
+        Return how far, in pixels, the map still has to scroll before
+        the new submap is in place.
+        """
+        if self.__transition_direction is None:
+            return 0
+        scrolled = (
+            self.__transition_ticks
+            * pylink_config.SUBMAP_SCROLL_NES_PIXELS_PER_SEC
+            * pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+            // pylink_config.SIMULATION_TICKS_PER_SEC)
+        remaining = self.__transition_distance() - scrolled
+        if remaining <= 0:
+            self.__transition_direction = None
+            return 0
+        return remaining
+
+    def update(self):
+        """
+        Advance the map by one tick of the game loop. This scrolls the
+        map while switching to a new submap.
+        """
+        if self.__transition_direction is not None:
+            self.__transition_ticks += 1
+
+    def is_transitioning(self):
+        """
+        Return True while the map is scrolling to a new submap.
+        """
+        return self.__transition_remaining() > 0
+
+    def scroll_offset(self):
+        """
+        Return the (x, y) offset from its resting place that the current
+        submap is drawn at. This is (0, 0) except while scrolling to a
+        new submap. Anything drawn on top of the map should be shifted
+        by this too.
+        """
+        remaining = self.__transition_remaining()
+        if remaining == 0:
+            return (0, 0)
+        offset_x, offset_y = switch_map_offsets[self.__transition_direction]
+        return (offset_x * remaining, offset_y * remaining)
+
+    def current_submap(self):
+        """Return the (column, row) of the submap being shown."""
+        return self.__current_submap
+
+    def walkability_grid(self):
+        """
+        Return the walkability grid of the current submap. See the
+        walkability module for how to use it.
+        The grid is built the first time each submap is asked for and
+        kept from then on. Each one is less than 1KB.
+        """
+        if self.__current_submap not in self.__walkability_grids:
+            column, row = self.__current_submap
+            self.__walkability_grids[self.__current_submap] = (
+                walkability.submap_grid(
+                    self.__tile_map[row, column],
+                    self.__walkable_tile_cells))
+        return self.__walkability_grids[self.__current_submap]
+
+    def blocking_mask(self):
+        """
+        Return a pygame.mask.Mask of where the current submap is
+        blocked, in PYLINK coordinates relative to the map's top left.
+        See walkability.blocking_mask().
+        The mask is built the first time each submap is asked for and
+        kept from then on. Each one is about 50KB.
+        """
+        if self.__current_submap not in self.__blocking_masks:
+            column, row = self.__current_submap
+            self.__blocking_masks[self.__current_submap] = (
+                walkability.blocking_mask(
+                    walkability.submap_grid(
+                        self.__tile_map[row, column],
+                        self.__walkable_tile_pixels),
+                    pylink_config.NES_TO_PYLINK_SCALE_FACTOR))
+        return self.__blocking_masks[self.__current_submap]
+
+    def draw(self, area=None):
+        """
+        Draws the entire current submap to the render target. While
+        scrolling to a new submap, this draws the part of the previous
+        submap that is still showing next to the new one.
+
+        Args:
+            area: If given, only redraw the part of the map under this
+                rectangle of the screen, in PYLINK coordinates. This is
+                ignored while scrolling.
         """
-        pygame.display.get_surface().blit(self.__submap(self.__current_submap), pylink_config.PYLINK_MAP)
+        game_window = self.__target.surface()
+        map_rect = self.__map_rect
+        offset = self.__target.point(self.scroll_offset())
+        submap = self.__submap(self.__current_submap)
+        if __debug__:
+            asset_manager.check_blit(submap)
+        if offset == (0, 0):
+            if area is None:
+                game_window.blit(submap, map_rect)
+                return
+            area = self.__target.rect(area).clip(map_rect)
+            game_window.blit(
+                submap,
+                area,
+                area.move(-map_rect.left, -map_rect.top))
+            return
+        offset_x, offset_y = switch_map_offsets[self.__transition_direction]
+        previous_offset = (
+            offset[0] - (offset_x * map_rect.width),
+            offset[1] - (offset_y * map_rect.height))
+        game_window.set_clip(map_rect)
+        game_window.blit(
+            self.__submap(self.__previous_submap),
+            map_rect.move(previous_offset))
+        game_window.blit(submap, map_rect.move(offset))
+        game_window.set_clip(None)
@@ -0,0 +1,197 @@
+"""The overworld as a map of tile indices.
+
+The overworld map file is a flat bitmap, but every submap in it is made
+up of 16x16 tiles, and only a small number of different tiles are
+used. This module finds each distinct tile and records, for every tile
+position of every submap, the index of the tile drawn there.
+
+The result is a uint8 tile map with the shape
+(submap rows, submap columns, tile rows, tile columns), which is
+(8, 16, 11, 16) for the overworld, along with a table of the distinct
+tiles at their native NES size. Together they take a few tens of KB
+instead of the full bitmap.
+
+Note that the tiles in NES-TheLegendofZelda-OverworldTiles.png are
+drawn with a different palette than the overworld map and do not
+include every tile the map uses, so the tile table is built from the
+map itself rather than from that sheet.
+
+Building the tile map takes a moment, so it is done the first time the
+game runs and then saved to the cache directory. Run this module to
+rebuild it by hand.
+"""
+import os
+import numpy
+import pygame
+import pylink_config
+
+#: The file the tile map is built from
+OVERWORLD_FILENAME = os.path.join(
+    'assets', 'NES-TheLegendofZelda-Overworld.png')
+
+#: The file the tile map is saved to after it is built
+TILE_MAP_FILENAME = os.path.join(
+    pylink_config.CACHE_DIRECTORY, 'overworld_tile_map.npz')
+
+#: Bump this whenever the layout of the saved file changes so that old
+#: files are rebuilt instead of misread.
+TILE_MAP_FORMAT_VERSION = 1
+
+#: The number of tiles in each row of the tile atlas
+ATLAS_COLUMNS = 16
+
+#: The number of (columns, rows) of tiles in each submap
+SUBMAP_SIZE_IN_TILES = (
+    pylink_config.NES_MAP.width // pylink_config.NES_TILE_SIZE[0],
+    pylink_config.NES_MAP.height // pylink_config.NES_TILE_SIZE[1]
+)
+
+
+def submap_rect(submap):
+    """
+    Return the region of the overworld map file that holds the submap
+    at (column, row). Each submap has a one pixel frame around it.
+
+    Args:
+        submap: The (column, row) of the submap in the overworld.
+
+    Returns:
+        A pygame Rect of the submap in the overworld map file.
+    """
+    column, row = submap
+    return pygame.Rect(
+        (column * (pylink_config.NES_MAP.width + 1)) + 1,
+        (row * (pylink_config.NES_MAP.height + 1)) + 1,
+        pylink_config.NES_MAP.width,
+        pylink_config.NES_MAP.height)
+
+
+def build(overworld_pixels):
+    """
+    Split the overworld map into tiles and index them.
+
+    Args:
+        overworld_pixels: The entire overworld map as a numpy array of
+            (y, x, rgb) pixels. There is expected to be a one pixel
+            frame around every submap.
+
+    Returns:
+        A tuple of (tile_map, tiles). tile_map is a uint8 array indexed
+        by [submap row, submap column, tile row, tile column] with the
+        index of the tile at that spot. tiles is a uint8 array of the
+        distinct tiles indexed by [tile index, y, x, rgb].
+
+    Raises:
+        ValueError: Raises ValueError if the map uses more distinct
+            tiles than fit in a uint8.
+    """
+    submap_columns, submap_rows = pylink_config.OVERWORLD_SIZE_IN_SUBMAPS
+    tile_columns, tile_rows = SUBMAP_SIZE_IN_TILES
+    tile_width, tile_height = pylink_config.NES_TILE_SIZE
+    cells = numpy.empty(
+        (submap_rows, submap_columns, tile_rows, tile_columns,
+         tile_height, tile_width, 3),
+        dtype=numpy.uint8)
+    for row in range(submap_rows):
+        for column in range(submap_columns):
+            rect = submap_rect((column, row))
+            submap = overworld_pixels[
+                rect.top:rect.bottom, rect.left:rect.right]
+            # Split the (y, x) pixels of the submap into
+            # (tile row, y in tile, tile column, x in tile) and then
+            # bring the two tile coordinates to the front.
+            cells[row, column] = submap.reshape(
+                tile_rows, tile_height, tile_columns, tile_width, 3
+            ).transpose(0, 2, 1, 3, 4)
+    # Compare whole tiles at once by viewing each one's pixels as a
+    # single opaque value. This is much faster than unique(axis=0).
+    tile_bytes = tile_height * tile_width * 3
+    flat_cells = numpy.ascontiguousarray(
+        cells.reshape(-1, tile_bytes)
+    ).view(numpy.dtype((numpy.void, tile_bytes))).ravel()
+    tiles, tile_indices = numpy.unique(flat_cells, return_inverse=True)
+    if len(tiles) > 256:
+        raise ValueError(
+            f'The overworld uses {len(tiles)} distinct tiles, '
+            + 'which is more than a uint8 tile map can index')
+    tile_map = tile_indices.astype(numpy.uint8).reshape(
+        submap_rows, submap_columns, tile_rows, tile_columns)
+    tiles = numpy.frombuffer(tiles.tobytes(), dtype=numpy.uint8)
+    return (tile_map, tiles.reshape(-1, tile_height, tile_width, 3))
+
+
+def save(tile_map, tiles, filename=TILE_MAP_FILENAME):
+    """Save a tile map and its tiles to filename."""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'wb') as tile_map_file:
+        numpy.savez_compressed(
+            tile_map_file,
+            version=TILE_MAP_FORMAT_VERSION,
+            tile_map=tile_map,
+            tiles=tiles)
+
+
+def load(filename=TILE_MAP_FILENAME, source_filename=OVERWORLD_FILENAME):
+    """
+    Load the overworld tile map, building and saving it first if there
+    is no saved copy or if the saved copy is out of date.
+
+    Returns:
+        A tuple of (tile_map, tiles) as described for build().
+    """
+    if (os.path.exists(filename)
+            and os.path.getmtime(filename) >= os.path.getmtime(source_filename)):
+        with numpy.load(filename) as saved:
+            if saved['version'] == TILE_MAP_FORMAT_VERSION:
+                return (saved['tile_map'], saved['tiles'])
+    overworld_pixels = pygame.surfarray.array3d(
+        pygame.image.load(source_filename)).transpose(1, 0, 2)
+    tile_map, tiles = build(overworld_pixels)
+    save(tile_map, tiles, filename)
+    return (tile_map, tiles)
+
+
+def atlas_surface(tiles):
+    """
+    Lay out all of the tiles in one surface, ATLAS_COLUMNS to a row.
+
+    Args:
+        tiles: The tiles as returned by build().
+
+    Returns:
+        A pygame Surface with every tile at its native size. Use
+        atlas_tile_rect() to find a tile in it.
+    """
+    num_tiles, tile_height, tile_width, _ = tiles.shape
+    atlas_rows = -(-num_tiles // ATLAS_COLUMNS)
+    pixels = numpy.zeros(
+        (atlas_rows * tile_height, ATLAS_COLUMNS * tile_width, 3),
+        dtype=numpy.uint8)
+    for index, tile in enumerate(tiles):
+        row, column = divmod(index, ATLAS_COLUMNS)
+        pixels[
+            row * tile_height:(row + 1) * tile_height,
+            column * tile_width:(column + 1) * tile_width] = tile
+    return pygame.surfarray.make_surface(pixels.transpose(1, 0, 2))
+
+
+def atlas_tile_rect(index, tile_size):
+    """
+    Return the Rect of the tile at index in an atlas laid out by
+    atlas_surface() and scaled so each tile is tile_size.
+    """
+    row, column = divmod(index, ATLAS_COLUMNS)
+    return pygame.Rect(
+        column * tile_size[0], row * tile_size[1],
+        tile_size[0], tile_size[1])
+
+
+if __name__ == '__main__':
+    # Rebuild the saved tile map and report how big it is
+    TILE_MAP, TILES = build(pygame.surfarray.array3d(
+        pygame.image.load(OVERWORLD_FILENAME)).transpose(1, 0, 2))
+    save(TILE_MAP, TILES)
+    print(f'{len(TILES)} distinct tiles')
+    print(f'tile map: {TILE_MAP.shape} {TILE_MAP.nbytes} bytes')
+    print(f'tiles: {TILES.nbytes} bytes')
+    print(f'saved to {TILE_MAP_FILENAME}')
@@ -0,0 +1,193 @@
+"""
+Measures where the frame time goes.
+
+The main loop is split into phases: handling events, simulating the
+game, drawing the overworld, drawing Link and presenting the frame.
+Wrap each phase in profiler.phase(name) and call end_frame() once the
+frame is done. The time spent in each phase is kept for the last
+PROFILER_FRAMES frames in a fixed size ring buffer, so profiling a long
+session uses no more memory than a short one.
+
+The ProfilerOverlay draws the 50th, 95th and 99th percentile of each
+phase over the map, and write_csv() saves the buffer for looking at
+later.
+"""
+import csv
+import time
+import numpy
+import pygame
+import pylink_config
+import render_target
+
+#: The phases of a frame, in the order they run
+PHASES = ('events', 'simulation', 'overworld_draw', 'link_draw', 'present')
+
+#: The percentiles shown by the overlay
+PERCENTILES = (50, 95, 99)
+
+
+class _Phase(object):
+    """
+    Times one phase of the frame as a context manager. Made once per
+    phase so that timing a phase does not allocate anything.
+    """
+
+    def __init__(self, profiler, column):
+        self.__profiler = profiler
+        self.__column = column
+        self.__start_secs = 0.0
+
+    def __enter__(self):
+        self.__start_secs = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        #pylint: disable-msg=protected-access
+        self.__profiler._add(self.__column, time.perf_counter() - self.__start_secs)
+
+
+class Profiler(object):
+    """
+    Keeps how long each phase of the last few frames took.
+    """
+
+    def __init__(self, phases=PHASES, num_frames=pylink_config.PROFILER_FRAMES):
+        """
+        Args:
+            phases: The names of the phases of a frame.
+            num_frames: How many of the most recent frames to keep.
+        """
+        self.phases = tuple(phases)
+        self.__phases = {
+            name: _Phase(self, column) for column, name in enumerate(self.phases)
+        }
+        self.__secs = numpy.zeros((num_frames, len(self.phases)))
+        self.__current = numpy.zeros(len(self.phases))
+        self.__next_row = 0
+        self.__num_frames = 0
+        self.frames = 0
+
+    def phase(self, name):
+        """
+        Return a context manager that adds the time spent inside it to
+        the named phase of the current frame. A phase can be entered
+        more than once in a frame, such as when several ticks are
+        simulated, and the times are added together.
+        """
+        return self.__phases[name]
+
+    def _add(self, column, secs):
+        """Add secs to a phase of the current frame."""
+        self.__current[column] += secs
+
+    def end_frame(self):
+        """Store the current frame's times and start the next frame."""
+        self.__secs[self.__next_row] = self.__current
+        self.__current[:] = 0.0
+        self.__next_row = (self.__next_row + 1) % len(self.__secs)
+        self.__num_frames = min(self.__num_frames + 1, len(self.__secs))
+        self.frames += 1
+
+    def frame_secs(self):
+        """
+        Return the stored times as an array indexed by [frame, phase],
+        in seconds, from the oldest frame to the newest.
+        """
+        if self.__num_frames < len(self.__secs):
+            return self.__secs[:self.__num_frames].copy()
+        return numpy.roll(self.__secs, -self.__next_row, axis=0)
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """
+        Return a dict of each phase's name to a tuple of the given
+        percentiles of its time in milliseconds over the stored frames.
+        """
+        frame_secs = self.frame_secs()
+        if len(frame_secs) == 0:
+            return {name: tuple(0.0 for _ in percentiles) for name in self.phases}
+        msecs = numpy.percentile(frame_secs, percentiles, axis=0) * 1000
+        return {
+            name: tuple(float(value) for value in msecs[:, column])
+            for column, name in enumerate(self.phases)
+        }
+
+    def write_csv(self, filename):
+        """
+        Write the stored times to filename as CSV, with one row per
+        frame from the oldest to the newest and one column per phase,
+        in milliseconds.
+        """
+        frame_secs = self.frame_secs()
+        first_frame = self.frames - len(frame_secs)
+        with open(filename, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(('frame',) + self.phases + ('total',))
+            for index, row in enumerate(frame_secs * 1000):
+                writer.writerow(
+                    [first_frame + index]
+                    + [f'{value:.4f}' for value in row]
+                    + [f'{row.sum():.4f}'])
+
+
+class ProfilerOverlay(object):
+    """
+    Shows the profiler's percentiles over the top left of the map.
+    The text is only rendered again every PROFILER_OVERLAY_REFRESH_FRAMES
+    frames so that showing the overlay barely changes what it measures.
+    """
+
+    def __init__(self, profiler, font=None):
+        """
+        Args:
+            profiler: The Profiler to show.
+            font: The pygame Font to draw with. Defaults to a small
+                version of pygame's default font, sized for the render
+                target.
+        """
+        self.__profiler = profiler
+        self.__target = render_target.get()
+        self.__font = font or pygame.font.Font(None, 8 * self.__target.scale)
+        self.__surface = None
+        self.__rendered_frame = None
+        self.visible = False
+
+    def toggle(self):
+        """Show the overlay if it is hidden, or hide it if it is shown."""
+        self.visible = not self.visible
+        self.__rendered_frame = None
+
+    def __render(self):
+        """Render the current percentiles to the overlay's surface."""
+        header = 'ms ' + ' '.join(f'p{percentile}' for percentile in PERCENTILES)
+        lines = [header] + [
+            f'{name} ' + ' '.join(f'{value:.2f}' for value in values)
+            for name, values in self.__profiler.percentiles().items()
+        ]
+        rendered = [self.__font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self.__font.get_linesize()
+        self.__surface = pygame.Surface(
+            (max(line.get_width() for line in rendered) + 8,
+             line_height * len(rendered) + 8)).convert()
+        self.__surface.fill((0, 0, 0))
+        for index, line in enumerate(rendered):
+            self.__surface.blit(line, (4, 4 + (index * line_height)))
+
+    def draw(self):
+        """
+        Draw the overlay on the render target if it is visible.
+
+        Returns:
+            A list of the Rects of the screen that were drawn on, in
+            PYLINK coordinates.
+        """
+        if not self.visible:
+            return []
+        if (self.__rendered_frame is None
+                or self.__profiler.frames - self.__rendered_frame
+                >= pylink_config.PROFILER_OVERLAY_REFRESH_FRAMES):
+            self.__render()
+            self.__rendered_frame = self.__profiler.frames
+        game_window = self.__target.surface()
+        drawn = game_window.blit(
+            self.__surface, self.__target.point(pylink_config.PYLINK_MAP.topleft))
+        return [self.__target.pylink_rect(drawn)]
@@ -6,12 +6,25 @@ All copyrights are by they original owners.
 """
 import sys
 import game_screen
+import sprite_atlas
 import title_screen
 import file_select_screen
+from startup_loader import StartupLoader
 
 if __name__ == '__main__':
     game_screen.init()
-    if not title_screen.execute():
+    # Decode and scale the title and file select screens' sprites, and
+    # read the music, on a thread pool
+    LOADER = StartupLoader()
+    for ATLAS_NAME in ('title', 'file_select', 'icons'):
+        LOADER.add(
+            ATLAS_NAME,
+            lambda name=ATLAS_NAME: sprite_atlas.decode(name),
+            lambda packed, name=ATLAS_NAME: sprite_atlas.build(name, packed=packed))
+    LOADER.add('intro_music', title_screen.load_intro_music)
+    ASSETS = LOADER.run()
+    print(LOADER.format_timings())
+    if not title_screen.execute(ASSETS['intro_music']):
         sys.exit(0)
     SAVE_GAME = file_select_screen.execute()
     if SAVE_GAME is None:
@@ -5,63 +5,230 @@ pylink3 - a Python3 version of NES Legend of Zelda
 Done just for fun and for programming practice.
 All copyrights are by they original owners.
 """
+import argparse
+import sys
 import pygame
+import decoded_images
+import entities
+import headless
+import input_log
 import pylink_config
-from events import Events
-from link import Link
-from overworld import Overworld
+import render_target
+import sprite_atlas
+from controller import Controller
+from events import EventBus
+from game_loop import GameLoop
+from hud import Hud
+from link import Link, TICK_SECS
+from overworld import Overworld, load_tiles
+from profiler import Profiler, ProfilerOverlay
+from renderer import Renderer
+from startup_loader import StartupLoader
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--max-fps', type=int, default=pylink_config.MAX_FRAMES_PER_SEC,
+        help='the most frames to draw each second, or 0 for no limit '
+        + '(default: %(default)s)')
+    parser.add_argument(
+        '--vsync', action='store_true',
+        help='wait for the display to refresh before showing each frame')
+    parser.add_argument(
+        '--headless', action='store_true',
+        help='run without a window, as fast as possible, for --frames frames '
+        + 'and then print timing stats')
+    parser.add_argument(
+        '--frames', type=int, default=600,
+        help='how many frames to run with --headless (default: %(default)s)')
+    parser.add_argument(
+        '--native', action='store_true',
+        help='draw at the NES resolution and scale up to the window once per frame')
+    parser.add_argument(
+        '--record', metavar='FILENAME',
+        help='save the buttons held on every tick to FILENAME on exit, '
+        + 'to replay with --replay')
+    parser.add_argument(
+        '--replay', metavar='FILENAME',
+        help='play back the buttons recorded in FILENAME instead of '
+        + 'reading the keyboard, as fast as possible, and then print '
+        + 'timing stats')
+    parser.add_argument(
+        '--profile-csv', metavar='FILENAME',
+        help='save the time taken by each phase of the last '
+        + f'{pylink_config.PROFILER_FRAMES} frames to FILENAME on exit')
+    return parser.parse_args()
+
+
+def set_mode(vsync, native):
+    """
+    Open the game window, with vsync if it was asked for and the
+    display supports it. For native, the display is opened at the NES
+    resolution and SDL scales it up to fill the window, if it can.
+    """
+    if native:
+        try:
+            return pygame.display.set_mode(pylink_config.NES_WINDOW.size, pygame.SCALED, vsync=int(vsync))
+        except pygame.error as error:
+            print(f'The display can not scale itself, scaling each frame instead: {error}')
+    if vsync:
+        # pygame only does vsync for SCALED or OPENGL windows
+        try:
+            return pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size, pygame.SCALED, vsync=1)
+        except pygame.error as error:
+            print(f'vsync is not available, continuing without it: {error}')
+    return pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+
 
 if __name__ == '__main__':
-    # Initialize the pygame engine
-    pygame.init()
-    pygame.display.set_caption('The Legend of Zelda')
+    ARGS = parse_args()
 
-    # Initialize the screen
-    screen = pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)  # pylint: disable=invalid-name
+    # Initialize the pygame engine and the screen. Headless runs draw to
+    # an off-screen display instead of a window.
+    if ARGS.headless:
+        screen = headless.init()  # pylint: disable=invalid-name
+    else:
+        pygame.init()
+        pygame.display.set_caption('The Legend of Zelda')
+        screen = set_mode(ARGS.vsync, ARGS.native)  # pylint: disable=invalid-name
     screen.fill((0, 0, 0))
     pygame.display.flip()
 
-    # Load the overworld sheet and display the starting position
+    # Choose where to draw before anything loads its images at that
+    # scale
+    if ARGS.native:
+        render_target.use_native()
+
+    # Decode and scale the overworld's tiles and the sprites on a thread
+    # pool, and convert them on this thread
+    loader = StartupLoader()  # pylint: disable=invalid-name
+    scale = render_target.get().scale  # pylint: disable=invalid-name
+    loader.add('overworld', load_tiles, Overworld.get_instance)
+    for atlas_name in ('link', 'icons'):
+        loader.add(
+            atlas_name,
+            lambda name=atlas_name: sprite_atlas.decode(name, scale),
+            lambda packed, name=atlas_name: sprite_atlas.build(name, scale, packed))
+    loader.run()
+    print(loader.format_timings())
+
+    # Display the starting position
     overworld = Overworld.get_instance()  # pylint: disable=invalid-name
 
-    # Load Link's sprite sheet and place him at the starting position
-    # on the map.
+    # Place Link at the starting position on the map, as the first
+    # entity in the store of everything that moves.
+    entity_store = entities.get()  # pylint: disable=invalid-name
     link = Link.get_instance()  # pylint: disable=invalid-name
 
-    # Init the frame rate font
-    fps_font = pygame.font.Font(None, 30)  # pylint: disable=invalid-name
-
-    # Create a box for the score board
-    score_board = pygame.Surface(pylink_config.PYLINK_SCOREBOARD.size)  # pylint: disable=invalid-name
-    # The color of the scoreboard is "nearly black". The exact color Black
-    # is reserved for the cave and dungeon entrances and is used by the code
-    # to detect when Link is going in there.
-    score_board.fill((1, 1, 1))
-    score_board.convert()
-    score_board_rect = score_board.get_rect()  # pylint: disable=invalid-name
-
-    # Initialize the clock to keep track of frame rate
-    clock = pygame.time.Clock() # pylint: disable=invalid-name
-
-    # Initialize the events handler.
-    events = Events.get_instance()  # pylint: disable=invalid-name
-
-    while 1:
-        # Check for and process events
-        events.process()
-
-        # Update the clock
-        clock.tick()
-        score_board.fill((0, 0, 0))
-        screen.blit(score_board, pylink_config.PYLINK_SCOREBOARD)
-        fps = int(clock.get_fps())  # pylint: disable=invalid-name
-        screen.blit(fps_font.render(str(fps), True, pygame.Color('white')), pylink_config.PYLINK_SCOREBOARD)
-
-        # Redraw the map area one layer at a time
-        overworld.draw()
-        link.draw()
-
-        # Flip the screen to update everything
-        # Update the scoreboard section
-        # pygame.display.update(pylink_config.PYLINK_SCOREBOARD)
-        pygame.display.flip()
+    # Create the score board, starting Link off like the NES does
+    hud = Hud()  # pylint: disable=invalid-name
+    hud.set_rupees(0)
+    hud.set_keys(0)
+    hud.set_hearts(3, 3)
+
+    # Everything has been cut out of its sprite sheet by now, so free
+    # the decoded sheets
+    decoded_images.clear()
+
+    # Initialize the event bus, which only lets through the events that
+    # are handled, and the controller, which reads the arrow keys once
+    # per tick.
+    events = EventBus()  # pylint: disable=invalid-name
+    events.subscribe(pygame.QUIT, lambda event: sys.exit())
+    controller = Controller()  # pylint: disable=invalid-name
+
+    # Record what is pressed, or replay what was, if asked to
+    recording = input_log.InputLog() if ARGS.record else None  # pylint: disable=invalid-name
+    replay = input_log.load(ARGS.replay) if ARGS.replay else None  # pylint: disable=invalid-name
+    replay_ticks = iter(replay or ())  # pylint: disable=invalid-name
+
+    # Initialize the profiler, which times each phase of every frame,
+    # and its overlay
+    profiler = Profiler()  # pylint: disable=invalid-name
+    profiler_overlay = ProfilerOverlay(profiler)  # pylint: disable=invalid-name
+
+    # Initialize the renderer, which only updates the parts of the
+    # screen that change
+    renderer = Renderer(overworld, link, profiler)  # pylint: disable=invalid-name
+
+    def toggle_profiler_overlay():
+        """Show or hide the profiler overlay."""
+        profiler_overlay.toggle()
+        # Redraw the map in case the overlay needs covering up
+        renderer.mark_full_update()
+    events.subscribe_key(pylink_config.PROFILER_OVERLAY_KEY, toggle_profiler_overlay)
+
+    def process_events():
+        """Check for and process events."""
+        with profiler.phase('events'):
+            events.process()
+
+    def update():
+        """Advance the game by one tick."""
+        with profiler.phase('simulation'):
+            if replay is not None:
+                controller.update(next(replay_ticks, 0))
+            else:
+                controller.poll()
+            if recording is not None:
+                recording.record(controller.held)
+            link.walk(controller.direction())
+            overworld.update()
+            # Everything stands still while the map scrolls, like on
+            # the NES
+            if not overworld.is_transitioning():
+                entity_store.update(TICK_SECS)
+            link.update()
+
+    def render():
+        """Draw and show one frame."""
+        # Update whatever changed on the scoreboard. Frames can take
+        # less than a millisecond when uncapped, which makes get_fps()
+        # infinite, so cap what is shown.
+        hud.set_fps(int(min(game_loop.fps(), 9999)))
+        for rect in hud.draw():
+            renderer.mark_dirty(rect)
+
+        # Redraw whatever changed on the map area
+        renderer.draw_map()
+        for rect in profiler_overlay.draw():
+            renderer.mark_dirty(rect)
+
+        # Update the changed parts of the screen
+        with profiler.phase('present'):
+            renderer.present()
+        profiler.end_frame()
+
+    # Initialize the game loop, which runs the game in fixed ticks and
+    # draws frames in between
+    if ARGS.headless or replay is not None:
+        # Run one tick per frame without waiting, as fast as possible
+        game_loop = GameLoop(update, render, max_fps=0, now=headless.TickClock())  # pylint: disable=invalid-name
+    else:
+        game_loop = GameLoop(update, render, max_fps=ARGS.max_fps)  # pylint: disable=invalid-name
+
+    try:
+        if replay is not None:
+            print(headless.format_stats(headless.run(game_loop, len(replay), process_events)))
+            print(f'Link ended at {tuple(link.drawn_rect().topleft)}'
+                  + f' on submap {overworld.current_submap()}')
+            sys.exit(0)
+
+        if ARGS.headless:
+            print(headless.format_stats(headless.run(game_loop, ARGS.frames, process_events)))
+            sys.exit(0)
+
+        while 1:
+            # Check for and process events
+            process_events()
+
+            # Run the ticks that are due and draw a frame
+            game_loop.run_frame()
+    finally:
+        overworld.close()
+        if recording is not None:
+            recording.save(ARGS.record)
+        if ARGS.profile_csv:
+            profiler.write_csv(ARGS.profile_csv)
@@ -23,6 +23,39 @@ PYLINK_SCOREBOARD = pygame.Rect((0, 0), scale_nes_tuple_to_pylink(NES_SCOREBOARD
 NES_MAP = pygame.Rect((0, (4 * 16)), (256, (240 - (4 * 16))))
 PYLINK_MAP = pygame.Rect(scale_nes_tuple_to_pylink(NES_MAP.topleft), scale_nes_tuple_to_pylink(NES_MAP.size))
 
+#: The number of submaps across and down the overworld map
+OVERWORLD_SIZE_IN_SUBMAPS = (16, 8)
+
+#: The number of scaled overworld submaps to keep in memory at once.
+#: Each one is the size of PYLINK_MAP, so this bounds the memory used
+#: by the overworld.
+OVERWORLD_SUBMAP_CACHE_SIZE = 8
+
+#: How fast the map scrolls when switching to the next submap, in NES
+#: pixels per second. The NES scrolls 4 pixels per frame.
+SUBMAP_SCROLL_NES_PIXELS_PER_SEC = 240
+
+#: Where files that are built from the assets on the first run, and
+#: can be rebuilt at any time, are kept
+CACHE_DIRECTORY = '.cache'
+
+#: The most memory, in bytes, that decoded image files are allowed to
+#: take up while they are being cut up and scaled. Decoded images past
+#: this are dropped, least recently used first.
+DECODED_IMAGE_CACHE_MAX_BYTES = 64 * 2**20
+
+#: The size of each cell in the walkability grid. This is the size of
+#: the NES background tiles that make up each 16x16 map tile.
+NES_WALKABILITY_CELL_SIZE = (8, 8)
+PYLINK_WALKABILITY_CELL_SIZE = scale_nes_tuple_to_pylink(NES_WALKABILITY_CELL_SIZE)
+
+#: The colors of the ground that Link can walk on
+WALKABLE_GROUND_COLORS = ((252, 216, 168), (116, 116, 116))
+
+#: The exact color Black is reserved for cave and dungeon entrances,
+#: which Link can also walk into
+ENTRANCE_COLOR = (0, 0, 0)
+
 #: The size of each tile
 NES_TILE_SIZE = (16, 16)
 PYLINK_TILE_SIZE = scale_nes_tuple_to_pylink(NES_TILE_SIZE)
@@ -51,18 +84,59 @@ WINDOW_SIZE = tuple(
 # This does leave room for the score board.
 MAP_UPPER_LEFT = tuple(map(int, numpy.multiply(TILE_SIZE, (0, 4))))
 
+#
+# Timing for the game loop
+#
+#: The number of times per second the game is simulated. This matches
+#: the NES frame rate.
+SIMULATION_TICKS_PER_SEC = 60
+
+#: The most frames to draw each second. Use 0 to draw as fast as
+#: possible.
+MAX_FRAMES_PER_SEC = 60
+
+#: If the game falls behind, the most ticks to simulate before drawing
+#: the next frame. Any more than that are dropped and the game slows
+#: down instead.
+MAX_TICKS_PER_FRAME = 5
+
+#
+# Controller
+#
+#: How many ticks a direction press is remembered for. A direction
+#: pressed in that time that is still held takes over from the one
+#: being walked in.
+INPUT_BUFFER_TICKS = 4
+
+#
+# Frame time profiler
+#
+#: The number of most recent frames the profiler keeps the times of
+PROFILER_FRAMES = 600
+
+#: The key that shows and hides the profiler overlay
+PROFILER_OVERLAY_KEY = pygame.K_F3
+
+#: How often, in frames, the profiler overlay is brought up to date
+PROFILER_OVERLAY_REFRESH_FRAMES = 30
+
 #
 # Timing for the main character (Link)
 #
-LINK_MOVE_INTERVAL_MSECS = 50
+#: How long Link shows each of his two walking images for, in seconds
+LINK_STEP_INTERVAL_SECS = 0.05
+
+#: Link's position is kept in fixed point, with this many sub-pixels to
+#: each NES pixel, like the NES does
+NES_SUBPIXELS_PER_PIXEL = 256
+
+#: How fast Link walks, in NES pixels per second. On the NES he walks 3
+#: pixels every 2 frames.
+LINK_WALK_SPEED = 90
+
+#: Link's velocity walking in each direction, in NES pixels per second
 LINK_STOPPED_VELOCITY = (0, 0)
-LINK_MOVE_LEFT_VELOCITY = scale_nes_tuple_to_pylink((-6, 0))
-LINK_MOVE_UP_VELOCITY = scale_nes_tuple_to_pylink((0, -6))
-LINK_MOVE_RIGHT_VELOCITY = scale_nes_tuple_to_pylink((6, 0))
-LINK_MOVE_DOWN_VELOCITY = scale_nes_tuple_to_pylink((0, 6))
-
-# User defined events.
-# These are placed here, so they can be shared because the events module
-# imports the other modules that need this information, and defining
-# them in the events module itself causes a circular dependency.
-MOVE_LINK = pygame.USEREVENT + 1
+LINK_MOVE_LEFT_VELOCITY = (-LINK_WALK_SPEED, 0)
+LINK_MOVE_UP_VELOCITY = (0, -LINK_WALK_SPEED)
+LINK_MOVE_RIGHT_VELOCITY = (LINK_WALK_SPEED, 0)
+LINK_MOVE_DOWN_VELOCITY = (0, LINK_WALK_SPEED)
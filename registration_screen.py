@@ -8,8 +8,7 @@ import pickle
 import pygame
 import pygame.locals
 import numpy
-import pylink_config
-import tile_loader
+import sprite_atlas
 import game_screen
 
 # -v TBD - Take this out
@@ -153,29 +152,8 @@ def execute():
     """
     Show the file select screen and process user input
     """
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=pylink_config.NES_WINDOW_SIZE,
-        border=(0, 0),
-        offset=(3, 504),
-        final_tile_size=pylink_config.WINDOW_SIZE)
-    background = table[0][0]
-    # table = tile_loader.load_tile_table(
-    #     filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-    #     original_tile_size=(8, 8),
-    #     border=(1, 1),
-    #     offset=(261, 733),
-    #     tile_scaling=pylink_config.TILE_SCALING)
-    # cursor = table[0][0]
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(8, 8),
-        border=(1, 1),
-        offset=(269, 733),
-        tile_scaling=pylink_config.TILE_SCALING,
-        colorkey_location=(0, 0))
-    # red_heart = table[0][0]
-    pink_heart = table[0][1]
+    background = sprite_atlas.sprite('file_select', 'background')
+    pink_heart = sprite_atlas.sprite('icons', 'menu_heart')
     pygame.mixer.init()
     pygame.mixer.music.load('assets/LOZ_Get_Rupee.wav')
     init_menu()
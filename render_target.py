@@ -0,0 +1,139 @@
+"""
+Where the gameplay screen is drawn.
+
+The game's logic works in PYLINK coordinates, which are the NES's
+scaled up by NES_TO_PYLINK_SCALE_FACTOR. By default everything is drawn
+straight to the window at that size, so every image is stored at 3x
+and every blit touches 9 times the pixels the NES did.
+
+In native mode everything is instead drawn at the NES's own resolution
+to a 256x240 back buffer, and the back buffer is scaled up to the
+window once per frame. The images are stored at their original size,
+which takes a ninth of the memory, and blits are correspondingly
+cheaper. If the display itself was opened at 256x240 with the SCALED
+flag, it is drawn to directly and SDL does the scaling when the frame
+is shown, usually on the GPU.
+
+Whatever draws the gameplay screen asks get() for the target, draws to
+its surface() and converts anything in PYLINK coordinates with its
+rect() and point(). Choose the mode with use_native() before creating
+the Overworld or Link, since they load their images at the target's
+scale.
+"""
+import pygame
+import pylink_config
+
+
+class RenderTarget(object):
+    """
+    A surface to draw the gameplay screen on, at some scale of the NES
+    screen.
+    """
+
+    def __init__(self, scale):
+        """
+        Args:
+            scale: How many times the size of the NES screen to draw at.
+                NES_TO_PYLINK_SCALE_FACTOR draws straight to the window,
+                and anything smaller draws to a back buffer that is
+                scaled up to the window by present().
+        """
+        self.scale = scale
+        self.__back_buffer = None
+
+    def is_native(self):
+        """Return True if drawing at the NES's resolution."""
+        return self.scale != pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+
+    def __scales_itself(self):
+        """
+        Return True if the display is already the target's size, so
+        that SDL does any scaling up to the window.
+        """
+        return (pygame.display.get_surface().get_size()
+                == self.size(pylink_config.NES_WINDOW.size))
+
+    def surface(self):
+        """Return the Surface to draw on."""
+        if not self.is_native() or self.__scales_itself():
+            return pygame.display.get_surface()
+        if self.__back_buffer is None:
+            self.__back_buffer = pygame.Surface(
+                self.size(pylink_config.NES_WINDOW.size)).convert()
+        return self.__back_buffer
+
+    def size(self, nes_size):
+        """Return a (width, height) in NES pixels at the target's scale."""
+        return (nes_size[0] * self.scale, nes_size[1] * self.scale)
+
+    def point(self, pylink_point):
+        """Return an (x, y) in PYLINK coordinates at the target's scale."""
+        factor = pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+        return (
+            pylink_point[0] * self.scale // factor,
+            pylink_point[1] * self.scale // factor)
+
+    def rect(self, pylink_rect):
+        """Return a Rect in PYLINK coordinates at the target's scale."""
+        pylink_rect = pygame.Rect(pylink_rect)
+        return pygame.Rect(
+            self.point(pylink_rect.topleft), self.point(pylink_rect.size))
+
+    def pylink_rect(self, rect):
+        """Return a Rect at the target's scale in PYLINK coordinates."""
+        factor = pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+        rect = pygame.Rect(rect)
+        return pygame.Rect(
+            rect.left * factor // self.scale,
+            rect.top * factor // self.scale,
+            rect.width * factor // self.scale,
+            rect.height * factor // self.scale)
+
+    def present(self, dirty_rects, full_update):
+        """
+        Show what has been drawn in the window.
+
+        Args:
+            dirty_rects: The Rects of the window, in PYLINK coordinates,
+                that changed.
+            full_update: True if the whole window changed.
+        """
+        if self.is_native() and self.__scales_itself():
+            if full_update:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update([self.rect(rect) for rect in dirty_rects])
+        elif self.is_native():
+            if full_update or dirty_rects:
+                window = pygame.display.get_surface()
+                pygame.transform.scale(
+                    self.__back_buffer, window.get_size(), window)
+                pygame.display.flip()
+        elif full_update:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+
+
+#pylint: disable-msg=invalid-name
+_target = None
+#pylint: enable-msg=invalid-name
+
+
+def get():
+    """Return the current RenderTarget, which draws to the window unless
+    use_native() has been called."""
+    #pylint: disable-msg=invalid-name,global-statement
+    global _target
+    #pylint: enable-msg=invalid-name,global-statement
+    if _target is None:
+        _target = RenderTarget(pylink_config.NES_TO_PYLINK_SCALE_FACTOR)
+    return _target
+
+
+def use_native():
+    """Draw at the NES's resolution to a back buffer from now on."""
+    #pylint: disable-msg=invalid-name,global-statement
+    global _target
+    #pylint: enable-msg=invalid-name,global-statement
+    _target = RenderTarget(1)
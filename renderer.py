@@ -0,0 +1,85 @@
+"""
+Draws the gameplay screen, only updating the parts that changed.
+
+Between map switches, Link is the only thing on the map that moves, so
+redrawing and updating the whole screen every frame is wasted work.
+The Renderer keeps a list of the dirty regions of the screen and only
+passes those to pygame.display.update(). Dirty regions are always in
+PYLINK coordinates, whatever scale the render target draws at. While
+the map is scrolling to a new submap everything moves, so the whole
+screen is drawn and flipped instead.
+"""
+import pygame
+import render_target
+from profiler import Profiler
+
+
+class Renderer(object):
+    """
+    Draws the overworld and Link, and then updates just the regions of
+    the display that changed.
+    """
+
+    def __init__(self, overworld, link, profiler=None):
+        """
+        Args:
+            overworld: The Overworld instance to draw.
+            link: The Link instance to draw.
+            profiler: The Profiler to time the overworld_draw and
+                link_draw phases with. Defaults to one of its own.
+        """
+        self.__overworld = overworld
+        self.__link = link
+        self.__profiler = profiler or Profiler()
+        self.__dirty_rects = []
+        self.__full_update = True
+        self.__transitioning = False
+
+    def mark_dirty(self, rect):
+        """
+        Add rect to the regions of the display to update at the next
+        present().
+        """
+        self.__dirty_rects.append(pygame.Rect(rect))
+
+    def mark_full_update(self):
+        """
+        Have the next present() redraw the map and update the whole
+        display.
+        """
+        self.__full_update = True
+
+    def draw_map(self):
+        """
+        Draw whatever changed on the map section of the screen since it
+        was last drawn.
+        """
+        transitioning = self.__overworld.is_transitioning()
+        if self.__full_update or transitioning or self.__transitioning:
+            # Draw the frame after the scroll ends in full as well, so
+            # that everything ends up in its final place.
+            self.__transitioning = transitioning
+            with self.__profiler.phase('overworld_draw'):
+                self.__overworld.draw()
+            with self.__profiler.phase('link_draw'):
+                self.__link.draw()
+            self.__full_update = True
+            return
+        if self.__link.needs_redraw():
+            # Cover up where Link was, then draw him where he is now
+            previous_rect = self.__link.drawn_rect()
+            with self.__profiler.phase('overworld_draw'):
+                self.__overworld.draw(previous_rect)
+            self.mark_dirty(previous_rect)
+            with self.__profiler.phase('link_draw'):
+                self.mark_dirty(self.__link.draw())
+
+    def present(self):
+        """
+        Update the display with everything drawn since the last call,
+        either by flipping the whole display or by updating only the
+        dirty regions. See RenderTarget.present().
+        """
+        render_target.get().present(self.__dirty_rects, self.__full_update)
+        self.__dirty_rects = []
+        self.__full_update = False
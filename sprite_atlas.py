@@ -0,0 +1,253 @@
+"""
+Sprites packed into texture atlases, handed out by name.
+
+Rather than each module hard-coding where its images are on the sprite
+sheets, every sprite is named in the manifest, MANIFEST_FILENAME. It is
+a JSON object of atlases, each of which maps sprite sheet files to the
+sprites cut from them:
+
+    {
+        "link": {
+            "assets/NES-TheLegendofZelda-Link.png": {
+                "left_0": {
+                    "region": [35, 11, 16, 16],
+                    "colorkey": [0, 0],
+                    "flip_x": true
+                },
+                ...
+
+region is the (x, y, width, height) of the sprite on the sheet. The
+optional colorkey is the (x, y) within the sprite, in the sheet's
+pixels, to sample for the colorkey once the sprite has been scaled and
+flipped. flip_x and flip_y mirror the sprite left to right and top to
+bottom.
+
+get() builds an atlas the first time it is asked for. It goes through
+the sprites one sheet at a time, so each sheet is only decoded once,
+scales them, and packs them all into one Surface in the display's pixel
+format. Each sprite is a subsurface of that one Surface with its own
+colorkey. Building an atlas is the one place its images are loaded, so
+its load_secs is the whole cost of loading them.
+
+To load an atlas in the background, call decode() on another thread and
+pass what it returns to build() on the main thread, which then only has
+to convert the packed atlas to the display's pixel format.
+"""
+import json
+import math
+import os
+import time
+import pygame
+import asset_cache
+import asset_manager
+import pylink_config
+
+#: The manifest of every sprite in the game
+MANIFEST_FILENAME = os.path.join('assets', 'sprites.json')
+
+
+def load_manifest(filename=None):
+    """
+    Return the manifest in filename, MANIFEST_FILENAME unless given, as
+    a dict of atlas names to the sprites in them.
+    """
+    with open(filename or MANIFEST_FILENAME,
+              encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def pack(sizes):
+    """
+    Work out where to put rectangles of the given sizes so that they
+    fit into one roughly square area without overlapping.
+
+    The area is as wide as the square that would hold all of the
+    rectangles, or the widest rectangle if that is wider. The
+    rectangles are placed tallest first, each as high up as it will go
+    on top of the ones already placed, and as far left as it can go at
+    that height, with its left side against the end of a step in the
+    ones already placed. This is the skyline, or bottom left, method.
+
+    Args:
+        sizes: A list of (width, height) sizes.
+
+    Returns:
+        The (width, height) of the whole area, and a list of the (x, y)
+        of each rectangle, in the same order as sizes.
+    """
+    if not sizes:
+        return (0, 0), []
+    width = max(
+        max(size[0] for size in sizes),
+        int(math.ceil(math.sqrt(sum(size[0] * size[1] for size in sizes)))))
+    # The height of the lowest free pixel in each column.
+    skyline = [0] * width
+    positions = [None] * len(sizes)
+    for index in sorted(range(len(sizes)), key=lambda index: -sizes[index][1]):
+        size_width, size_height = sizes[index]
+        # The area is at least as wide as the rectangle, so at least
+        # the leftmost place is always tried.
+        best = (0, math.inf)
+        # Only the left ends of the skyline's steps need to be tried.
+        for left in range(0, width - size_width + 1):
+            if left > 0 and skyline[left] == skyline[left - 1]:
+                continue
+            top = max(skyline[left:left + size_width])
+            if top < best[1]:
+                best = (left, top)
+        positions[index] = best
+        skyline[best[0]:best[0] + size_width] = (
+            [best[1] + size_height] * size_width)
+    used_width = max(
+        position[0] + size[0] for position, size in zip(positions, sizes))
+    return (used_width, max(skyline)), positions
+
+
+def pack_sprites(sheets, scale):
+    """
+    Cut out, scale and flip each sprite of an atlas, and pack them all
+    into one Surface. This does not touch the display, so it is safe to
+    call on any thread.
+
+    Args:
+        sheets: The sheets and sprites of one atlas from the manifest,
+            see the module documentation.
+        scale: How many times their size on the sheets to scale the
+            sprites up by.
+
+    Returns:
+        The packed Surface, which is not yet in the display's pixel
+        format, and a list of the Rect of each sprite on it, in the
+        order they are in the manifest.
+    """
+    images = []
+    for filename, sprites in sheets.items():
+        for entry in sprites.values():
+            region = entry['region']
+            image = asset_cache.load_scaled(
+                filename, region, (region[2] * scale, region[3] * scale))
+            if entry.get('flip_x') or entry.get('flip_y'):
+                image = pygame.transform.flip(
+                    image, entry.get('flip_x', False), entry.get('flip_y', False))
+            images.append(image)
+    size, positions = pack([image.get_size() for image in images])
+    # Packing into a Surface with the same pixel format as the sprites
+    # is a straight copy. The decoded sheets have an alpha channel, and
+    # blending them on to any other format is many times slower.
+    surface = pygame.Surface(size, 0, images[0] if images else None)
+    surface.blits(list(zip(images, positions)), doreturn=False)
+    return surface, [
+        pygame.Rect(position, image.get_size())
+        for image, position in zip(images, positions)]
+
+
+class SpriteAtlas(object):
+    """
+    One Surface holding a set of sprites, scaled up and in the display's
+    pixel format, with a subsurface for each sprite.
+    """
+
+    def __init__(self, sheets, scale, packed=None):
+        """
+        Args:
+            sheets: The sheets and sprites of one atlas from the
+                manifest, see the module documentation.
+            scale: How many times their size on the sheets to scale the
+                sprites up by.
+            packed: What pack_sprites() returned for sheets and scale,
+                if it has already been called, for example on another
+                thread.
+        """
+        start_secs = time.perf_counter()
+        self.scale = scale
+        surface, rects = packed or pack_sprites(sheets, scale)
+        self.surface = surface.convert()
+        self.__sprites = {}
+        entries = [
+            (name, entry)
+            for sprites in sheets.values()
+            for name, entry in sprites.items()]
+        for (name, entry), rect in zip(entries, rects):
+            self.__sprites[name] = self.surface.subsurface(rect)
+            if 'colorkey' in entry:
+                asset_manager.set_colorkey(
+                    self.__sprites[name],
+                    (entry['colorkey'][0] * scale,
+                     entry['colorkey'][1] * scale))
+        self.load_secs = time.perf_counter() - start_secs
+
+    def names(self):
+        """Return the names of all of the sprites in the atlas."""
+        return list(self.__sprites)
+
+    def sprite(self, name):
+        """
+        Return the sprite called name, a subsurface of the atlas.
+
+        Raises:
+            KeyError: If there is no sprite called name in the atlas.
+        """
+        return self.__sprites[name]
+
+
+#pylint: disable-msg=invalid-name
+_manifest = None
+_atlases = {}
+#pylint: enable-msg=invalid-name
+
+
+def manifest():
+    """Return the manifest in MANIFEST_FILENAME, only reading it once."""
+    #pylint: disable-msg=invalid-name,global-statement
+    global _manifest
+    #pylint: enable-msg=invalid-name,global-statement
+    if _manifest is None:
+        _manifest = load_manifest()
+    return _manifest
+
+
+def decode(name, scale=pylink_config.NES_TO_PYLINK_SCALE_FACTOR):
+    """
+    Return the packed sprites of the atlas called name in the manifest,
+    for build(). See pack_sprites(), this is safe to call on any
+    thread.
+    """
+    return pack_sprites(manifest()[name], scale)
+
+
+def build(name, scale=pylink_config.NES_TO_PYLINK_SCALE_FACTOR, packed=None):
+    """
+    Build the SpriteAtlas called name in the manifest with its sprites
+    scaled up by scale, from what decode() returned if given, and keep
+    it for get(). This converts to the display's pixel format, so call
+    it on the main thread.
+
+    Returns:
+        The new SpriteAtlas.
+    """
+    _atlases[(name, scale)] = SpriteAtlas(manifest()[name], scale, packed)
+    return _atlases[(name, scale)]
+
+
+def get(name, scale=pylink_config.NES_TO_PYLINK_SCALE_FACTOR):
+    """
+    Return the SpriteAtlas called name in the manifest with its sprites
+    scaled up by scale, building it the first time it is asked for.
+    """
+    if (name, scale) not in _atlases:
+        return build(name, scale)
+    return _atlases[(name, scale)]
+
+
+def sprite(atlas_name, sprite_name, scale=pylink_config.NES_TO_PYLINK_SCALE_FACTOR):
+    """Return the sprite called sprite_name in the atlas atlas_name, see get()."""
+    return get(atlas_name, scale).sprite(sprite_name)
+
+
+def clear():
+    """
+    Forget every atlas that has been built, so they are built again
+    the next time they are asked for. Call this after the display mode
+    changes.
+    """
+    _atlases.clear()
@@ -0,0 +1,118 @@
+"""
+Loads the game's assets at startup on a pool of threads.
+
+Most of the time spent loading is decoding image files and scaling the
+images up, and pygame lets other threads run while it does both. The
+independent assets are loaded at the same time on a
+concurrent.futures thread pool.
+
+Converting an image to the display's pixel format has to happen on the
+main thread, so each asset is loaded in two parts. Its load function
+does everything that does not touch the display and runs on the pool.
+Its finish function is then given what load returned, and runs on the
+main thread, in the order the assets were added.
+
+For example:
+
+    loader = StartupLoader()
+    loader.add(
+        'link',
+        lambda: sprite_atlas.decode('link'),
+        lambda packed: sprite_atlas.build('link', packed=packed))
+    loader.run()
+    print(loader.format_timings())
+"""
+import concurrent.futures
+import time
+
+
+def _timed(function):
+    """
+    Return a function that calls function and returns what it returned
+    along with how long it took, in seconds.
+    """
+    def timed_function(*args):
+        start_secs = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - start_secs
+    return timed_function
+
+
+class StartupLoader(object):
+    """
+    A set of assets to load on a thread pool. See the module
+    documentation.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers: The most threads to load on at once, or None
+                for concurrent.futures' default.
+        """
+        self.max_workers = max_workers
+        self.__assets = []
+        #: (name, load secs, finish secs) for each asset once run() has
+        #: loaded it
+        self.timings = []
+        #: How long run() took from start to finish, in seconds
+        self.total_secs = 0.0
+
+    def add(self, name, load, finish=None):
+        """
+        Add an asset to load.
+
+        Args:
+            name: The name to report the asset's timings under.
+            load: A function taking no arguments that loads the asset
+                and returns it. It is called on a worker thread, so it
+                must not touch the display.
+            finish: An optional function taking what load returned,
+                which is called on the main thread. Whatever it returns
+                is the asset's result instead.
+        """
+        self.__assets.append((name, load, finish))
+
+    def run(self):
+        """
+        Load every asset that has been added, and finish each one on
+        this thread as soon as it and the ones added before it are
+        loaded.
+
+        Returns:
+            A dict of each asset's name to its result.
+
+        Raises:
+            Whatever a load or finish function raised, once the other
+            assets have been loaded.
+        """
+        start_secs = time.perf_counter()
+        results = {}
+        self.timings = []
+        with concurrent.futures.ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix='startup-loader') as pool:
+            futures = [
+                (name, pool.submit(_timed(load)), finish)
+                for name, load, finish in self.__assets]
+            for name, future, finish in futures:
+                result, load_secs = future.result()
+                finish_secs = 0.0
+                if finish is not None:
+                    result, finish_secs = _timed(finish)(result)
+                results[name] = result
+                self.timings.append((name, load_secs, finish_secs))
+        self.total_secs = time.perf_counter() - start_secs
+        return results
+
+    def format_timings(self):
+        """
+        Return how long each asset took to load and to finish as a
+        report for printing. The loading times add up to more than the
+        total when assets were loaded at the same time.
+        """
+        lines = [
+            f'{name:>12}: load {1000 * load_secs:7.1f} msecs,'
+            + f' finish {1000 * finish_secs:6.1f} msecs'
+            for name, load_secs, finish_secs in self.timings]
+        lines.append(f"{'total':>12}: {1000 * self.total_secs:7.1f} msecs")
+        return '\n'.join(lines)
@@ -0,0 +1,14 @@
+"""Fixtures shared by the tests"""
+import pygame
+import pytest
+import asset_cache
+
+
+@pytest.fixture()
+def scratch_display(tmp_path, monkeypatch):
+    """A display to convert to, and an asset cache that is thrown away afterwards."""
+    monkeypatch.setattr(asset_cache, '_cache', asset_cache.AssetCache(str(tmp_path / 'assets.bin')))
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
@@ -0,0 +1,94 @@
+"""Tests for asset_cache.py"""
+import pygame
+import pytest
+import asset_cache
+
+
+@pytest.fixture()
+def image_filename(tmp_path):
+    """A small image with a different color in each corner."""
+    image = pygame.Surface((4, 2))
+    image.fill((10, 20, 30))
+    image.set_at((0, 0), (255, 0, 0))
+    image.set_at((3, 1), (0, 0, 255))
+    filename = str(tmp_path / 'image.png')
+    pygame.image.save(image, filename)
+    return filename
+
+
+@pytest.fixture()
+def cache_filename(tmp_path):
+    """Where to keep the cache file."""
+    return str(tmp_path / 'cache' / 'assets.bin')
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestAssetCache(object):
+    """Tests for asset_cache.py::AssetCache"""
+
+    def test_scales(self, image_filename, cache_filename):
+        """Should scale the region to the size asked for"""
+        cache = asset_cache.AssetCache(cache_filename)
+        surface = cache.load_scaled(image_filename, (2, 0, 2, 2), (6, 6))
+        assert surface.get_size() == (6, 6)
+        assert surface.get_at((5, 5))[:3] == (0, 0, 255)
+
+    def test_image_size(self, image_filename, cache_filename):
+        """Should give the size of the whole image"""
+        assert asset_cache.AssetCache(cache_filename).image_size(image_filename) == (4, 2)
+
+    def test_warm_start(self, image_filename, cache_filename):
+        """Should serve the same pixels from the cache file after it is saved"""
+        cold = asset_cache.AssetCache(cache_filename)
+        expected = pygame.image.tobytes(cold.load_scaled(image_filename, None, (12, 6)), 'RGB')
+        cold.save()
+        warm = asset_cache.AssetCache(cache_filename)
+        surface = warm.load_scaled(image_filename, None, (12, 6))
+        assert (warm.hits, warm.misses) == (1, 0)
+        assert pygame.image.tobytes(surface, 'RGB') == expected
+        assert warm.image_size(image_filename) == (4, 2)
+
+    def test_keyed_by_region_and_size(self, image_filename, cache_filename):
+        """Should not serve an image cut from a different region or scaled to a different size"""
+        cold = asset_cache.AssetCache(cache_filename)
+        cold.load_scaled(image_filename, (0, 0, 2, 2), (6, 6))
+        cold.save()
+        warm = asset_cache.AssetCache(cache_filename)
+        warm.load_scaled(image_filename, (2, 0, 2, 2), (6, 6))
+        warm.load_scaled(image_filename, (0, 0, 2, 2), (4, 4))
+        assert (warm.hits, warm.misses) == (0, 2)
+
+    def test_keeps_old_entries(self, image_filename, cache_filename):
+        """Should keep entries from earlier runs when saving new ones"""
+        first = asset_cache.AssetCache(cache_filename)
+        first.load_scaled(image_filename, (0, 0, 2, 2), (6, 6))
+        first.save()
+        second = asset_cache.AssetCache(cache_filename)
+        second.load_scaled(image_filename, (2, 0, 2, 2), (6, 6))
+        second.save()
+        third = asset_cache.AssetCache(cache_filename)
+        third.load_scaled(image_filename, (0, 0, 2, 2), (6, 6))
+        third.load_scaled(image_filename, (2, 0, 2, 2), (6, 6))
+        assert (third.hits, third.misses) == (2, 0)
+
+    def test_changed_source(self, image_filename, cache_filename):
+        """Should not serve an image scaled from an older version of the file"""
+        cold = asset_cache.AssetCache(cache_filename)
+        cold.load_scaled(image_filename, None, (8, 4))
+        cold.save()
+        changed = pygame.Surface((4, 2))
+        changed.fill((1, 2, 3))
+        pygame.image.save(changed, image_filename)
+        warm = asset_cache.AssetCache(cache_filename)
+        assert warm.load_scaled(image_filename, None, (8, 4)).get_at((0, 0))[:3] == (1, 2, 3)
+
+    def test_damaged_file(self, image_filename, cache_filename):
+        """Should treat a file that is not a cache file as an empty cache"""
+        cold = asset_cache.AssetCache(cache_filename)
+        cold.load_scaled(image_filename, None, (8, 4))
+        cold.save()
+        with open(cache_filename, 'r+b') as cache_file:
+            cache_file.write(b'JUNK')
+        warm = asset_cache.AssetCache(cache_filename)
+        warm.load_scaled(image_filename, None, (8, 4))
+        assert warm.misses == 1
@@ -0,0 +1,55 @@
+"""Tests for asset_manager.py"""
+import warnings
+import pygame
+import pytest
+import asset_manager
+
+
+@pytest.fixture()
+def display():
+    """A small display to convert to."""
+    pygame.init()
+    yield pygame.display.set_mode((8, 8))
+    pygame.quit()
+
+
+def rgbx_surface():
+    """A surface in the RGBX format the asset cache hands out."""
+    return pygame.image.frombuffer(bytes(range(64)), (4, 4), 'RGBX')
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name,unused-argument
+class TestDisplayFormat(object):
+    """Tests for asset_manager.py::display_format"""
+
+    def test_converted(self, display):
+        """Should return a surface in the display's pixel format"""
+        surface = rgbx_surface()
+        assert not asset_manager.is_display_format(surface)
+        assert asset_manager.is_display_format(asset_manager.display_format(surface))
+
+    def test_colorkey(self, display):
+        """Should sample the colorkey and set it with RLEACCEL"""
+        surface = rgbx_surface()
+        converted = asset_manager.display_format(surface, (1, 0))
+        assert converted.get_colorkey() == surface.get_at((1, 0))
+        assert converted.get_flags() & pygame.RLEACCELOK
+
+    def test_no_colorkey(self, display):
+        """Should not set a colorkey unless asked to"""
+        assert asset_manager.display_format(rgbx_surface()).get_colorkey() is None
+
+
+class TestCheckBlit(object):
+    """Tests for asset_manager.py::check_blit"""
+
+    def test_warns(self, display):
+        """Should warn about a surface that is not in the display's pixel format"""
+        with pytest.warns(asset_manager.UnconvertedSurfaceWarning):
+            asset_manager.check_blit(rgbx_surface())
+
+    def test_converted(self, display):
+        """Should not warn about a surface in the display's pixel format"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            asset_manager.check_blit(asset_manager.display_format(rgbx_surface()))
@@ -0,0 +1,96 @@
+"""Tests for controller.py"""
+import collections
+import pygame
+import pytest
+import controller
+from controller import Controller
+
+
+def keys(*held):
+    """Return a stand in for pygame.key.get_pressed() with held down."""
+    pressed = collections.defaultdict(bool)
+    for key in held:
+        pressed[key] = True
+    return pressed
+
+
+#pylint: disable-msg=no-self-use
+class TestButtonsHeld(object):
+    """Tests for controller.py::buttons_held()"""
+
+    def test_no_keys(self):
+        """Should be 0 when no keys are held"""
+        assert controller.buttons_held(keys()) == 0
+
+    def test_bitmask(self):
+        """Should set the bit of each bound key that is held"""
+        held = controller.buttons_held(keys(pygame.K_LEFT, pygame.K_UP, pygame.K_SPACE))
+        assert held == controller.LEFT | controller.UP
+
+
+class TestController(object):
+    """Tests for controller.py::Controller"""
+
+    def test_pressed_and_released(self):
+        """Should work out which buttons went down and up since the last tick"""
+        the_controller = Controller()
+        the_controller.update(controller.LEFT)
+        the_controller.update(controller.LEFT | controller.UP)
+        assert the_controller.pressed == controller.UP
+        the_controller.update(controller.UP)
+        assert the_controller.pressed == 0
+        assert the_controller.released == controller.LEFT
+
+    def test_poll(self, mocker):
+        """Should read the keyboard once when polled"""
+        get_pressed = mocker.patch('pygame.key.get_pressed', return_value=keys(pygame.K_DOWN))
+        assert Controller().poll() == controller.DOWN
+        get_pressed.assert_called_once_with()
+
+    def test_stands_still(self):
+        """Should not walk anywhere when no direction is held"""
+        the_controller = Controller()
+        the_controller.update(controller.A)
+        assert the_controller.direction() is None
+
+    def test_newest_direction_wins(self):
+        """Should walk in the direction pressed most recently"""
+        the_controller = Controller()
+        the_controller.update(controller.UP)
+        the_controller.update(controller.UP | controller.LEFT)
+        assert the_controller.direction() == "left"
+
+    def test_keeps_direction(self):
+        """Should keep walking the same way once both presses are old"""
+        the_controller = Controller(buffer_ticks=2)
+        the_controller.update(controller.UP)
+        the_controller.update(controller.UP | controller.LEFT)
+        for _ in range(3):
+            the_controller.update(controller.UP | controller.LEFT)
+        assert the_controller.direction() == "left"
+
+    @pytest.mark.parametrize('buffer_ticks', [1, 4])
+    def test_release_keeps_walking(self, buffer_ticks):
+        """Should walk in a direction still held after another is released"""
+        the_controller = Controller(buffer_ticks)
+        the_controller.update(controller.UP)
+        for _ in range(5):
+            the_controller.update(controller.UP | controller.LEFT)
+        the_controller.update(controller.UP)
+        assert the_controller.direction() == "up"
+
+    def test_same_tick_priority(self):
+        """Should pick right, left, down and then up when pressed on the same tick"""
+        the_controller = Controller()
+        the_controller.update(controller.UP | controller.DOWN)
+        assert the_controller.direction() == "down"
+
+    def test_was_pressed(self):
+        """Should remember presses for the buffered number of ticks"""
+        the_controller = Controller(buffer_ticks=3)
+        the_controller.update(controller.A)
+        the_controller.update(0)
+        the_controller.update(0)
+        assert the_controller.was_pressed(controller.A)
+        the_controller.update(0)
+        assert not the_controller.was_pressed(controller.A)
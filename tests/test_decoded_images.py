@@ -0,0 +1,57 @@
+"""Tests for decoded_images.py"""
+import concurrent.futures
+import os
+import pygame
+import pytest
+import decoded_images
+
+
+@pytest.fixture()
+def image_file(tmp_path):
+    """A small image file, with nothing cached for it."""
+    filename = str(tmp_path / 'sheet.png')
+    pygame.image.save(pygame.Surface((4, 2)), filename)
+    decoded_images.clear()
+    yield filename
+    decoded_images.clear()
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestDecodedImages(object):
+    """Tests for decoded_images.py"""
+
+    def test_decoded_once(self, image_file):
+        """Should only decode a file once however many times it is loaded"""
+        before = decoded_images.stats()
+        first = decoded_images.load(image_file)
+        second = decoded_images.load(image_file)
+        after = decoded_images.stats()
+        assert first is second
+        assert first.get_size() == (4, 2)
+        assert after['misses'] - before['misses'] == 1
+        assert after['hits'] - before['hits'] == 1
+        assert after['images'] == 1
+        assert after['bytes'] == decoded_images.surface_bytes(first)
+
+    def test_modified_file(self, image_file):
+        """Should decode a file again when it has been modified"""
+        first = decoded_images.load(image_file)
+        modified = os.path.getmtime(image_file) + 10
+        os.utime(image_file, (modified, modified))
+        assert decoded_images.load(image_file) is not first
+        assert decoded_images.stats()['images'] == 1
+
+    def test_release(self, image_file):
+        """Should decode a released file again"""
+        first = decoded_images.load(image_file)
+        decoded_images.release(image_file)
+        assert decoded_images.stats()['images'] == 0
+        assert decoded_images.load(image_file) is not first
+
+    def test_threads(self, image_file, mocker):
+        """Should decode a file only once when loaded from several threads at once"""
+        load = mocker.spy(pygame.image, 'load')
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            images = list(pool.map(lambda _: decoded_images.load(image_file), range(8)))
+        assert load.call_count == 1
+        assert all(image is images[0] for image in images)
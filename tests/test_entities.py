@@ -0,0 +1,81 @@
+"""Tests for entities.py"""
+import pygame
+import pytest
+import entities
+from entities import EntityStore
+
+DT_SECS = 1.0 / 60
+
+
+@pytest.fixture()
+def store():
+    """A store with a walker, a stopped entity and one that moves itself."""
+    the_store = EntityStore(capacity=2)
+    the_store.add((10, 10), (0, 0, 4, 4), velocity=(90, 0), num_frames=2, frame_secs=2 * DT_SECS)
+    the_store.add((50, 50), (0, 0, 4, 4))
+    the_store.add((90, 90), (0, 2, 4, 2), velocity=(0, -90), self_moved=True)
+    return the_store
+
+
+#pylint: disable-msg=no-self-use,redefined-outer-name
+class TestEntityStore(object):
+    """Tests for entities.py::EntityStore"""
+
+    def test_grows(self, store):
+        """Should make room for more entities than its starting capacity"""
+        assert len(store) == 3
+        assert len(store.position) >= 3
+        assert store.position[2].tolist() == [90, 90]
+
+    def test_update_moves_in_sub_pixels(self, store):
+        """Should move 3 NES pixels every 2 ticks at 90 pixels a second"""
+        xs = []
+        for _ in range(4):
+            store.update(DT_SECS)
+            xs.append(int(store.position[0][0]))
+        assert xs == [11, 13, 14, 16]
+        assert store.position[1].tolist() == [50, 50]
+
+    def test_self_moved(self, store):
+        """Should only work out the delta of entities that move themselves"""
+        store.update(DT_SECS)
+        assert store.delta[2].tolist() == [0, -2]
+        assert store.position[2].tolist() == [90, 90]
+
+    def test_animate(self, store):
+        """Should step the frames of moving entities every frame_secs"""
+        frames = []
+        for _ in range(6):
+            store.update(DT_SECS)
+            frames.append(int(store.frame[0]))
+        assert frames == [0, 1, 1, 0, 0, 1]
+        assert store.frame[1] == 0
+
+    def test_remove_reuses_row(self, store):
+        """Should reuse the row of a removed entity and skip it until then"""
+        store.remove(1)
+        assert store.live().tolist() == [0, 2]
+        assert store.add((0, 0), (0, 0, 1, 1)) == 1
+        assert len(store) == 3
+
+    def test_out_of_bounds(self, store):
+        """Should flag the live entities whose hitboxes leave the bounds"""
+        bounds = pygame.Rect(0, 0, 60, 60)
+        assert store.out_of_bounds(bounds).tolist() == [False, False, True]
+        store.remove(2)
+        assert store.out_of_bounds(bounds).tolist() == [False, False, False]
+
+    def test_overlapping(self, store):
+        """Should find the entities whose hitboxes overlap a rect"""
+        assert store.overlapping(pygame.Rect(12, 12, 10, 10)).tolist() == [0]
+        assert store.overlapping(pygame.Rect(14, 14, 10, 10)).tolist() == []
+        assert store.overlapping(pygame.Rect(90, 90, 4, 2)).tolist() == []
+        assert store.overlapping(pygame.Rect(90, 90, 4, 3)).tolist() == [2]
+
+
+class TestGet(object):
+    """Tests for entities.py::get()"""
+
+    def test_shared(self):
+        """Should always return the same store"""
+        assert entities.get() is entities.get()
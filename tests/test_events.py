@@ -1,25 +1,72 @@
 """Tests for events.py"""
-from events import Events
+from events import EventBus
 import pygame
 import pytest
 
 
-class TestEventsConstructors:
-    """Tests for the constructor and get_instance for events.py"""
+class TestEventBus:
+    """Tests for the EventBus in events.py"""
 
     @pytest.fixture
-    def initialize_display(self):
+    def bus(self):
+        """An EventBus with an empty queue, which is closed afterwards."""
         pygame.init()
         pygame.display.set_mode((1,1))
-        yield
+        the_bus = EventBus()
+        pygame.event.clear()
+        yield the_bus
+        the_bus.close()
         pygame.quit()
 
-    def test_get_instance_not_none(self, initialize_display):
-        """Should not return None"""
-        assert Events.get_instance() is not None
+    def test_handler_called(self, bus, mocker):
+        """Should call each handler subscribed to an event's type with the event"""
+        first, second = mocker.Mock(), mocker.Mock()
+        bus.subscribe(pygame.USEREVENT, first)
+        bus.subscribe(pygame.USEREVENT, second)
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT, code=7))
+        assert bus.process() == 1
+        assert first.call_args[0][0].code == 7
+        assert second.call_args[0][0].code == 7
 
-    def test_get_instance_returns_singleton(self, initialize_display):
-        """Should return the same object no matter how many times it is called"""
-        first_object = Events.get_instance()
-        second_object = Events.get_instance()
-        assert first_object is second_object
+    def test_unsubscribed_types_blocked(self, bus, mocker):
+        """Should only let the subscribed event types be queued"""
+        bus.subscribe(pygame.USEREVENT, mocker.Mock())
+        assert not pygame.event.get_blocked(pygame.USEREVENT)
+        assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0)))
+        assert pygame.event.peek(pygame.MOUSEMOTION) is False
+
+    def test_unsubscribe(self, bus, mocker):
+        """Should stop calling a handler and block its type once it has none"""
+        handler = mocker.Mock()
+        bus.subscribe(pygame.USEREVENT, handler)
+        bus.unsubscribe(pygame.USEREVENT, handler)
+        assert pygame.event.get_blocked(pygame.USEREVENT)
+        assert bus.event_types() == []
+        with pytest.raises(ValueError):
+            bus.unsubscribe(pygame.USEREVENT, handler)
+
+    def test_dispatch_counts(self, bus, mocker):
+        """Should count the events handed to handlers by type"""
+        bus.subscribe(pygame.USEREVENT, mocker.Mock())
+        bus.subscribe(pygame.KEYUP, mocker.Mock())
+        for _ in range(3):
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_a))
+        bus.process()
+        assert bus.dispatch_counts == {pygame.USEREVENT: 3, pygame.KEYUP: 1}
+
+    def test_key_handler_called(self, bus, mocker):
+        """Should call the handler subscribed to a key only when it is pressed"""
+        handler = mocker.Mock()
+        bus.subscribe_key(pygame.K_F3, handler)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F4))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+        bus.process()
+        handler.assert_called_once_with()
+
+    def test_close(self, bus, mocker):
+        """Should let every event type be queued again once closed"""
+        bus.subscribe(pygame.USEREVENT, mocker.Mock())
+        bus.close()
+        assert not pygame.event.get_blocked(pygame.MOUSEMOTION)
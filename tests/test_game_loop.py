@@ -0,0 +1,80 @@
+"""Tests for game_loop.py"""
+import pytest
+from game_loop import GameLoop
+
+
+class FakeTime(object):
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.secs = 100.0
+
+    def __call__(self):
+        return self.secs
+
+
+@pytest.fixture()
+def fake_time():
+    """A clock that only moves when told to."""
+    return FakeTime()
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestRunFrame(object):
+    """Tests for game_loop.py::GameLoop.run_frame()"""
+
+    @staticmethod
+    def make_loop(fake_time, updates, renders, max_ticks_per_frame=5):
+        """Make an uncapped 60 tick loop that counts its calls."""
+        return GameLoop(
+            lambda: updates.append(1),
+            lambda: renders.append(1),
+            ticks_per_sec=60,
+            max_fps=0,
+            max_ticks_per_frame=max_ticks_per_frame,
+            now=fake_time)
+
+    def test_first_frame(self, fake_time):
+        """Should run one tick and draw one frame the first time"""
+        updates, renders = [], []
+        loop = self.make_loop(fake_time, updates, renders)
+        assert loop.run_frame() == 1
+        assert (len(updates), len(renders)) == (1, 1)
+
+    def test_fast_frames_do_not_tick(self, fake_time):
+        """Should draw frames without ticking when less than a tick has gone by"""
+        updates, renders = [], []
+        loop = self.make_loop(fake_time, updates, renders)
+        loop.run_frame()
+        fake_time.secs += 0.005
+        assert loop.run_frame() == 0
+        assert len(renders) == 2
+
+    def test_ticks_add_up(self, fake_time):
+        """Should run one tick for each 1/60th of a second that goes by"""
+        updates, renders = [], []
+        loop = self.make_loop(fake_time, updates, renders)
+        loop.run_frame()
+        for _ in range(100):
+            fake_time.secs += 0.01
+            loop.run_frame()
+        assert len(updates) == 1 + 60
+
+    def test_catches_up(self, fake_time):
+        """Should run several ticks in one frame after a slow frame"""
+        updates, renders = [], []
+        loop = self.make_loop(fake_time, updates, renders)
+        loop.run_frame()
+        fake_time.secs += 3.5 / 60
+        assert loop.run_frame() == 3
+
+    def test_drops_ticks_when_too_far_behind(self, fake_time):
+        """Should run no more than max_ticks_per_frame and drop the rest"""
+        updates, renders = [], []
+        loop = self.make_loop(fake_time, updates, renders, max_ticks_per_frame=5)
+        loop.run_frame()
+        fake_time.secs += 1.0 + (0.5 / 60)
+        assert loop.run_frame() == 5
+        assert loop.dropped_ticks == 55
+        fake_time.secs += 0.25 / 60
+        assert loop.run_frame() == 0
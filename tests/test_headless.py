@@ -0,0 +1,56 @@
+"""Tests for headless.py"""
+import pytest
+import headless
+from game_loop import GameLoop
+
+
+#pylint: disable-msg=no-self-use
+class TestTickClock(object):
+    """Tests for headless.py::TickClock"""
+
+    def test_one_tick_per_call(self):
+        """Should move forward by one tick each time it is called"""
+        clock = headless.TickClock(60)
+        assert clock() == pytest.approx(1 / 60)
+        assert clock() == pytest.approx(2 / 60)
+
+    def test_one_tick_per_frame(self):
+        """Should make a game loop run exactly one tick every frame"""
+        game_loop = GameLoop(lambda: None, lambda: None, max_fps=0, now=headless.TickClock())
+        assert [game_loop.run_frame() for _ in range(100)] == [1] * 100
+        assert game_loop.dropped_ticks == 0
+
+
+class TestRun(object):
+    """Tests for headless.py::run"""
+
+    def test_runs_frames(self, mocker):
+        """Should run the given number of frames, calling before_frame before each one"""
+        render = mocker.Mock()
+        before_frame = mocker.Mock()
+        game_loop = GameLoop(lambda: None, render, max_fps=0, now=headless.TickClock())
+        stats = headless.run(game_loop, 25, before_frame)
+        assert render.call_count == 25
+        assert before_frame.call_count == 25
+        assert stats['frames'] == 25
+        assert stats['ticks'] == 25
+        assert 'frames/s' in headless.format_stats(stats)
+
+
+class TestFrameStats(object):
+    """Tests for headless.py::frame_stats"""
+
+    def test_stats(self):
+        """Should summarize the frame times in milliseconds"""
+        stats = headless.frame_stats([0.001 * (n + 1) for n in range(100)], 2.0)
+        assert stats['frames'] == 100
+        assert stats['fps'] == pytest.approx(50)
+        assert stats['mean_msecs'] == pytest.approx(50.5)
+        assert stats['median_msecs'] == pytest.approx(51)
+        assert stats['p95_msecs'] == pytest.approx(96)
+        assert stats['min_msecs'] == pytest.approx(1)
+        assert stats['max_msecs'] == pytest.approx(100)
+
+    def test_no_frames(self):
+        """Should not fail when there were no frames"""
+        assert headless.frame_stats([], 0)['fps'] == 0
@@ -0,0 +1,66 @@
+"""Tests for hud.py"""
+import pygame
+import pytest
+import pylink_config
+from hud import Hud
+
+
+@pytest.fixture()
+def hud():
+    """A scoreboard on a display big enough to hold it."""
+    pygame.init()
+    pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    yield Hud()
+    pygame.quit()
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestHud(object):
+    """Tests for hud.py::Hud"""
+
+    def test_first_draw_is_whole_scoreboard(self, hud):
+        """Should draw the whole scoreboard the first time"""
+        assert hud.draw() == [pylink_config.PYLINK_SCOREBOARD]
+
+    def test_nothing_changed(self, hud):
+        """Should not draw anything when no value changed"""
+        hud.set_fps(60)
+        hud.draw()
+        hud.set_fps(60)
+        assert hud.draw() == []
+
+    def test_only_changed_field(self, hud):
+        """Should only report the field that changed"""
+        hud.set_fps(60)
+        hud.set_rupees(5)
+        hud.draw()
+        hud.set_rupees(6)
+        changed = hud.draw()
+        assert len(changed) == 1
+        assert pylink_config.PYLINK_SCOREBOARD.contains(changed[0])
+        assert changed[0].topleft == pylink_config.scale_nes_tuple_to_pylink((88, 16))
+
+    # hud is only used for its display
+    #pylint: disable-msg=unused-argument
+    def test_glyphs_are_cached(self, hud, mocker):
+        """Should not render any text to show new numbers"""
+        font = pygame.font.Font(None, 30)
+        spy = mocker.Mock(wraps=font)
+        fresh_hud = Hud(spy)
+        spy.render.reset_mock()
+        for fps in range(100):
+            fresh_hud.set_fps(fps)
+        spy.render.assert_not_called()
+        assert fresh_hud.glyph('7') is fresh_hud.glyph('7')
+
+    def test_hearts(self, hud):
+        """Should draw one red heart for each full heart"""
+        hud.draw()
+        hud.set_hearts(2, 3)
+        changed = hud.draw()
+        assert len(changed) == 1
+        screen = pygame.display.get_surface()
+        heart_width = changed[0].width // 8
+        first_heart = pygame.Rect(changed[0].topleft, (heart_width, heart_width))
+        third_heart = first_heart.move(2 * heart_width, 0)
+        assert screen.subsurface(first_heart).get_at((12, 12)) != screen.subsurface(third_heart).get_at((12, 12))
@@ -0,0 +1,56 @@
+"""Tests for input_log.py"""
+import pytest
+import controller
+import input_log
+
+
+#pylint: disable-msg=no-self-use
+class TestInputLog(object):
+    """Tests for input_log.py::InputLog and load()"""
+
+    def test_round_trip(self, tmp_path):
+        """Should load the buttons and seed that were saved"""
+        recording = input_log.InputLog(seed=1234)
+        for held in (0, controller.UP, controller.UP | controller.LEFT, controller.A):
+            recording.record(held)
+        filename = str(tmp_path / 'walk.inputs')
+        recording.save(filename)
+        loaded = input_log.load(filename)
+        assert loaded.seed == 1234
+        assert list(loaded) == [0, controller.UP, controller.UP | controller.LEFT, controller.A]
+
+    def test_one_byte_per_tick(self, tmp_path):
+        """Should only take one byte a tick after the header"""
+        filename = str(tmp_path / 'walk.inputs')
+        input_log.InputLog(ticks=bytes(100)).save(filename)
+        empty_filename = str(tmp_path / 'empty.inputs')
+        input_log.InputLog().save(empty_filename)
+        assert (tmp_path / 'walk.inputs').stat().st_size - (tmp_path / 'empty.inputs').stat().st_size == 100
+
+    @pytest.mark.parametrize('data', [b'PYLINK', b'NOTALOG!' + bytes(9), input_log.MAGIC + b'\x02' + bytes(8)])
+    def test_not_an_input_log(self, tmp_path, data):
+        """Should raise a ValueError for files that are not input logs it can read"""
+        filename = tmp_path / 'bad.inputs'
+        filename.write_bytes(data)
+        with pytest.raises(ValueError):
+            input_log.load(str(filename))
+
+    def test_replay_is_deterministic(self, tmp_path):
+        """Should give a controller the same directions when replayed as when recorded"""
+        presses = [controller.UP] * 3 + [controller.UP | controller.LEFT] * 3 + [controller.UP, 0]
+        recorder = controller.Controller()
+        recording = input_log.InputLog()
+        directions = []
+        for held in presses:
+            recorder.update(held)
+            recording.record(recorder.held)
+            directions.append(recorder.direction())
+        filename = str(tmp_path / 'walk.inputs')
+        recording.save(filename)
+        replayer = controller.Controller()
+        replayed = []
+        for held in input_log.load(filename):
+            replayer.update(held)
+            replayed.append(replayer.direction())
+        assert replayed == directions
+        assert directions[-3:] == ["left", "up", None]
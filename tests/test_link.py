@@ -1,5 +1,7 @@
 """Tests for link.py"""
-from link import Link
+import entities
+from link import Link, TICK_SECS, collision_mask
+from overworld import Overworld
 import pygame
 import pylink_config
 import pytest
@@ -57,3 +59,118 @@ class TestLinkSwitchMaps:
         """Should switch Link to the bottom edge of the map window"""
         self.link.switch_maps("up")
         assert self.link._Link__rect.bottom == pylink_config.PYLINK_MAP.bottom
+
+
+class TestLinkMove:
+    """Tests for turning and the move method"""
+
+    @pytest.fixture
+    def init_link(self):
+        """
+        Gets a pointer to the Link singleton instance, standing in his
+        normal starting position on the starting map.
+        """
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        Overworld.get_instance()
+        self.link = Link.get_instance()
+        self.link._Link__rect.topleft = pylink_config.PYLINK_MAP.center
+        entities.get().subpixels[self.link.entity()] = 0
+
+    def tick(self, dt_secs=TICK_SECS):
+        """Run one tick of the entity store and Link."""
+        entities.get().update(dt_secs)
+        self.link.update()
+
+    def test_turning_uses_frame_table(self, init_link, mocker):
+        """Should not look up any images when Link turns or steps"""
+        sprite = mocker.spy(self.link._Link__atlas, 'sprite')
+        for keydown in ('left_keydown', 'up_keydown', 'right_keydown', 'down_keydown'):
+            getattr(self.link, keydown)()
+            self.tick(pylink_config.LINK_STEP_INTERVAL_SECS)
+        assert sprite.call_count == 0
+
+    def test_move_updates_rect_in_place(self, init_link):
+        """Should move Link's rectangle without replacing it"""
+        rect = self.link._Link__rect
+        self.link.right_keydown()
+        self.tick()
+        assert self.link._Link__rect is rect
+        assert rect.left == pylink_config.PYLINK_MAP.centerx + pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+        self.link.left_keydown()
+        self.tick()
+        assert self.link._Link__rect is rect
+        assert rect.topleft == pylink_config.PYLINK_MAP.center
+
+    def test_step_resizes_rect(self, init_link):
+        """Should resize Link's rectangle to the image for his step"""
+        self.link.right_keydown()
+        for _ in range(2):
+            self.tick(pylink_config.LINK_STEP_INTERVAL_SECS)
+            assert self.link._Link__rect.size == self.link._Link__current_subsurface.get_size()
+
+    @pytest.mark.parametrize('ticks_per_sec', [20, 60, 144])
+    def test_walk_speed(self, init_link, ticks_per_sec):
+        """Should walk LINK_WALK_SPEED NES pixels a second at any frame rate"""
+        self.link.left_keydown()
+        for _ in range(ticks_per_sec):
+            self.tick(1.0 / ticks_per_sec)
+        walked = pylink_config.PYLINK_MAP.centerx - self.link._Link__rect.left
+        assert walked == pylink_config.LINK_WALK_SPEED * pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+
+    def test_sub_pixel_steps(self, init_link):
+        """Should walk 3 NES pixels every 2 ticks, like the NES"""
+        self.link.down_keydown()
+        tops = []
+        for _ in range(4):
+            self.tick()
+            tops.append(self.link._Link__rect.top)
+        start = pylink_config.PYLINK_MAP.centery
+        assert [(top - start) // pylink_config.NES_TO_PYLINK_SCALE_FACTOR for top in tops] == [1, 3, 4, 6]
+
+    def test_walk(self, init_link):
+        """Should only turn when the direction changes and stop when there is none"""
+        self.link.walk("up")
+        assert self.link.facing_direction == "up"
+        assert self.link.velocity == pylink_config.LINK_MOVE_UP_VELOCITY
+        self.link.walk("left")
+        assert self.link.velocity == pylink_config.LINK_MOVE_LEFT_VELOCITY
+        self.link.walk(None)
+        assert self.link.velocity == pylink_config.LINK_STOPPED_VELOCITY
+        assert self.link.facing_direction == "left"
+
+    def test_link_is_an_entity(self, init_link):
+        """Should keep Link's position and hitbox in the entity store"""
+        store = entities.get()
+        self.link.down_keydown()
+        self.tick()
+        rect = self.link._Link__rect
+        scale = pylink_config.NES_TO_PYLINK_SCALE_FACTOR
+        assert tuple(store.position[self.link.entity()]) == (rect.left // scale, rect.top // scale)
+        nes_collision = pygame.Rect(rect.left // scale, rect.centery // scale, 1, 1)
+        assert self.link.entity() in store.overlapping(nes_collision)
+
+
+class TestCollisionMask:
+    """Tests for the collision_mask function"""
+
+    @pytest.fixture
+    def image(self):
+        """A 4x4 image that is transparent except for its bottom right corner"""
+        surface = pygame.Surface((4, 4))
+        surface.fill((0, 0, 0))
+        surface.set_colorkey((0, 0, 0))
+        surface.set_at((3, 3), (255, 255, 255))
+        return surface
+
+    def test_bottom_half_only(self, image):
+        """Should cover only the visible pixels of the bottom half"""
+        mask = collision_mask(image, (4, 4))
+        assert mask.get_size() == (4, 2)
+        assert mask.get_bounding_rects() == [pygame.Rect(3, 1, 1, 1)]
+
+    def test_scaled(self, image):
+        """Should scale the mask to the size in PYLINK coordinates"""
+        mask = collision_mask(image, (12, 12))
+        assert mask.get_size() == (12, 6)
+        assert mask.get_bounding_rects() == [pygame.Rect(9, 3, 3, 3)]
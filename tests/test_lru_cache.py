@@ -0,0 +1,81 @@
+"""Tests for lru_cache.py"""
+import pytest
+from lru_cache import LruCache
+
+
+#pylint: disable-msg=no-self-use,line-too-long
+class TestLruCache(object):
+    """Tests for lru_cache.py::LruCache"""
+
+    def test_zero_entries(self):
+        """Should raise a ValueError if the cache could hold nothing"""
+        with pytest.raises(ValueError, match=r'max_entries must be at least 1'):
+            LruCache(0)
+
+    def test_get_missing(self):
+        """Should return the default for a missing key"""
+        cache = LruCache(2)
+        assert cache.get('missing', 'default') == 'default'
+
+    def test_put_and_get(self):
+        """Should return what was stored"""
+        cache = LruCache(2)
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+
+    def test_evicts_least_recently_used(self):
+        """Should drop the least recently used item when full"""
+        cache = LruCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' in cache and 'c' in cache and 'b' not in cache
+
+    def test_never_grows_past_max_entries(self):
+        """Should hold no more than max_entries items"""
+        cache = LruCache(3)
+        for key in range(10):
+            cache.put(key, key)
+        assert len(cache) == 3
+
+    def test_get_or_create_only_creates_once(self):
+        """Should only call create the first time a key is asked for"""
+        cache = LruCache(2)
+        calls = []
+        for _ in range(3):
+            cache.get_or_create('a', lambda: calls.append(1) or len(calls))
+        assert calls == [1]
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_size_without_size_of(self):
+        """Should raise a ValueError if the size is limited without a way to measure it"""
+        with pytest.raises(ValueError, match=r'size_of is needed'):
+            LruCache(2, max_size=10)
+
+    def test_evicts_over_max_size(self):
+        """Should drop the least recently used items while over max_size"""
+        cache = LruCache(10, max_size=10, size_of=len)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.put('c', 'xxxx')
+        assert cache.keys() == ['b', 'c']
+        assert cache.size == 8
+
+    def test_keeps_oversized_item(self):
+        """Should keep the newest item even if it is over max_size on its own"""
+        cache = LruCache(10, max_size=2, size_of=len)
+        cache.put('a', 'x')
+        cache.put('b', 'xxxx')
+        assert cache.keys() == ['b']
+
+    def test_remove(self):
+        """Should drop a removed item and its size"""
+        cache = LruCache(10, max_size=10, size_of=len)
+        cache.put('a', 'xxx')
+        cache.put('a', 'xx')
+        assert cache.size == 2
+        cache.remove('a')
+        cache.remove('missing')
+        assert 'a' not in cache
+        assert cache.size == 0
@@ -1,6 +1,9 @@
 """Tests for overworld.py"""
+import concurrent.futures
 from overworld import Overworld
+import overworld
 import pygame
+import pylink_config
 import pytest
 
 
@@ -23,3 +26,137 @@ class TestOverworldConstructors:
         first_object = Overworld.get_instance()
         second_object = Overworld.get_instance()
         assert first_object is second_object
+
+
+class TestSubmapCache:
+    """Tests for the scaled submap cache in overworld.py"""
+
+    @pytest.fixture
+    def initialize_display(self):
+        pygame.init()
+        pygame.display.set_mode((1,1))
+        yield
+        pygame.quit()
+
+    def test_submap_is_scaled(self, initialize_display):
+        """Should scale a submap to the size of the map section of the screen"""
+        submap = Overworld.get_instance()._Overworld__submap((7, 7))
+        assert submap.get_size() == pylink_config.PYLINK_MAP.size
+
+    def test_submap_is_cached(self, initialize_display):
+        """Should only scale a submap once"""
+        the_overworld = Overworld.get_instance()
+        assert the_overworld._Overworld__submap((6, 7)) is the_overworld._Overworld__submap((6, 7))
+
+    def test_cache_is_bounded(self, initialize_display):
+        """Should never hold more than the configured number of submaps"""
+        the_overworld = Overworld.get_instance()
+        for column in range(16):
+            the_overworld._Overworld__submap((column, 0))
+        assert len(the_overworld._Overworld__scaled_submaps) == pylink_config.OVERWORLD_SUBMAP_CACHE_SIZE
+
+    def test_draw_looks_up_once(self, initialize_display):
+        """Should only look the current submap up in the cache once per draw"""
+        the_overworld = Overworld.get_instance()
+        the_overworld.draw()
+        cache = the_overworld._Overworld__scaled_submaps
+        hits = cache.hits
+        the_overworld.draw()
+        assert cache.hits == hits + 1
+
+
+class TestBlockingMask:
+    """Tests for the blocking masks in overworld.py"""
+
+    @pytest.fixture
+    def initialize_display(self):
+        pygame.init()
+        pygame.display.set_mode((1,1))
+        yield
+        pygame.quit()
+
+    def test_mask_covers_map(self, initialize_display):
+        """Should be the size of the map section in PYLINK coordinates"""
+        mask = Overworld.get_instance().blocking_mask()
+        assert mask.get_size() == pylink_config.PYLINK_MAP.size
+
+    def test_mask_within_blocked_cells(self, initialize_display):
+        """Should only block pixels in cells the walkability grid blocks"""
+        the_overworld = Overworld.get_instance()
+        grid = the_overworld.walkability_grid()
+        cell_width, cell_height = pylink_config.PYLINK_WALKABILITY_CELL_SIZE
+        cell = pygame.mask.Mask((cell_width, cell_height), fill=True)
+        mask = the_overworld.blocking_mask()
+        for row, column in zip(*grid.nonzero()):
+            assert mask.overlap(cell, (column * cell_width, row * cell_height)) is None
+        assert mask.count() > 0
+
+    def test_mask_is_cached(self, initialize_display):
+        """Should only build the mask of each submap once"""
+        the_overworld = Overworld.get_instance()
+        assert the_overworld.blocking_mask() is the_overworld.blocking_mask()
+
+
+class TestSwitchMaps:
+    """Tests for scrolling between submaps and prefetching them"""
+
+    @pytest.fixture
+    def the_overworld(self):
+        pygame.init()
+        pygame.display.set_mode((1,1))
+        yield Overworld.get_instance()
+        pygame.quit()
+
+    def test_neighbours_are_prefetched(self, the_overworld):
+        """Should draw every neighbouring submap on the map ahead of time"""
+        concurrent.futures.wait(the_overworld.prefetch_neighbours())
+        the_overworld.prefetch_neighbours()
+        current = the_overworld._Overworld__current_submap
+        for offset in overworld.switch_map_offsets.values():
+            neighbour = (current[0] + offset[0], current[1] + offset[1])
+            if neighbour[1] < pylink_config.OVERWORLD_SIZE_IN_SUBMAPS[1]:
+                assert neighbour in the_overworld._Overworld__scaled_submaps
+
+    def test_scrolls_in_from_the_right(self, the_overworld):
+        """Should start with the new submap just off the right side of the map"""
+        the_overworld.switch_maps("right")
+        assert the_overworld.is_transitioning()
+        offset_x, offset_y = the_overworld.scroll_offset()
+        assert 0 < offset_x <= pylink_config.PYLINK_MAP.width and offset_y == 0
+        the_overworld.switch_maps("left")
+
+    def test_scrolls_in_from_the_top(self, the_overworld):
+        """Should start with the new submap just off the top of the map"""
+        the_overworld.switch_maps("up")
+        offset_x, offset_y = the_overworld.scroll_offset()
+        assert offset_x == 0 and -pylink_config.PYLINK_MAP.height <= offset_y < 0
+        the_overworld.switch_maps("down")
+
+    def test_scrolls_each_tick(self, the_overworld):
+        """Should scroll 4 NES pixels closer each tick"""
+        the_overworld.switch_maps("right")
+        before = the_overworld.scroll_offset()
+        the_overworld.update()
+        assert the_overworld.scroll_offset()[0] == before[0] - (4 * pylink_config.NES_TO_PYLINK_SCALE_FACTOR)
+        the_overworld.switch_maps("left")
+
+    def test_transition_finishes(self, the_overworld):
+        """Should stop scrolling once the new submap is in place"""
+        the_overworld.switch_maps("down")
+        for _ in range(pylink_config.SIMULATION_TICKS_PER_SEC):
+            the_overworld.update()
+        assert not the_overworld.is_transitioning()
+        assert the_overworld.scroll_offset() == (0, 0)
+        the_overworld.switch_maps("up")
+
+    def test_close(self, the_overworld, monkeypatch):  # pylint: disable=unused-argument
+        """Should shut the prefetch thread down and draw submaps without it"""
+        monkeypatch.setattr(Overworld, '_Overworld__instance', None)
+        closed = Overworld.get_instance()
+        prefetcher = closed._Overworld__prefetcher
+        closed.close()
+        with pytest.raises(RuntimeError):
+            prefetcher.submit(int)
+        assert closed.prefetch_neighbours() == []
+        closed.switch_maps("right")
+        assert closed._Overworld__submap(closed.current_submap()).get_size() == pylink_config.PYLINK_MAP.size
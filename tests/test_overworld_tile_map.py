@@ -0,0 +1,67 @@
+"""Tests for overworld_tile_map.py"""
+import numpy
+import pygame
+import pytest
+import overworld_tile_map
+
+
+@pytest.fixture(scope='module')
+def overworld_pixels():
+    """The overworld map file as (y, x, rgb) pixels."""
+    return pygame.surfarray.array3d(
+        pygame.image.load(overworld_tile_map.OVERWORLD_FILENAME)
+    ).transpose(1, 0, 2)
+
+
+@pytest.fixture(scope='module')
+def built(overworld_pixels):
+    """The tile map and tiles built from the overworld map file."""
+    return overworld_tile_map.build(overworld_pixels)
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestSubmapRect(object):
+    """Tests for overworld_tile_map.py::submap_rect()"""
+
+    def test_first_submap(self):
+        """Should skip the one pixel frame around the first submap"""
+        assert overworld_tile_map.submap_rect((0, 0)) == pygame.Rect(1, 1, 256, 176)
+
+    def test_starting_submap(self):
+        """Should account for the frame around every earlier submap"""
+        assert overworld_tile_map.submap_rect((7, 7)) == pygame.Rect(1800, 1240, 256, 176)
+
+
+class TestBuild(object):
+    """Tests for overworld_tile_map.py::build()"""
+
+    def test_tile_map_shape(self, built):
+        """Should have 16x11 tiles for each of the 16x8 submaps"""
+        tile_map, _ = built
+        assert tile_map.shape == (8, 16, 11, 16)
+        assert tile_map.dtype == numpy.uint8
+
+    def test_tiles_fit_in_a_uint8(self, built):
+        """Should not need more tiles than a uint8 can index"""
+        _, tiles = built
+        assert len(tiles) <= 256
+        assert tiles.shape[1:] == (16, 16, 3)
+
+    def test_rebuilds_the_map_exactly(self, overworld_pixels, built):
+        """Should give back the original pixels when the tiles are put back in place"""
+        tile_map, tiles = built
+        rect = overworld_tile_map.submap_rect((7, 7))
+        rebuilt = tiles[tile_map[7, 7]].transpose(0, 2, 1, 3, 4).reshape(176, 256, 3)
+        assert numpy.array_equal(rebuilt, overworld_pixels[rect.top:rect.bottom, rect.left:rect.right])
+
+
+class TestLoad(object):
+    """Tests for overworld_tile_map.py::load()"""
+
+    def test_builds_and_saves_on_first_load(self, tmp_path, built):
+        """Should build the tile map when there is no saved copy, and then reuse the saved copy"""
+        filename = str(tmp_path / 'tile_map.npz')
+        tile_map, _ = overworld_tile_map.load(filename)
+        assert numpy.array_equal(tile_map, built[0])
+        saved_tile_map, _ = overworld_tile_map.load(filename)
+        assert numpy.array_equal(saved_tile_map, built[0])
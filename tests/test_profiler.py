@@ -0,0 +1,89 @@
+"""Tests for profiler.py"""
+import csv
+import pygame
+import pytest
+import pylink_config
+from profiler import Profiler, ProfilerOverlay
+
+
+def run_frames(profiler, frame_secs):
+    """Store a frame in profiler for each of frame_secs, with every phase taking that long."""
+    for secs in frame_secs:
+        for column, _ in enumerate(profiler.phases):
+            profiler._add(column, secs)  # pylint: disable=protected-access
+        profiler.end_frame()
+
+
+#pylint: disable-msg=no-self-use,line-too-long
+class TestProfiler(object):
+    """Tests for profiler.py::Profiler"""
+
+    def test_phase_times_added_up(self):
+        """Should add up the times of a phase entered more than once in a frame"""
+        profiler = Profiler(('simulation',), 4)
+        for _ in range(3):
+            with profiler.phase('simulation'):
+                pass
+        profiler.end_frame()
+        frame_secs = profiler.frame_secs()
+        assert frame_secs.shape == (1, 1)
+        assert frame_secs[0, 0] > 0
+
+    def test_ring_buffer_keeps_newest(self):
+        """Should only keep the most recent frames, oldest first"""
+        profiler = Profiler(('a', 'b'), 4)
+        run_frames(profiler, [1, 2, 3, 4, 5, 6])
+        assert profiler.frame_secs()[:, 0].tolist() == [3, 4, 5, 6]
+        assert profiler.frames == 6
+
+    def test_percentiles(self):
+        """Should give the percentiles of each phase in milliseconds"""
+        profiler = Profiler(('a',), 100)
+        run_frames(profiler, [n / 1000 for n in range(1, 101)])
+        p50, p95, p99 = profiler.percentiles()['a']
+        assert p50 == pytest.approx(50.5)
+        assert p95 == pytest.approx(95.05)
+        assert p99 == pytest.approx(99.01)
+
+    def test_percentiles_no_frames(self):
+        """Should give zeros before any frames are stored"""
+        assert Profiler(('a',), 4).percentiles() == {'a': (0.0, 0.0, 0.0)}
+
+    def test_write_csv(self, tmp_path):
+        """Should write one row per stored frame with its number and a total"""
+        profiler = Profiler(('a', 'b'), 2)
+        run_frames(profiler, [0.001, 0.002, 0.003])
+        filename = tmp_path / 'profile.csv'
+        profiler.write_csv(filename)
+        with open(filename, newline='', encoding='utf-8') as csv_file:
+            rows = list(csv.reader(csv_file))
+        assert rows[0] == ['frame', 'a', 'b', 'total']
+        assert [row[0] for row in rows[1:]] == ['1', '2']
+        assert float(rows[2][1]) == pytest.approx(3)
+        assert float(rows[2][3]) == pytest.approx(6)
+
+
+class TestProfilerOverlay(object):
+    """Tests for profiler.py::ProfilerOverlay"""
+
+    @pytest.fixture()
+    def display(self):
+        """A display big enough for the overlay."""
+        pygame.init()
+        pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+        yield
+        pygame.quit()
+
+    def test_hidden(self, display):
+        """Should not draw anything until it is toggled on"""
+        assert ProfilerOverlay(Profiler()).draw() == []
+
+    def test_shown(self, display):
+        """Should draw over the top left of the map once toggled on"""
+        overlay = ProfilerOverlay(Profiler())
+        overlay.toggle()
+        drawn = overlay.draw()
+        assert len(drawn) == 1
+        assert drawn[0].topleft == pylink_config.PYLINK_MAP.topleft
+        overlay.toggle()
+        assert overlay.draw() == []
@@ -0,0 +1,67 @@
+"""Tests for render_target.py"""
+import pygame
+import pytest
+import pylink_config
+from render_target import RenderTarget
+
+
+@pytest.fixture()
+def window():
+    """A display the size of the game window."""
+    pygame.init()
+    yield pygame.display.set_mode(pylink_config.PYLINK_WINDOW.size)
+    pygame.quit()
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestRenderTarget(object):
+    """Tests for render_target.py::RenderTarget"""
+
+    def test_3x_draws_to_window(self, window):
+        """Should draw straight to the window at 3x"""
+        target = RenderTarget(pylink_config.NES_TO_PYLINK_SCALE_FACTOR)
+        assert not target.is_native()
+        assert target.surface() is window
+        assert target.rect(pylink_config.PYLINK_MAP) == pylink_config.PYLINK_MAP
+
+    def test_native_coordinates(self, window):
+        """Should convert PYLINK coordinates to NES ones and back"""
+        target = RenderTarget(1)
+        assert target.is_native()
+        assert target.surface().get_size() == pylink_config.NES_WINDOW.size
+        assert target.rect(pylink_config.PYLINK_MAP) == pylink_config.NES_MAP
+        assert target.point((384, 456)) == (128, 152)
+        assert target.pylink_rect(pylink_config.NES_MAP) == pylink_config.PYLINK_MAP
+
+    def test_native_present_scales_up(self, window, mocker):
+        """Should scale the back buffer up to fill the window"""
+        flip = mocker.patch('pygame.display.flip')
+        target = RenderTarget(1)
+        target.surface().fill((0, 0, 0))
+        target.surface().set_at((10, 20), (255, 0, 0))
+        target.present([], True)
+        flip.assert_called_once()
+        for point in ((30, 60), (32, 62)):
+            assert window.get_at(point) == pygame.Color(255, 0, 0)
+        assert window.get_at((33, 60)) == pygame.Color(0, 0, 0)
+
+    def test_native_present_nothing_changed(self, window, mocker):
+        """Should not scale or flip when nothing changed"""
+        flip = mocker.patch('pygame.display.flip')
+        scale = mocker.patch('pygame.transform.scale')
+        target = RenderTarget(1)
+        target.surface()
+        target.present([], False)
+        flip.assert_not_called()
+        scale.assert_not_called()
+
+    def test_native_display_scales_itself(self, mocker):
+        """Should draw straight to a display opened at the NES size"""
+        pygame.init()
+        display = pygame.display.set_mode(pylink_config.NES_WINDOW.size)
+        update = mocker.patch('pygame.display.update')
+        target = RenderTarget(1)
+        assert target.surface() is display
+        target.present([pylink_config.PYLINK_SCOREBOARD], False)
+        update.assert_called_once_with([pylink_config.NES_SCOREBOARD])
+        pygame.quit()
@@ -0,0 +1,90 @@
+"""Tests for renderer.py"""
+import pygame
+import pytest
+from renderer import Renderer
+
+
+@pytest.fixture()
+def display(mocker):
+    """Mocks of the display's flip() and update()."""
+    return (
+        mocker.patch('pygame.display.flip'),
+        mocker.patch('pygame.display.update')
+    )
+
+
+@pytest.fixture()
+def the_overworld(mocker):
+    """A stand in for the Overworld that is not scrolling."""
+    overworld = mocker.Mock()
+    overworld.is_transitioning.return_value = False
+    return overworld
+
+
+@pytest.fixture()
+def the_link(mocker):
+    """A stand in for Link that has not moved."""
+    link = mocker.Mock()
+    link.needs_redraw.return_value = False
+    return link
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestRenderer(object):
+    """Tests for renderer.py::Renderer"""
+
+    def test_first_frame_is_full(self, display, the_overworld, the_link):
+        """Should draw everything and flip the whole display on the first frame"""
+        renderer = Renderer(the_overworld, the_link)
+        renderer.draw_map()
+        renderer.present()
+        the_overworld.draw.assert_called_once_with()
+        display[0].assert_called_once()
+
+    def test_nothing_changed(self, display, the_overworld, the_link):
+        """Should not draw or update anything when nothing changed"""
+        renderer = Renderer(the_overworld, the_link)
+        renderer.draw_map()
+        renderer.present()
+        the_overworld.reset_mock()
+        renderer.draw_map()
+        renderer.present()
+        the_overworld.draw.assert_not_called()
+        display[1].assert_not_called()
+
+    def test_link_moved(self, display, the_overworld, the_link):
+        """Should only update where Link was and where he is now when he moves"""
+        renderer = Renderer(the_overworld, the_link)
+        renderer.draw_map()
+        renderer.present()
+        the_link.needs_redraw.return_value = True
+        the_link.drawn_rect.return_value = pygame.Rect(0, 0, 10, 10)
+        the_link.draw.return_value = pygame.Rect(5, 0, 10, 10)
+        renderer.draw_map()
+        renderer.present()
+        the_overworld.draw.assert_called_with(pygame.Rect(0, 0, 10, 10))
+        display[1].assert_called_once_with([pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 0, 10, 10)])
+        assert display[0].call_count == 1
+
+    def test_dirty_scoreboard(self, display, the_overworld, the_link):
+        """Should update regions marked dirty from outside"""
+        renderer = Renderer(the_overworld, the_link)
+        renderer.present()
+        renderer.mark_dirty((0, 0, 20, 20))
+        renderer.present()
+        display[1].assert_called_once_with([pygame.Rect(0, 0, 20, 20)])
+
+    def test_full_while_scrolling(self, display, the_overworld, the_link):
+        """Should flip the whole display while scrolling and on the frame after"""
+        renderer = Renderer(the_overworld, the_link)
+        renderer.present()
+        the_overworld.is_transitioning.return_value = True
+        for _ in range(2):
+            renderer.draw_map()
+            renderer.present()
+        the_overworld.is_transitioning.return_value = False
+        renderer.draw_map()
+        renderer.present()
+        renderer.draw_map()
+        renderer.present()
+        assert display[0].call_count == 4
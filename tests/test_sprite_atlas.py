@@ -0,0 +1,125 @@
+"""Tests for sprite_atlas.py"""
+import itertools
+import numpy
+import pygame
+import pytest
+import sprite_atlas
+
+#: A sheet with a 2x1 sprite whose left pixel is red and right pixel blue
+SHEET_PIXELS = ((255, 0, 0), (0, 0, 255))
+
+
+#pylint: disable-msg=redefined-outer-name,unused-argument
+@pytest.fixture()
+def display(scratch_display):
+    """A display and asset cache as in conftest.py, and no atlases loaded."""
+    sprite_atlas.clear()
+    yield
+    sprite_atlas.clear()
+
+
+@pytest.fixture()
+def sheet(tmp_path, display):
+    """The filename of a small sprite sheet."""
+    filename = str(tmp_path / 'sheet.png')
+    surface = pygame.Surface((4, 2))
+    surface.fill((0, 255, 0))
+    for x_location, color in enumerate(SHEET_PIXELS):
+        surface.set_at((x_location, 0), color)
+    pygame.image.save(surface, filename)
+    return filename
+
+
+#pylint: disable-msg=no-self-use,line-too-long
+class TestPack(object):
+    """Tests for sprite_atlas.py::pack()"""
+
+    def test_nothing(self):
+        """Should pack nothing into nothing"""
+        assert sprite_atlas.pack([]) == ((0, 0), [])
+
+    def test_no_overlaps(self):
+        """Should place every rectangle inside the area without overlapping any other"""
+        sizes = [(48, 48), (10, 30), (30, 10), (64, 2), (1, 1), (5, 7)] * 3
+        size, positions = sprite_atlas.pack(sizes)
+        area = pygame.Rect((0, 0), size)
+        rects = [pygame.Rect(position, rect_size) for position, rect_size in zip(positions, sizes)]
+        for rect in rects:
+            assert area.contains(rect)
+        for first, second in itertools.combinations(rects, 2):
+            assert not first.colliderect(second)
+
+    def test_fits_widest(self):
+        """Should be at least as wide as the widest rectangle"""
+        size, _ = sprite_atlas.pack([(100, 1), (1, 1)])
+        assert size == (100, 2)
+
+
+class TestSpriteAtlas(object):
+    """Tests for sprite_atlas.py::SpriteAtlas"""
+
+    def test_scales_and_flips(self, sheet):
+        """Should scale each sprite up and mirror flipped ones"""
+        atlas = sprite_atlas.SpriteAtlas({sheet: {
+            'plain': {'region': [0, 0, 2, 1]},
+            'flipped': {'region': [0, 0, 2, 1], 'flip_x': True},
+        }}, 3)
+        plain = atlas.sprite('plain')
+        flipped = atlas.sprite('flipped')
+        assert plain.get_size() == flipped.get_size() == (6, 3)
+        assert plain.get_at((0, 0))[:3] == flipped.get_at((5, 2))[:3] == SHEET_PIXELS[0]
+        assert plain.get_at((5, 2))[:3] == flipped.get_at((0, 0))[:3] == SHEET_PIXELS[1]
+
+    def test_one_surface(self, sheet):
+        """Should hand out subsurfaces of one Surface in the display format"""
+        atlas = sprite_atlas.SpriteAtlas({sheet: {
+            'first': {'region': [0, 0, 2, 1]},
+            'second': {'region': [2, 0, 2, 2]},
+        }}, 1)
+        assert sorted(atlas.names()) == ['first', 'second']
+        for name in atlas.names():
+            assert atlas.sprite(name).get_parent() is atlas.surface
+        assert atlas.surface.get_bitsize() == pygame.display.get_surface().get_bitsize()
+
+    def test_colorkey(self, sheet):
+        """Should give each sprite its own colorkey, sampled after flipping"""
+        atlas = sprite_atlas.SpriteAtlas({sheet: {
+            'plain': {'region': [0, 0, 2, 1], 'colorkey': [0, 0]},
+            'flipped': {'region': [0, 0, 2, 1], 'colorkey': [0, 0], 'flip_x': True},
+            'opaque': {'region': [0, 0, 2, 1]},
+        }}, 2)
+        assert atlas.sprite('plain').get_colorkey()[:3] == SHEET_PIXELS[0]
+        assert atlas.sprite('flipped').get_colorkey()[:3] == SHEET_PIXELS[1]
+        assert atlas.sprite('opaque').get_colorkey() is None
+
+    def test_unknown_sprite(self, sheet):
+        """Should raise a KeyError for a sprite that is not in the atlas"""
+        atlas = sprite_atlas.SpriteAtlas({sheet: {'plain': {'region': [0, 0, 2, 1]}}}, 1)
+        with pytest.raises(KeyError):
+            atlas.sprite('junk')
+
+
+class TestManifest(object):
+    """Tests for the sprites in sprite_atlas.MANIFEST_FILENAME"""
+
+    def test_regions_on_sheets(self):
+        """Should only have sprites that are inside their sheets"""
+        for sheets in sprite_atlas.load_manifest().values():
+            for filename, sprites in sheets.items():
+                sheet_rect = pygame.image.load(filename).get_rect()
+                for sprite in sprites.values():
+                    assert sheet_rect.contains(pygame.Rect(sprite['region']))
+
+    def test_get_builds_once(self, display):
+        """Should build each atlas at each scale only once"""
+        atlas = sprite_atlas.get('link', 1)
+        assert sprite_atlas.get('link', 1) is atlas
+        assert sprite_atlas.get('link', 3) is not atlas
+        assert sprite_atlas.sprite('link', 'down_0', 3).get_size() == (45, 48)
+
+    def test_link_left_is_right_flipped(self, display):
+        """Should have Link's left facing frames be his right facing ones mirrored"""
+        for step in (0, 1):
+            left = sprite_atlas.sprite('link', f'left_{step}', 1)
+            right = sprite_atlas.sprite('link', f'right_{step}', 1)
+            assert numpy.array_equal(pygame.surfarray.array3d(left), pygame.surfarray.array3d(right)[::-1])
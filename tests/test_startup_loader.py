@@ -0,0 +1,57 @@
+"""Tests for startup_loader.py"""
+import threading
+import pytest
+from startup_loader import StartupLoader
+
+
+#pylint: disable-msg=no-self-use
+class TestStartupLoader(object):
+    """Tests for startup_loader.py::StartupLoader"""
+
+    def test_threads(self):
+        """Should load on a worker thread and finish on the calling thread"""
+        threads = {}
+        loader = StartupLoader()
+        loader.add(
+            'asset',
+            lambda: threads.setdefault('load', threading.current_thread()),
+            lambda loaded: threads.setdefault('finish', threading.current_thread()))
+        loader.run()
+        assert threads['load'] is not threading.current_thread()
+        assert threads['finish'] is threading.current_thread()
+
+    def test_results(self):
+        """Should return the result of each asset's finish, or load if it has none"""
+        loader = StartupLoader(max_workers=2)
+        loader.add('loaded', lambda: 1)
+        loader.add('finished', lambda: 2, lambda loaded: loaded * 10)
+        assert loader.run() == {'loaded': 1, 'finished': 20}
+
+    def test_loads_at_once(self):
+        """Should load assets at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+        loader = StartupLoader(max_workers=2)
+        loader.add('first', barrier.wait)
+        loader.add('second', barrier.wait)
+        assert sorted(loader.run().values()) == [0, 1]
+
+    def test_timings(self):
+        """Should time each asset, in the order they were added"""
+        loader = StartupLoader()
+        for name in ('first', 'second', 'third'):
+            loader.add(name, lambda: None)
+        loader.run()
+        assert [timing[0] for timing in loader.timings] == ['first', 'second', 'third']
+        report = loader.format_timings()
+        assert len(report.splitlines()) == 4
+        assert 'second: load' in report
+        assert 'total' in report
+
+    def test_raises(self):
+        """Should raise whatever loading an asset raised"""
+        def broken():
+            raise ValueError('broken asset')
+        loader = StartupLoader()
+        loader.add('broken', broken)
+        with pytest.raises(ValueError, match='broken asset'):
+            loader.run()
@@ -1,6 +1,9 @@
 """Tests for tile_loader.py"""
+import weakref
+import numpy
 import pytest
 import pygame
+import asset_cache
 import tile_loader
 
 
@@ -106,6 +109,7 @@ class TestTileUpperLeftCoordinates(object):
             offset=(340, 514))
         assert (tile_x, tile_y) == (346, 514)
 
+
 class TestLoadTileTable(object):
     """Tests for tile_loader.py::load_tile_table()"""
 
@@ -119,3 +123,137 @@ class TestLoadTileTable(object):
                 final_tile_size=(48, 48),
                 tile_scaling=(3, 3))
     #pylint: enable-msg=invalid-name,unused-variable
+
+
+class TestLoadWholeTileTable(object):
+    """Tests for tile_loader.py::load_whole_tile_table()"""
+
+    #pylint: disable-msg=unused-argument
+    @pytest.mark.parametrize('sheet', [
+        {'filename': 'assets/NES-TheLegendofZelda-OverworldTiles.png', 'original_tile_size': (16, 16), 'border': (1, 1), 'final_tile_size': (48, 48)},
+        {'filename': 'assets/NES-TheLegendofZelda-IntroAndFileSelect.png', 'original_tile_size': (8, 8), 'border': (1, 1), 'offset': (269, 733), 'tile_scaling': (3, 3), 'colorkey_location': (0, 0)},
+        {'filename': 'assets/NES-TheLegendofZelda-Link.png', 'original_tile_size': (16, 16), 'border': (1, 1), 'offset': (0, 10), 'final_tile_size': (40, 40)},
+    ])
+    def test_same_as_load_tile_table(self, scratch_display, sheet):
+        """Should give exactly the same tiles as load_tile_table"""
+        expected = tile_loader.load_tile_table(**sheet)
+        actual = tile_loader.load_whole_tile_table(**sheet)
+        assert [len(line) for line in actual] == [len(line) for line in expected]
+        for expected_line, actual_line in zip(expected, actual):
+            for expected_tile, actual_tile in zip(expected_line, actual_line):
+                assert actual_tile.get_colorkey() == expected_tile.get_colorkey()
+                assert numpy.array_equal(pygame.surfarray.array3d(actual_tile), pygame.surfarray.array3d(expected_tile))
+
+    def test_both_final_size_and_scaling_together(self):
+        """Should raise a ValueError if both final size and scaling are given together"""
+        with pytest.raises(ValueError, match=r'final_tile_size and tile_scaling cannot both be specified in the same call'):
+            tile_loader.load_whole_tile_table(
+                filename='junk',
+                original_tile_size=(16, 16),
+                final_tile_size=(48, 48),
+                tile_scaling=(3, 3))
+
+
+class TestTileTable(object):
+    """Tests for tile_loader.py::TileTable"""
+
+    @pytest.fixture()
+    def loads(self):
+        """The (row, col) of each tile loaded, in order."""
+        return []
+
+    #pylint: disable-msg=redefined-outer-name
+    @pytest.fixture()
+    def table(self, loads):
+        """A 2x3 table whose tiles are their own (row, col)."""
+        def load_tile(row, col):
+            loads.append((row, col))
+            return (row, col)
+        return tile_loader.TileTable(2, 3, load_tile)
+
+    def test_loads_nothing_up_front(self, table, loads):
+        """Should not load any tiles until they are indexed"""
+        assert (len(table), len(table[0])) == (2, 3)
+        assert loads == []
+        assert table.num_loaded() == 0
+
+    def test_loads_only_what_is_indexed(self, table, loads):
+        """Should only load the tile that was indexed"""
+        assert table[1][2] == (1, 2)
+        assert loads == [(1, 2)]
+
+    def test_memoizes(self, table, loads):
+        """Should load each tile only once"""
+        assert table[0][1] is table[0][1]
+        assert table[-1][-1] == (1, 2)
+        assert table[1][2] == (1, 2)
+        assert loads == [(0, 1), (1, 2)]
+        assert table.num_loaded() == 2
+
+    def test_acts_like_a_list_of_lists(self, table):
+        """Should iterate, slice and raise IndexError like a list of lists"""
+        assert [list(line) for line in table] == [[(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)]]
+        assert table[0][1:] == [(0, 1), (0, 2)]
+        with pytest.raises(IndexError):
+            table[0][3]  # pylint: disable-msg=pointless-statement
+        with pytest.raises(IndexError):
+            table[2]  # pylint: disable-msg=pointless-statement
+
+    #pylint: disable-msg=unused-argument
+    def test_load_tile_table_is_lazy(self, scratch_display):
+        """Should only scale the one tile used out of a big sheet"""
+        table = tile_loader.load_tile_table(
+            filename='assets/NES-TheLegendofZelda-IntroAndFileSelect.png',
+            original_tile_size=(8, 8),
+            offset=(278, 734),
+            tile_scaling=(3, 3),
+            colorkey_location=(0, 0))
+        heart = table[0][0]
+        assert len(table) * len(table[0]) > 1
+        assert table.num_loaded() == 1
+        assert asset_cache.get_cache().misses == 1
+        assert heart.get_size() == (24, 24)
+        assert heart.get_colorkey() == heart.get_at((0, 0))
+
+
+class TestShareTile(object):
+    """Tests for tile_loader.py::share_tile() and the tables that use it"""
+
+    #pylint: disable-msg=unused-argument
+    @pytest.fixture()
+    def sheet(self, tmp_path, monkeypatch, scratch_display):
+        """
+        A sheet of four 2x2 tiles in a row, red, blue, red and red with
+        a blue corner, and a display to convert to.
+        """
+        monkeypatch.setattr(tile_loader, '_shared_tiles', weakref.WeakValueDictionary())
+        monkeypatch.setattr(tile_loader, '_shared_tile_counts', {'tiles': 0, 'bytes_saved': 0})
+        surface = pygame.Surface((8, 2))
+        surface.fill((255, 0, 0))
+        surface.fill((0, 0, 255), (2, 0, 2, 2))
+        surface.set_at((7, 1), (0, 0, 255))
+        filename = str(tmp_path / 'sheet.png')
+        pygame.image.save(surface, filename)
+        return filename
+
+    #pylint: disable-msg=redefined-outer-name
+    @pytest.mark.parametrize('load', [tile_loader.load_tile_table, tile_loader.load_whole_tile_table])
+    def test_shares_identical_tiles(self, sheet, load):
+        """Should hand out one surface for tiles with the same pixels"""
+        line = list(load(filename=sheet, original_tile_size=(2, 2), tile_scaling=(3, 3))[0])
+        assert line[0] is line[2]
+        assert len({id(tile) for tile in line}) == 3
+        assert tile_loader.shared_tile_stats() == {'tiles': 4, 'unique': 3, 'bytes_saved': 6 * 6 * line[0].get_bytesize()}
+
+    def test_shares_across_tables(self, sheet):
+        """Should hand out the same surface for the same tile in another table"""
+        first = tile_loader.load_tile_table(filename=sheet, original_tile_size=(2, 2), tile_scaling=(3, 3))
+        second = tile_loader.load_tile_table(filename=sheet, original_tile_size=(2, 2), offset=(4, 0), tile_scaling=(3, 3))
+        assert second[0][0] is first[0][0]
+
+    def test_colorkey_not_shared(self, sheet):
+        """Should not share tiles with the same pixels but different colorkeys"""
+        plain = tile_loader.load_tile_table(filename=sheet, original_tile_size=(2, 2))
+        keyed = tile_loader.load_tile_table(filename=sheet, original_tile_size=(2, 2), colorkey_location=(0, 0))
+        assert plain[0][0] is not keyed[0][0]
+        assert keyed[0][0].get_colorkey() is not None
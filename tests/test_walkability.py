@@ -0,0 +1,165 @@
+"""Tests for walkability.py"""
+import numpy
+import pygame
+import pytest
+import walkability
+
+SAND = (252, 216, 168)
+ROCK = (200, 76, 12)
+CELL_SIZE = (8, 8)
+
+
+@pytest.fixture()
+def grid():
+    """
+    A 4x4 cell grid that is all walkable except for a wall across
+    the top row with a one cell gap in it.
+    """
+    the_grid = numpy.ones((4, 4), dtype=bool)
+    the_grid[0, :] = False
+    the_grid[0, 2] = True
+    return the_grid
+
+
+#pylint: disable-msg=no-self-use,line-too-long,redefined-outer-name
+class TestTileCells(object):
+    """Tests for walkability.py::tile_cells()"""
+
+    def test_sand_is_walkable(self):
+        """Should mark every cell of an all sand tile as walkable"""
+        tiles = numpy.full((1, 16, 16, 3), SAND, dtype=numpy.uint8)
+        assert walkability.tile_cells(tiles).all()
+
+    def test_entrance_is_walkable(self):
+        """Should mark every cell of an all black tile as walkable"""
+        tiles = numpy.zeros((1, 16, 16, 3), dtype=numpy.uint8)
+        assert walkability.tile_cells(tiles).all()
+
+    def test_any_rock_blocks_the_cell(self):
+        """Should block only the cell with a rock pixel in it"""
+        tiles = numpy.full((1, 16, 16, 3), SAND, dtype=numpy.uint8)
+        tiles[0, 12, 3] = ROCK
+        assert walkability.tile_cells(tiles)[0].tolist() == [[True, True], [False, True]]
+
+
+class TestTilePixels(object):
+    """Tests for walkability.py::tile_pixels()"""
+
+    def test_only_rock_pixel_blocked(self):
+        """Should block only the rock pixel, not the rest of its cell"""
+        tiles = numpy.full((1, 16, 16, 3), SAND, dtype=numpy.uint8)
+        tiles[0, 12, 3] = ROCK
+        assert numpy.argwhere(~walkability.tile_pixels(tiles)[0]).tolist() == [[12, 3]]
+
+    def test_entrance_cell_is_walkable(self):
+        """Should only treat black as walkable when the whole cell is black"""
+        tiles = numpy.full((1, 16, 16, 3), SAND, dtype=numpy.uint8)
+        tiles[0, :8, :8] = 0
+        tiles[0, 12, 3] = 0
+        pixels = walkability.tile_pixels(tiles)[0]
+        assert pixels[:8, :8].all()
+        assert numpy.argwhere(~pixels).tolist() == [[12, 3]]
+
+    def test_agrees_with_cells(self):
+        """Should make a cell walkable exactly when all of its pixels are"""
+        tiles = numpy.full((1, 16, 16, 3), SAND, dtype=numpy.uint8)
+        tiles[0, 12, 3] = ROCK
+        tiles[0, :8, 8:] = 0
+        pixels = walkability.tile_pixels(tiles).reshape(1, 2, 8, 2, 8)
+        assert (pixels.all(axis=(2, 4)) == walkability.tile_cells(tiles)).all()
+
+
+class TestBlockingMask(object):
+    """Tests for walkability.py::blocking_mask()"""
+
+    def test_set_where_blocked(self, grid):
+        """Should set the mask where the grid is not walkable, scaled up"""
+        mask = walkability.blocking_mask(grid, 8)
+        assert mask.get_size() == (32, 32)
+        assert mask.count() == 3 * 8 * 8
+        assert mask.get_at((0, 7)) and not mask.get_at((0, 8))
+        assert not mask.get_at((16, 0))
+
+    def test_overlap(self, grid):
+        """Should only overlap a mask that covers a blocked pixel"""
+        mask = walkability.blocking_mask(grid, 1)
+        dot = pygame.mask.Mask((1, 1), fill=True)
+        assert mask.overlap(dot, (1, 0)) == (1, 0)
+        assert mask.overlap(dot, (2, 0)) is None
+
+
+class TestSubmapGrid(object):
+    """Tests for walkability.py::submap_grid()"""
+
+    def test_cells_in_place(self):
+        """Should put the cells of each tile in the right place in the grid"""
+        cells_of_tiles = numpy.array([[[True, True], [True, True]], [[True, False], [True, True]]])
+        grid = walkability.submap_grid(numpy.array([[0, 1], [1, 0]]), cells_of_tiles)
+        assert grid.shape == (4, 4)
+        assert numpy.argwhere(~grid).tolist() == [[0, 3], [2, 1]]
+
+
+class TestIsClear(object):
+    """Tests for walkability.py::is_clear()"""
+
+    def test_open_ground(self, grid):
+        """Should be clear on open ground"""
+        assert walkability.is_clear(grid, pygame.Rect(0, 8, 16, 16), CELL_SIZE)
+
+    def test_overlapping_wall(self, grid):
+        """Should not be clear if any part of the rect is over a wall"""
+        assert not walkability.is_clear(grid, pygame.Rect(0, 7, 16, 16), CELL_SIZE)
+
+    def test_touching_is_not_overlapping(self, grid):
+        """Should be clear when the rect ends right where a wall starts"""
+        assert walkability.is_clear(grid, pygame.Rect(8, 8, 8, 8), CELL_SIZE)
+
+    def test_off_the_map(self, grid):
+        """Should not be clear off the edge of the map"""
+        assert not walkability.is_clear(grid, pygame.Rect(-1, 8, 8, 8), CELL_SIZE)
+        assert not walkability.is_clear(grid, pygame.Rect(25, 8, 8, 8), CELL_SIZE)
+
+
+class TestSlide(object):
+    """Tests for walkability.py::slide()"""
+
+    def test_moves_when_clear(self, grid):
+        """Should move the full distance when nothing is in the way"""
+        moved = walkability.slide(grid, pygame.Rect(0, 24, 8, 8), (0, -8), CELL_SIZE, 1, 4)
+        assert moved.topleft == (0, 16)
+
+    def test_moves_up_to_wall(self, grid):
+        """Should stop right up against a wall instead of short of it"""
+        moved = walkability.slide(grid, pygame.Rect(0, 12, 8, 8), (0, -6), CELL_SIZE, 1, 4)
+        assert moved.topleft == (0, 8)
+
+    def test_nudged_towards_gap(self, grid):
+        """Should be nudged sideways towards a nearby gap in a wall"""
+        moved = walkability.slide(grid, pygame.Rect(13, 8, 8, 8), (0, -6), CELL_SIZE, 1, 4)
+        assert moved.topleft == (14, 8)
+
+    def test_stuck_against_wall(self, grid):
+        """Should not move when the nearest gap is too far away"""
+        moved = walkability.slide(grid, pygame.Rect(0, 8, 8, 8), (0, -6), CELL_SIZE, 1, 4)
+        assert moved.topleft == (0, 8)
+
+    @pytest.fixture()
+    def pylink_grid(self):
+        """
+        A grid with 24 pixel cells, like Link's, that is all walkable
+        except for a wall across the top row with a gap from x=96 to 120.
+        """
+        the_grid = numpy.ones((4, 8), dtype=bool)
+        the_grid[0, :] = False
+        the_grid[0, 4] = True
+        return the_grid
+
+    def test_nudged_one_step(self, pylink_grid):
+        """Should be nudged by exactly one step towards a gap, as Link is"""
+        moved = walkability.slide(pylink_grid, pygame.Rect(90, 24, 24, 24), (0, -18), (24, 24), 3, 12)
+        assert moved.topleft == (93, 24)
+
+    def test_gap_beyond_max_nudge(self, pylink_grid):
+        """Should not be nudged towards a gap further away than max_nudge, whatever the step"""
+        moved = walkability.slide(pylink_grid, pygame.Rect(69, 24, 24, 24), (0, -18), (24, 24), 3, 12)
+        assert moved.topleft == (69, 24)
@@ -1,8 +1,22 @@
-"""Loads and scales tiles from a sprite sheet file."""
-import math
+"""
+Loads and scales tiles from a sprite sheet file.
+
+Sprite sheets repeat a lot of tiles, such as sand, trees, rocks and
+water. Every tile that is loaded is hashed by its pixels, and a tile
+with the same pixels and colorkey as one that has already been handed
+out is replaced by that one, so memory grows with the number of
+different tiles rather than with the area of the sheets. See
+shared_tile_stats().
+"""
+import collections.abc
+import hashlib
+import weakref
 import pygame
 import pygame.locals
 import numpy
+import asset_cache
+import asset_manager
+import decoded_images
 import pylink_config
 import game_screen
 
@@ -10,7 +24,7 @@ import game_screen
 def count_tiles(image, tile_size, border=(0, 0), offset=(0, 0)):
     """
     Count the number of tiles in a loaded image.
-    The "math.floor" portions of the calculations are to account for
+    The rounding down in the calculations is to account for
     attestation banners, or other miscellaneous information at the bottom or
     to the right of the tile set. If this information is at the top or to the
     left of the tile set, the offset parameter can be used.
@@ -27,19 +41,36 @@ def count_tiles(image, tile_size, border=(0, 0), offset=(0, 0)):
         A tuple containing the number of tiles in each row and the
             number of tiles in each column.
     """
-    image_width, image_height = tuple(
-        map(
-            int,
-            numpy.subtract(image.get_size(), offset)
-        )
-    )
-    num_tiles_in_each_row = math.floor(
+    return count_tiles_in_size(image.get_size(), tile_size, border, offset)
+
+
+def count_tiles_in_size(image_size, tile_size, border=(0, 0), offset=(0, 0)):
+    """
+    Count the number of tiles in an image of the given size.
+    This is the same as count_tiles(), but does not need the image to
+    be loaded.
+
+    Args:
+        image_size: The (width, height) of the image
+        tile_size: The (width, height) of each tile in the file
+        border: The (width, height) border around *each* tile in the
+            file.
+        offset: The (width, height) of the initial offset used to find
+            the first tile
+
+    Returns:
+        A tuple containing the number of tiles in each row and the
+            number of tiles in each column.
+    """
+    image_width = int(image_size[0] - offset[0])
+    image_height = int(image_size[1] - offset[1])
+    num_tiles_in_each_row = (
         (image_width - border[0])
-        / (tile_size[0] + border[0])
+        // (tile_size[0] + border[0])
     )
-    num_tiles_in_each_col = math.floor(
+    num_tiles_in_each_col = (
         (image_height - border[1])
-        / (tile_size[1] + border[1])
+        // (tile_size[1] + border[1])
     )
     return (num_tiles_in_each_row, num_tiles_in_each_col)
 
@@ -70,6 +101,183 @@ def tile_upper_left_coordinates(
         offset[1] + border[1] + (row * (tile_size[1] + border[1]))
     )
 
+
+def scaled_tile_size(
+        original_tile_size,
+        final_tile_size=(None, None),
+        tile_scaling=(None, None)):
+    """
+    Work out the size each tile is scaled to from either the final size
+    or the scaling. See load_tile_table() for the arguments.
+
+    Returns:
+        The (width, height) to scale each tile to.
+
+    Raises:
+        ValueError: Raises ValueError if both final_tile_size and
+            tile_scaling are given.
+    """
+    #pylint: disable-msg=line-too-long
+    if (final_tile_size != (None, None)) and (tile_scaling != (None, None)):
+        raise ValueError(
+            'final_tile_size and tile_scaling cannot both '
+            + 'be specified in the same call'
+        )
+    #pylint: enable-msg=line-too-long
+
+    if final_tile_size != (None, None):
+        return tuple(final_tile_size)
+    if tile_scaling == (None, None):
+        tile_scaling = (1, 1)
+    return (
+        int(original_tile_size[0] * tile_scaling[0]),
+        int(original_tile_size[1] * tile_scaling[1])
+    )
+
+
+def cache_stats():
+    """
+    Return how well the caches behind load_tile_table() are doing, as a
+    dict with the hits and misses of the asset cache of scaled images
+    and of the cache of decoded sheets. A decoded sheet is only needed
+    when a scaled image is not in the asset cache.
+    """
+    cache = asset_cache.get_cache()
+    decoded = decoded_images.stats()
+    return {
+        'scaled_hits': cache.hits,
+        'scaled_misses': cache.misses,
+        'decoded_hits': decoded['hits'],
+        'decoded_misses': decoded['misses'],
+    }
+
+
+#pylint: disable-msg=invalid-name
+# Every tile handed out that is still in use, keyed by tile_key(). The
+# counts are of every tile ever handed out.
+_shared_tiles = weakref.WeakValueDictionary()
+_shared_tile_counts = {'tiles': 0, 'bytes_saved': 0}
+#pylint: enable-msg=invalid-name
+
+
+def tile_key(surface, pixels=None):
+    """
+    Return a key that is the same for any two tiles in the display's
+    pixel format with the same size, colorkey and pixels.
+
+    Args:
+        surface: The tile.
+        pixels: The tile's pixels as from pygame.surfarray.array2d(),
+            if they are already at hand.
+    """
+    if pixels is None:
+        pixels = pygame.surfarray.array2d(surface)
+    return (
+        surface.get_size(),
+        surface.get_colorkey(),
+        hashlib.sha1(numpy.ascontiguousarray(pixels)).digest())
+
+
+def _tile_bytes(surface):
+    """
+    Return the bytes of pixels in a tile. Unlike
+    decoded_images.surface_bytes(), this does not count the rest of the
+    row of a subsurface.
+    """
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def share_tile(surface, key=None):
+    """
+    Return the tile already handed out with the same pixels and
+    colorkey as surface, if there is one that is still in use, or else
+    surface itself, which will be handed out from now on.
+
+    The same Surface can be handed out for many tiles, so a blit or fill
+    on to one would change all of them. Treat the tiles as read-only,
+    and copy one before drawing on it.
+
+    Args:
+        surface: The tile.
+        key: The tile_key() of surface, if it is already at hand.
+    """
+    key = key or tile_key(surface)
+    shared = _shared_tiles.get(key)
+    _shared_tile_counts['tiles'] += 1
+    if shared is None:
+        _shared_tiles[key] = surface
+        return surface
+    _shared_tile_counts['bytes_saved'] += _tile_bytes(surface)
+    return shared
+
+
+def shared_tile_stats():
+    """
+    Return how much sharing identical tiles has saved, as a dict with
+    the number of tiles handed out, the number of unique tiles among
+    those still in use, and the bytes of pixels saved by handing out a
+    shared tile instead of a copy.
+    """
+    return {
+        'tiles': _shared_tile_counts['tiles'],
+        'unique': len(_shared_tiles),
+        'bytes_saved': _shared_tile_counts['bytes_saved'],
+    }
+
+
+class TileTable(collections.abc.Sequence):
+    """
+    A table of tiles indexed by table[row][col], where each tile is
+    only loaded the first time it is indexed and then kept. Rows and
+    tables can be iterated and measured with len() like lists.
+    """
+
+    def __init__(self, num_rows, num_cols, load_tile):
+        """
+        Args:
+            num_rows: The number of rows of tiles.
+            num_cols: The number of tiles in each row.
+            load_tile: A function taking the row and col of a tile and
+                returning its Surface.
+        """
+        self.__load_tile = load_tile
+        self.__rows = [_TileRow(self, row, num_cols) for row in range(num_rows)]
+        self.__tiles = {}
+
+    def __getitem__(self, row):
+        return self.__rows[row]
+
+    def __len__(self):
+        return len(self.__rows)
+
+    def num_loaded(self):
+        """Return how many tiles have been loaded so far."""
+        return len(self.__tiles)
+
+    def tile(self, row, col):
+        """Return the tile at row, col, loading it if needed."""
+        if (row, col) not in self.__tiles:
+            self.__tiles[(row, col)] = self.__load_tile(row, col)
+        return self.__tiles[(row, col)]
+
+
+class _TileRow(collections.abc.Sequence):
+    """One row of a TileTable."""
+
+    def __init__(self, table, row, num_cols):
+        self.__table = table
+        self.__row = row
+        self.__cols = range(num_cols)
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self.__table.tile(self.__row, index) for index in self.__cols[col]]
+        return self.__table.tile(self.__row, self.__cols[col])
+
+    def __len__(self):
+        return len(self.__cols)
+
+
 #pylint: disable-msg=too-many-arguments,too-many-locals
 def load_tile_table(
         filename,
@@ -82,6 +290,17 @@ def load_tile_table(
     """
     Load a tile sheet from a file.
 
+    The table is lazy: a tile is only cut out, scaled and has its
+    colorkey sampled the first time it is indexed, so asking for one
+    tile of a big sheet only ever loads that tile. See TileTable.
+
+    The scaled tiles are kept in the asset cache, so the file only has
+    to be decoded and scaled the first time the game is run, and then
+    it is only decoded once however many tile tables are cut from it.
+    See cache_stats(). The tiles are returned in the display's pixel
+    format, see asset_manager. Identical tiles are shared, see
+    share_tile().
+
     Each row is expected to be layed out as:
         offset width
         + border
@@ -116,7 +335,7 @@ def load_tile_table(
             sample for the colorkey.
 
     Returns:
-        A table of scaled surfaces containing each tile in the tile
+        A TileTable of scaled surfaces containing each tile in the tile
         sheets
 
     Raises:
@@ -124,68 +343,164 @@ def load_tile_table(
             tile_scaling are given. The intent of allowing both is to
             provide two different ways to specify the scaling.
     """
-    #pylint: disable-msg=line-too-long
-    if (final_tile_size != (None, None)) and (tile_scaling != (None, None)):
-        raise ValueError(
-            'final_tile_size and tile_scaling cannot both '
-            + 'be specified in the same call'
-        )
-    #pylint: enable-msg=line-too-long
-
-    if tile_scaling == (None, None):
-        tile_scaling = (1, 1)
-
-    if final_tile_size == (None, None):
-        final_tile_size = tuple(
-            map(
-                int,
-                numpy.multiply(original_tile_size, tile_scaling)
-            )
-        )
+    final_tile_size = scaled_tile_size(
+        original_tile_size, final_tile_size, tile_scaling)
+    if colorkey_location == (None, None):
+        colorkey_location = None
 
-    image = pygame.image.load(filename).convert()
-    num_tiles_in_each_row, num_tiles_in_each_col = count_tiles(
-        image,
+    num_tiles_in_each_row, num_tiles_in_each_col = count_tiles_in_size(
+        asset_cache.image_size(filename),
         original_tile_size,
         border,
         offset
     )
-    tile_table = []
-    for tile_row in range(0, num_tiles_in_each_col):
-        line = []
-        tile_table.append(line)
-        for tile_col in range(0, num_tiles_in_each_row):
-            tile_coordinates = tile_upper_left_coordinates(
-                tile_col,
-                tile_row,
-                original_tile_size,
-                border,
-                offset
-            )
-            surface = pygame.transform.scale(
-                image.subsurface(
-                    tile_coordinates[0],
-                    tile_coordinates[1],
-                    original_tile_size[0],
-                    original_tile_size[1]
-                ),
-                final_tile_size
-            )
-            if colorkey_location != (None, None):
-                surface.set_colorkey(surface.get_at(colorkey_location))
-            line.append(surface)
-    return tile_table
+
+    def load_tile(tile_row, tile_col):
+        tile_coordinates = tile_upper_left_coordinates(
+            tile_col,
+            tile_row,
+            original_tile_size,
+            border,
+            offset
+        )
+        return share_tile(asset_manager.load_scaled(
+            filename,
+            (
+                tile_coordinates[0],
+                tile_coordinates[1],
+                original_tile_size[0],
+                original_tile_size[1]
+            ),
+            final_tile_size,
+            colorkey_location
+        ))
+
+    return TileTable(num_tiles_in_each_col, num_tiles_in_each_row, load_tile)
+#pylint: enable-msg=too-many-arguments,too-many-locals
+
+
+#pylint: disable-msg=too-many-arguments,too-many-locals
+def load_whole_tile_table(
+        filename,
+        original_tile_size,
+        border=(0, 0),
+        offset=(0, 0),
+        final_tile_size=(None, None),
+        tile_scaling=(None, None),
+        colorkey_location=(None, None)):
+    """
+    Load every tile of a tile sheet at once. This takes the same
+    arguments and gives the same pixels as load_tile_table(), but
+    instead of cutting out and scaling each tile on its own, it does
+    the whole sheet in a few numpy operations:
+        convert the sheet to the display's pixel format and pull its
+            pixels into an array of packed pixel values,
+        drop the borders between tiles with a reshape and slice,
+        find the distinct tiles,
+        scale them all up at once by repeating each pixel,
+        and only then cut out the tiles.
+
+    This only works when the tiles are scaled by a whole number, which
+    is a nearest neighbour scale, so anything else is passed on to
+    load_tile_table(). Unlike load_tile_table(), the scaled tiles
+    are not kept in the asset cache.
+
+    Returns:
+        A table of scaled surfaces containing each tile in the tile
+        sheets
+
+    Raises:
+        ValueError: Raises ValueError if both final_tile_size and
+            tile_scaling are given.
+    """
+    final_tile_size = scaled_tile_size(
+        original_tile_size, final_tile_size, tile_scaling)
+    tile_width, tile_height = original_tile_size
+    scale_x, remainder_x = divmod(final_tile_size[0], tile_width)
+    scale_y, remainder_y = divmod(final_tile_size[1], tile_height)
+    if remainder_x or remainder_y or not scale_x or not scale_y:
+        return load_tile_table(
+            filename, original_tile_size, border, offset,
+            final_tile_size=final_tile_size,
+            colorkey_location=colorkey_location)
+
+    image = decoded_images.load(filename)
+    num_tiles_in_each_row, num_tiles_in_each_col = count_tiles(
+        image, original_tile_size, border, offset)
+    left, top = tile_upper_left_coordinates(
+        0, 0, original_tile_size, border, offset)
+    pitch_x = tile_width + border[0]
+    pitch_y = tile_height + border[1]
+
+    # surfarray arrays are indexed by [x, y]. Split the sheet into
+    # [column, x in tile and border, row, y in tile and border], drop
+    # the border, and bring the tile's row and column to the front.
+    converted = image.convert()
+    pixels = pygame.surfarray.array2d(converted)[
+        left:left + (num_tiles_in_each_row * pitch_x),
+        top:top + (num_tiles_in_each_col * pitch_y)]
+    tiles = pixels.reshape(
+        num_tiles_in_each_row, pitch_x,
+        num_tiles_in_each_col, pitch_y
+    )[:, :tile_width, :, :tile_height].transpose(2, 0, 1, 3)
+    # Only scale each distinct tile once. Comparing each tile's pixels
+    # as a single opaque value is much faster than unique(axis=0).
+    tiles = numpy.ascontiguousarray(tiles).reshape(
+        num_tiles_in_each_col * num_tiles_in_each_row,
+        tile_width, tile_height)
+    tile_bytes = tiles[0].nbytes
+    _, unique_indices, tile_indices = numpy.unique(
+        tiles.reshape(len(tiles), -1).view(
+            numpy.dtype((numpy.void, tile_bytes))).ravel(),
+        return_index=True, return_inverse=True)
+    unique_tiles = tiles[unique_indices]
+    # Repeating each pixel scale_x times across and scale_y times down
+    # is a nearest neighbour scale. Broadcasting and then reshaping
+    # does both in one copy, and lays the tiles out in one strip.
+    scaled = numpy.broadcast_to(
+        unique_tiles[:, :, numpy.newaxis, :, numpy.newaxis],
+        (len(unique_tiles), tile_width, scale_x, tile_height, scale_y)
+    ).reshape(
+        len(unique_tiles) * final_tile_size[0], final_tile_size[1])
+    sheet = pygame.Surface(scaled.shape, 0, converted)
+    pygame.surfarray.blit_array(sheet, scaled)
+
+    # The tiles are subsurfaces of the scaled strip, which is already in
+    # the display's pixel format, so cutting them out copies nothing.
+    # Each subsurface has its own colorkey.
+    shared = []
+    for index in range(len(unique_tiles)):
+        left = index * final_tile_size[0]
+        surface = sheet.subsurface((left, 0), final_tile_size)
+        if colorkey_location != (None, None):
+            asset_manager.set_colorkey(surface, colorkey_location)
+        shared.append(share_tile(surface, tile_key(
+            surface, scaled[left:left + final_tile_size[0]])))
+    # The repeats within the sheet were never scaled at all.
+    num_repeats = len(tiles) - len(unique_tiles)
+    _shared_tile_counts['tiles'] += num_repeats
+    _shared_tile_counts['bytes_saved'] += (
+        num_repeats * _tile_bytes(shared[0]) if shared else 0)
+
+    tile_indices = tile_indices.reshape(
+        num_tiles_in_each_col, num_tiles_in_each_row)
+    return [
+        [shared[index] for index in line]
+        for line in tile_indices
+    ]
 #pylint: enable-msg=too-many-arguments,too-many-locals
 
 if __name__ == '__main__':
     # Draw the loaded and scaled tiles on the screen
     game_screen.init()
-    TILE_TABLE = load_tile_table(
+    TILE_TABLE = load_whole_tile_table(
         filename="assets/NES-TheLegendofZelda-OverworldTiles.png",
         original_tile_size=(16, 16),
         border=(1, 1),
         offset=(0, 0),
         final_tile_size=pylink_config.TILE_SIZE)
+    print(cache_stats())
+    print(shared_tile_stats())
     for main_y, main_row in enumerate(TILE_TABLE):
         for main_x, tile in enumerate(main_row):
             game_screen.blit(
@@ -3,8 +3,8 @@ import pygame
 import pygame.locals
 import numpy
 import pylink_config
-import tile_loader
 import game_screen
+import sprite_atlas
 
 _FINISH_TITLE_FADE_AT_SECS = 16.0
 
@@ -99,14 +99,7 @@ def intro_text():
     """
     Load the intro text and treasure list.
     """
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(252, 960),
-        border=(0, 0),
-        offset=(523, 14),
-        tile_scaling=pylink_config.TILE_SCALING,
-        colorkey_location=(0, 0))
-    return table[0][0]
+    return sprite_atlas.sprite('title', 'intro_text')
 
 if __name__ == '__main__':
     # Draw the loaded and scaled tiles on the screen
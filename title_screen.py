@@ -5,16 +5,20 @@ a key. Then transitions off the screen.
 
 To go to the title screen, use title_screen.execute()
 """
+import io
 import time
 import itertools
 import pygame
 import pygame.locals
 import pylink_config
-import tile_loader
+import sprite_atlas
 import title_waterfall
 import title_intro_text
 import game_screen
 
+#: The music played on the title screen
+INTRO_MUSIC_FILENAME = 'assets/01Intro.mp3'
+
 _START_TITLE_FADE_AT_SECS = 8.0
 _FINISH_TITLE_FADE_AT_SECS = 16.0
 _PAUSE_STORY_SCROLL_AT_SECS = 23.5
@@ -137,45 +141,52 @@ def event_loop(
             pass
 #pylint: enable-msg=too-many-branches
 
-def execute():
+
+def load_intro_music():
+    """
+    Read the title screen's music into memory. This does not touch
+    pygame, so it is safe to call on any thread.
+
+    Returns:
+        A file object of the music, for execute().
+    """
+    with open(INTRO_MUSIC_FILENAME, 'rb') as music_file:
+        return io.BytesIO(music_file.read())
+
+
+def execute(intro_music=INTRO_MUSIC_FILENAME):
     """
     Show the title screen and wait for the user to hit 'start'
 
+    Args:
+        intro_music: The music to play, as a filename or as the file
+            object from load_intro_music().
+
     Returns:
         continue: True if the game should continue when this returns
             and False if it should exit.
     """
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=pylink_config.NES_WINDOW_SIZE,
-        border=(3, 3),
-        offset=(0, 1),
-        final_tile_size=pylink_config.WINDOW_SIZE)
     # When the animation loop runs, the same background is shown
     # for two frames in a row. The waterfall, moves at twice the rate
     # and this allows for that movement to occur on every loop through.
     # Note that the background images undulate back and forth through
     # the list
+    background = [
+        sprite_atlas.sprite('title', f'background_{index}') for index in range(4)]
     background_tiles = [
-        table[0][0], table[0][0],
-        table[0][1], table[0][1],
-        table[1][0], table[1][0],
-        table[1][1], table[1][1],
-        table[1][0], table[1][0],
-        table[0][1], table[0][1]
+        background[0], background[0],
+        background[1], background[1],
+        background[2], background[2],
+        background[3], background[3],
+        background[2], background[2],
+        background[1], background[1]
     ]
-    table = tile_loader.load_tile_table(
-        filename="assets/NES-TheLegendofZelda-IntroAndFileSelect.png",
-        original_tile_size=(32, 59),
-        border=(6, 0),
-        offset=(340, 51),
-        final_tile_size=pylink_config.WINDOW_SIZE)
     waterfall_background = title_waterfall.background()
     waterfall_waves = title_waterfall.waves()
     waterfall_spray = title_waterfall.spray()
     intro_text = title_intro_text.intro_text()
     pygame.mixer.init()
-    pygame.mixer.music.load('assets/01Intro.mp3')
+    pygame.mixer.music.load(intro_music, 'mp3')
     return_code = event_loop(
         background_tiles,
         waterfall_background,
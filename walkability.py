@@ -0,0 +1,222 @@
+"""Walkability grids for collision detection.
+
+Each submap is split into a grid of cells the size of the NES
+background tiles (8x8 NES pixels), and each cell is marked as either
+walkable or blocked. The grid is worked out once per submap from the
+tile map, so checking whether a rectangle is clear is just a lookup
+of the cells under it.
+
+A cell is walkable when every pixel in it is a ground color, or when
+it is entirely the entrance color. Any cell with a piece of a rock,
+tree, wall or water in it is blocked.
+
+Rectangles passed to the functions in this module are relative to the
+top left of the map section, and cell_size is the size of a cell in
+the same units, so they work at any scale.
+
+For pixel-perfect collisions, tile_pixels() marks each pixel of the
+tiles the same way, and blocking_mask() turns a submap's pixels into a
+pygame.mask.Mask of where it is blocked. Checking a rectangle against
+the grid is cheaper, so only check the mask when the grid says the
+rectangle is not clear.
+"""
+import numpy
+import pygame
+import pylink_config
+
+
+def tile_cells(tiles):
+    """
+    Work out which cells of each tile are walkable.
+
+    Args:
+        tiles: The tiles, as a uint8 array indexed by
+            [tile index, y, x, rgb], at their native NES size.
+
+    Returns:
+        A boolean array indexed by [tile index, cell row, cell column]
+        that is True where the cell is walkable.
+    """
+    num_tiles, tile_height, tile_width, _ = tiles.shape
+    cell_width, cell_height = pylink_config.NES_WALKABILITY_CELL_SIZE
+    # Split each tile into (cell row, y in cell, cell column, x in cell)
+    cells = tiles.reshape(
+        num_tiles,
+        tile_height // cell_height, cell_height,
+        tile_width // cell_width, cell_width,
+        3)
+    is_ground = numpy.zeros(cells.shape[:-1], dtype=bool)
+    for color in pylink_config.WALKABLE_GROUND_COLORS:
+        is_ground |= numpy.all(cells == color, axis=-1)
+    is_entrance = numpy.all(cells == pylink_config.ENTRANCE_COLOR, axis=-1)
+    return (
+        numpy.all(is_ground, axis=(2, 4))
+        | numpy.all(is_entrance, axis=(2, 4))
+    )
+
+
+def tile_pixels(tiles):
+    """
+    Work out which pixels of each tile are walkable. A pixel is
+    walkable when it is a ground color, or when the whole cell it is in
+    is the entrance color, so a cell is walkable in tile_cells() exactly
+    when every pixel in it is walkable here.
+
+    Args:
+        tiles: The tiles, as a uint8 array indexed by
+            [tile index, y, x, rgb], at their native NES size.
+
+    Returns:
+        A boolean array indexed by [tile index, y, x] that is True
+        where the pixel is walkable.
+    """
+    num_tiles, tile_height, tile_width, _ = tiles.shape
+    cell_width, cell_height = pylink_config.NES_WALKABILITY_CELL_SIZE
+    is_ground = numpy.zeros(tiles.shape[:-1], dtype=bool)
+    for color in pylink_config.WALKABLE_GROUND_COLORS:
+        is_ground |= numpy.all(tiles == color, axis=-1)
+    is_entrance = numpy.all(
+        tiles.reshape(
+            num_tiles,
+            tile_height // cell_height, cell_height,
+            tile_width // cell_width, cell_width,
+            3) == pylink_config.ENTRANCE_COLOR,
+        axis=(2, 4, 5))
+    return is_ground | is_entrance.repeat(cell_height, axis=1).repeat(
+        cell_width, axis=2)
+
+
+def submap_grid(submap_tile_map, cells_of_tiles):
+    """
+    Build the walkability grid for one submap.
+
+    Args:
+        submap_tile_map: The tile indices of the submap, indexed by
+            [tile row, tile column].
+        cells_of_tiles: The walkable cells of every tile, as returned
+            by tile_cells().
+
+    Returns:
+        A boolean array indexed by [cell row, cell column] that is True
+        where the cell is walkable.
+    """
+    tile_rows, tile_columns = submap_tile_map.shape
+    _, cell_rows, cell_columns = cells_of_tiles.shape
+    return numpy.ascontiguousarray(
+        cells_of_tiles[submap_tile_map].transpose(0, 2, 1, 3).reshape(
+            tile_rows * cell_rows, tile_columns * cell_columns))
+
+
+def blocking_mask(walkable, scale):
+    """
+    Build a Mask of where a submap is blocked.
+
+    Args:
+        walkable: The walkable pixels of the submap, as returned by
+            submap_grid() for the pixels from tile_pixels().
+        scale: How many times the size of walkable to scale the mask
+            up by, for example NES_TO_PYLINK_SCALE_FACTOR to check it
+            against rectangles in PYLINK coordinates.
+
+    Returns:
+        A pygame.mask.Mask, with (x, y) relative to the map's top
+        left, that is set where the submap is blocked.
+    """
+    height, width = walkable.shape
+    blocked = pygame.surfarray.make_surface(
+        numpy.logical_not(walkable).T.astype(numpy.uint8))
+    blocked.set_colorkey(0)
+    mask = pygame.mask.from_surface(blocked)
+    if scale != 1:
+        mask = mask.scale((width * scale, height * scale))
+    return mask
+
+
+def is_clear(grid, rect, cell_size):
+    """
+    Check whether every cell under rect is walkable.
+
+    Args:
+        grid: A walkability grid as returned by submap_grid().
+        rect: The rectangle to check, relative to the map's top left.
+        cell_size: The (width, height) of each grid cell in the same
+            units as rect.
+
+    Returns:
+        True if rect is entirely on the map and only covers walkable
+        cells, False otherwise.
+    """
+    if rect.width <= 0 or rect.height <= 0:
+        return True
+    if rect.left < 0 or rect.top < 0:
+        return False
+    first_column = rect.left // cell_size[0]
+    first_row = rect.top // cell_size[1]
+    last_column = (rect.right - 1) // cell_size[0]
+    last_row = (rect.bottom - 1) // cell_size[1]
+    if last_row >= grid.shape[0] or last_column >= grid.shape[1]:
+        return False
+    return bool(
+        grid[first_row:last_row + 1, first_column:last_column + 1].all())
+
+
+#pylint: disable-msg=too-many-arguments,too-many-locals
+def slide(grid, rect, velocity, cell_size, step, max_nudge):
+    """
+    Move rect as far as it can go by velocity without leaving the
+    walkable cells.
+
+    If rect can not move all the way, it moves up to the obstacle
+    instead. If it can not move at all because it is just clipping the
+    corner of an obstacle, it is nudged sideways by one step towards
+    the side that would let it get past. This lets a character slide
+    around corners instead of getting stuck on them.
+
+    Args:
+        grid: A walkability grid as returned by submap_grid().
+        rect: Where the character is now, relative to the map's top
+            left. This is assumed to be clear.
+        velocity: The (x, y) distance to move. Only one of these is
+            expected to be non-zero.
+        cell_size: The (width, height) of each grid cell in the same
+            units as rect.
+        step: The smallest distance a character can move, in the same
+            units as rect.
+        max_nudge: The furthest away a gap can be to the side for the
+            character to be nudged towards it.
+
+    Returns:
+        A new rect where the character should end up.
+    """
+    distance = max(abs(velocity[0]), abs(velocity[1]))
+    if distance == 0:
+        return rect.copy()
+    sign_x = int(numpy.sign(velocity[0]))
+    sign_y = int(numpy.sign(velocity[1]))
+    direction = (sign_x * step, sign_y * step)
+
+    # Move up to the obstacle
+    moved = rect.copy()
+    for _ in range(distance // step):
+        next_rect = moved.move(direction)
+        if not is_clear(grid, next_rect, cell_size):
+            break
+        moved = next_rect
+    if moved != rect:
+        return moved
+
+    # Blocked right away. Look for a gap to either side and nudge
+    # towards the nearest one, one step at a time.
+    sideways = (abs(sign_y), abs(sign_x))
+    for nudge in range(step, max_nudge + step, step):
+        for sign in (-1, 1):
+            offset = (sign * nudge * sideways[0], sign * nudge * sideways[1])
+            shifted = rect.move(offset)
+            nudged = rect.move(
+                sign * step * sideways[0], sign * step * sideways[1])
+            if (is_clear(grid, shifted, cell_size)
+                    and is_clear(grid, shifted.move(direction), cell_size)
+                    and is_clear(grid, nudged, cell_size)):
+                return nudged
+    return moved
+#pylint: enable-msg=too-many-arguments,too-many-locals